@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""Read-only JSON API over the parsed plays, for tools that cannot import them.
+
+Serves the same Play objects the app reads, loaded through the corpus (and
+its snapshots) and kept current by a PlayWatcher per file:
+
+    GET /plays                                      every play, with its size
+    GET /plays/<id>                                 outline of acts and scenes
+    GET /plays/<id>/characters                      the cast, with speech counts
+    GET /plays/<id>/acts/<act>/scenes/<scene>       one scene's content and line span
+    GET /plays/<id>/lines?from=3.2.1&to=3.2.20      Folger lines, by reference or ftln-
+
+Every response body is built once per play version and kept in an LRU cache
+with its gzip encoding and a strong ETag (a SHA-256 of the body), so a repeat
+request is a dictionary lookup, and a client sending If-None-Match gets a 304
+with no body at all. Each connection is served on its own thread, so idle
+keep-alive clients never hold up new ones; reads of the model are lock-free, as
+the app's are.
+
+    python api.py data/ --port 8502
+    curl -s localhost:8502/plays/king-lear_TEIsimple_FolgerShakespeare/lines?from=1.1.1&to=1.1.5
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+from parser import Play
+from watcher import PlayWatcher
+
+API_HOST = "127.0.0.1"
+API_PORT = 8502
+# Seconds an idle keep-alive connection stays open
+IDLE_TIMEOUT = 5
+# Response bodies kept per play
+RESPONSE_CACHE_SIZE = 512
+# Most lines returned by one /lines request
+MAX_LINES = 2000
+# Bodies smaller than this are not worth compressing
+GZIP_MIN_SIZE = 512
+
+
+@dataclass(frozen=True)
+class Response:
+    """A response body with its gzip encoding and ETags, built once and reused."""
+    status: int
+    body: bytes
+    gzip_body: Optional[bytes] = None
+    etag: Optional[str] = None       # of body
+    gzip_etag: Optional[str] = None  # of gzip_body; each encoding has its own strong ETag
+
+    @classmethod
+    def json(cls, data, status: int = 200) -> "Response":
+        body = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        if status != 200:
+            return cls(status, body)
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        gzip_body = gzip.compress(body, mtime=0) if len(body) >= GZIP_MIN_SIZE else None
+        return cls(status, body, gzip_body, f'"{digest}"', f'"{digest}-gzip"' if gzip_body else None)
+
+
+class NotFound(Exception):
+    """No play, scene or line answers the request."""
+
+
+class BadRequest(Exception):
+    """The request's parameters are missing or malformed."""
+
+
+class PlayAPI:
+    """Builds and caches the JSON responses for a set of plays."""
+
+    def __init__(self, plays: Dict[str, Union[Play, PlayWatcher]], max_entries: int = RESPONSE_CACHE_SIZE):
+        # Plays by id, or watchers whose .play is the latest parse
+        self.plays = plays
+        self.max_entries = max_entries
+        # Per play id: the Plays the cached responses were built from, and the responses.
+        # The Plays are kept, not their ids, so a reloaded play cannot reuse a freed one's id
+        self._cache: Dict[Optional[str], Tuple[Tuple[Play, ...], "OrderedDict[str, Response]"]] = {}
+        self._lock = threading.Lock()
+
+    def play(self, play_id: str) -> Optional[Play]:
+        """Return the current version of a play."""
+        source = self.plays.get(play_id)
+        return source.play if isinstance(source, PlayWatcher) else source
+
+    def get(self, target: str) -> Response:
+        """Return the response for a request target like "/plays/<id>?x=1"."""
+        url = urlsplit(target)
+        parts = [unquote(part) for part in url.path.split('/') if part]
+        params = dict(parse_qsl(url.query))
+        # Canonical key: the same request with its parameters in any order
+        key = '/'.join(parts) + '?' + '&'.join(f"{k}={v}" for k, v in sorted(params.items()))
+
+        play_id = parts[1] if len(parts) > 1 and parts[0] == 'plays' else None
+        if play_id is None:
+            version = tuple(map(self.play, sorted(self.plays)))
+        else:
+            play = self.play(play_id)
+            if play is None:
+                return Response.json({"error": f"no play {play_id!r}"}, 404)
+            # Responses built from an older parse of the play are dropped
+            version = (play,)
+
+        with self._lock:
+            built_for, responses = self._cache.get(play_id, (None, None))
+            if _same_plays(built_for, version):
+                response = responses.get(key)
+                if response is not None:
+                    responses.move_to_end(key)
+                    return response
+
+        try:
+            response = Response.json(self._route(parts, params))
+        except NotFound as e:
+            return Response.json({"error": str(e)}, 404)
+        except BadRequest as e:
+            return Response.json({"error": str(e)}, 400)
+
+        with self._lock:
+            built_for, responses = self._cache.get(play_id, (None, None))
+            if not _same_plays(built_for, version):
+                responses = OrderedDict()
+                self._cache[play_id] = (version, responses)
+            responses[key] = response
+            while len(responses) > self.max_entries:
+                responses.popitem(last=False)
+        return response
+
+    def _route(self, parts: List[str], params: Dict[str, str]):
+        """Return the JSON document for a request path."""
+        if parts == ['plays']:
+            return self.catalogue()
+        if len(parts) < 2 or parts[0] != 'plays':
+            raise NotFound(f"no resource /{'/'.join(parts)}")
+        play = self.play(parts[1])
+        rest = parts[2:]
+        if not rest:
+            return outline(play)
+        if rest == ['characters']:
+            return characters(play)
+        if rest == ['lines']:
+            if 'from' not in params:
+                raise BadRequest("lines needs ?from=<act.scene.line>[&to=<act.scene.line>]")
+            return line_range(play, params['from'], params.get('to', params['from']))
+        if len(rest) == 4 and rest[0] == 'acts' and rest[2] == 'scenes':
+            return scene(play, rest[1], rest[3])
+        raise NotFound(f"no resource /{'/'.join(parts)}")
+
+    def catalogue(self) -> List[dict]:
+        """Return the id, title and size of every play."""
+        documents = []
+        for play_id in sorted(self.plays):
+            play = self.play(play_id)
+            documents.append({
+                "id": play_id,
+                "title": play.title,
+                "acts": play.get_act_count(),
+                "scenes": play.get_total_scenes(),
+                "lines": len(play.line_store) if play.line_store is not None else None,
+            })
+        return documents
+
+
+def outline(play: Play) -> dict:
+    """Return the acts and scenes of a play, each scene with its first and last line."""
+    acts = []
+    for act in play.acts:
+        acts.append({
+            "act": act.number,
+            "title": act.get_formatted_title(),
+            "scenes": [{"scene": s.number, "title": s.title, **_line_span(play, act.number, s.number)}
+                       for s in act.scenes],
+        })
+    return {"title": play.title, "acts": acts}
+
+
+def characters(play: Play) -> List[dict]:
+    """Return the cast list in order, with each character's number of speeches."""
+    return [
+        {
+            "id": character.id,
+            "name": character.name,
+            "description": character.description,
+            "group": character.group,
+            "speeches": len(play.speeches_by(character)) if character.id else 0,
+        }
+        for character in play.characters
+    ]
+
+
+def scene(play: Play, act_number: str, scene_number: str) -> dict:
+    """Return one scene's content items and line span."""
+    act = play.get_act(act_number)
+    found = act.get_scene(scene_number) if act else None
+    if found is None:
+        raise NotFound(f"no scene {act_number}.{scene_number}")
+    return {
+        "act": act_number,
+        "scene": scene_number,
+        "title": found.title,
+        **_line_span(play, act_number, scene_number),
+        "content": list(found.content),
+    }
+
+
+def line_range(play: Play, first: str, last: str) -> dict:
+    """Return the Folger lines from first to last inclusive."""
+    ends = [play.line(ref) for ref in (first, last)]
+    for ref, line in zip((first, last), ends):
+        if line is None:
+            raise NotFound(f"no line {ref}")
+    if ends[0].ftln > ends[1].ftln:
+        raise BadRequest(f"line {first} comes after {last}")
+    # Sized from the FTLN span, before any line is decoded
+    start, end = play.line_store.span(ends[0].ftln, ends[1].ftln)
+    if end - start > MAX_LINES:
+        raise BadRequest(f"{end - start} lines requested; at most {MAX_LINES} per request")
+    return {"from": first, "to": last, "lines": [line._asdict() for line in play.line_store[start:end]]}
+
+
+def _line_span(play: Play, act_number: str, scene_number: str) -> dict:
+    """Return the first and last line references of a scene, if it has lines."""
+    if play.line_store is None:
+        return {}
+    start, end = play.line_store.scene_span(act_number, scene_number)
+    if start == end:
+        return {"first_line": None, "last_line": None}
+    return {"first_line": play.line_store[start].ref, "last_line": play.line_store[end - 1].ref}
+
+
+def _same_plays(built_for: Optional[Tuple[Play, ...]], version: Tuple[Play, ...]) -> bool:
+    """Return whether cached responses were built from exactly these Play objects."""
+    return built_for is not None and len(built_for) == len(version) and all(
+        a is b for a, b in zip(built_for, version))
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Return whether an Accept-Encoding header allows gzip; a malformed q-value does not."""
+    for coding in accept_encoding.split(','):
+        name, _, params = coding.strip().partition(';')
+        if name.strip().lower() in ('gzip', '*'):
+            quality = params.strip()
+            if not quality.startswith('q='):
+                return True
+            try:
+                return float(quality[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _etag_matches(if_none_match: Optional[str], etag: Optional[str]) -> bool:
+    """Return whether an If-None-Match header names an ETag (weak comparison)."""
+    if not if_none_match or not etag:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(',')]
+    return '*' in tags or etag in (tag[2:] if tag.startswith('W/') else tag for tag in tags)
+
+
+class APIRequestHandler(BaseHTTPRequestHandler):
+    """Answers GET and HEAD requests from the server's PlayAPI."""
+    protocol_version = "HTTP/1.1"
+    server_version = "CordeliaAPI/0.1"
+    timeout = IDLE_TIMEOUT
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def _respond(self, send_body: bool):
+        response = self.server.api.get(self.path)
+        compressed = response.gzip_body is not None and _accepts_gzip(self.headers.get('Accept-Encoding', ''))
+        etag = response.gzip_etag if compressed else response.etag
+
+        if _etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+            self.end_headers()
+            return
+
+        body = response.gzip_body if compressed else response.body
+        self.send_response(response.status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            # Cacheable, but revalidated: an edited TEI file changes the response
+            self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Vary', 'Accept-Encoding')
+        if compressed:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class APIServer(ThreadingHTTPServer):
+    """HTTP server giving each connection a thread of its own.
+
+    A keep-alive connection holds its thread until IDLE_TIMEOUT, so a bounded
+    pool would let a few idle clients starve everyone else.
+    """
+
+    # Idle keep-alive threads must not hold up server_close
+    block_on_close = False
+
+    def __init__(self, address: Tuple[str, int], api: PlayAPI, verbose: bool = False):
+        super().__init__(address, APIRequestHandler)
+        self.api = api
+        self.verbose = verbose
+
+
+def main(argv=None) -> int:
+    from corpus import Corpus
+
+    arg_parser = argparse.ArgumentParser(description="Serve the parsed plays of a directory as JSON.")
+    arg_parser.add_argument("directory", type=Path, nargs="?", default=Path("data"))
+    arg_parser.add_argument("--host", default=API_HOST, help=f"address to listen on (default: {API_HOST})")
+    arg_parser.add_argument("--port", type=int, default=API_PORT, help=f"port (default: {API_PORT})")
+    arg_parser.add_argument("--verbose", action="store_true", help="log every request")
+    args = arg_parser.parse_args(argv)
+
+    corpus = Corpus.load(args.directory)
+    print(corpus.report())
+    watchers = {play_id: PlayWatcher(corpus.paths[play_id], play) for play_id, play in corpus.plays.items()}
+    server = APIServer((args.host, args.port), PlayAPI(watchers), verbose=args.verbose)
+    print(f"Serving {len(watchers)} plays on http://{args.host}:{server.server_port}/plays")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
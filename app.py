@@ -1,6 +1,34 @@
 import streamlit as st
 from pathlib import Path
-from parser import TEIParser, Play
+from typing import Optional
+from concordance import Concordance
+from corpus import Corpus
+from frequency import MAX_N, FrequencyEngine
+from pager import PlayPager
+from parser import Play
+from render import PlayRenderer
+from search import SearchIndex
+from stats import SORT_KEYS, CharacterStats
+import timing
+from watcher import PlayWatcher
+
+# Directory scanned for TEI plays
+DATA_DIR = Path("data")
+# Play shown until the reader picks another
+DEFAULT_PLAY_ID = "king-lear_TEIsimple_FolgerShakespeare"
+
+# Most search results rendered at once
+SEARCH_RESULT_LIMIT = 200
+# Most concordance lines rendered at once
+CONCORDANCE_LIMIT = 2000
+# Rows of the frequency table
+FREQUENCY_LIMIT = 100
+
+# Views the content pane can show, as named in ?view=
+VIEWS = ("home", "characters", "synopsis", "full", "search", "concordance", "frequency", "stage", "act",
+         "scene")
+# Query parameters that make up a route
+ROUTE_PARAMS = ("view", "act", "scene", "line")
 
 # King Lear Synopsis (from dataset)
 KING_LEAR_SYNOPSIS = """
@@ -11,111 +39,215 @@ Meanwhile, the Earl of Gloucester's illegitimate son Edmund turns Gloucester aga
 Cordelia and the French army save Lear, but the army is defeated. Edmund imprisons Cordelia and Lear. Edgar then mortally wounds Edmund in a trial by combat. Dying, Edmund confesses that he has ordered the deaths of Cordelia and Lear. Before they can be rescued, Lear brings in Cordelia's body and then he himself dies.
 """
 
+# Synopses by play id
+SYNOPSES = {DEFAULT_PLAY_ID: KING_LEAR_SYNOPSIS}
+
 @st.cache_resource
-def load_play() -> Play:
-    """Load and parse the King Lear XML file."""
-    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
-    parser = TEIParser(xml_path)
-    return parser.parse()
+def load_corpus() -> Corpus:
+    """Load every play in the data directory, in parallel and from snapshots when fresh."""
+    return Corpus.load(DATA_DIR)
 
-def main():
-    st.set_page_config(
-        page_title="King Lear - Shakespeare",
-        page_icon="📖",
-        layout="wide"
-    )
+@st.cache_resource
+def load_watcher(play_id: str = DEFAULT_PLAY_ID) -> Optional[PlayWatcher]:
+    """Return the watcher reloading a play of the corpus when its file changes."""
+    corpus = load_corpus()
+    play = corpus.get(play_id)
+    if play is None:
+        return None
+    return PlayWatcher(corpus.paths[play_id], play)
+
+def load_play(play_id: str = DEFAULT_PLAY_ID) -> Optional[Play]:
+    """Return the latest parse of a play of the corpus by its file stem."""
+    watcher = load_watcher(play_id)
+    return watcher.play if watcher is not None else None
+
+@st.cache_resource
+def load_renderer(play_id: str = DEFAULT_PLAY_ID) -> PlayRenderer:
+    """Return the shared Markdown renderer for a play."""
+    return PlayRenderer(load_play(play_id))
+
+@st.cache_resource
+def load_search_index(play_id: str = DEFAULT_PLAY_ID) -> SearchIndex:
+    """Build the inverted word and lemma index for a play."""
+    return SearchIndex(load_play(play_id).tokens)
+
+@st.cache_resource
+def load_concordance(play_id: str = DEFAULT_PLAY_ID) -> Concordance:
+    """Build the KWIC concordance engine for a play."""
+    return Concordance(load_play(play_id).tokens)
+
+@st.cache_resource
+def load_frequency(play_id: str = DEFAULT_PLAY_ID) -> FrequencyEngine:
+    """Build the scoped word and n-gram frequency engine for a play."""
+    return FrequencyEngine(load_play(play_id).tokens)
+
+@st.cache_resource
+def load_character_stats(play_id: str = DEFAULT_PLAY_ID) -> CharacterStats:
+    """Count lines, words and speeches per character and scene for a play."""
+    play = load_play(play_id)
+    return CharacterStats(play.tokens, play.characters)
+
+@st.cache_resource
+def load_pager(play_id: str = DEFAULT_PLAY_ID, act_number: Optional[str] = None) -> PlayPager:
+    """Split a play, or one of its acts, into pages for the windowed reader."""
+    return PlayPager(load_play(play_id), act_number)
+
+def turn_page(key: str, step: int):
+    """Move a windowed reader forward or back by step pages."""
+    st.session_state[key] += step
+
+def jump_to_line(pager: PlayPager, key: str):
+    """Open the page holding the line typed into a pager's jump box."""
+    ref = st.session_state[f"{key}_line"].strip()
+    number = pager.page_for_line(ref) if ref else None
+    st.session_state[f"{key}_missing"] = ref if ref and number is None else None
+    if number is not None:
+        st.session_state[key] = number
+
+def show_page(pager: PlayPager, key: str):
+    """Render one page of a pager with previous/next controls, a line-range picker and a line jump."""
+    if st.session_state.get(key, 0) not in range(1, len(pager) + 1):
+        st.session_state[key] = 1
+    number = st.session_state[key]
     
-    # Initialize session state
-    if "current_view" not in st.session_state:
-        st.session_state.current_view = "home"
-    if "current_act" not in st.session_state:
-        st.session_state.current_act = "1"
-    if "current_scene" not in st.session_state:
-        st.session_state.current_scene = "1"
+    st.text_input("Jump to line", key=f"{key}_line", placeholder="3.2.15 or ftln-1234",
+                  on_change=jump_to_line, args=(pager, key))
+    if st.session_state.get(f"{key}_missing"):
+        st.warning(f"Line {st.session_state[f'{key}_missing']} is not on these pages")
     
-    # Load the play data
-    play = load_play()
+    col1, col2, col3 = st.columns([1, 4, 1])
+    with col1:
+        st.button("◀ Previous", key=f"{key}_prev", on_click=turn_page, args=(key, -1),
+                  disabled=number <= 1, use_container_width=True)
+    with col2:
+        st.selectbox("Lines", range(1, len(pager) + 1), key=key, label_visibility="collapsed",
+                     format_func=lambda n: f"Page {n} of {len(pager)} · {pager.pages[n - 1].label}")
+    with col3:
+        st.button("Next ▶", key=f"{key}_next", on_click=turn_page, args=(key, 1),
+                  disabled=number >= len(pager), use_container_width=True)
     
-    # Create two-column layout
-    sidebar = st.sidebar
-    main_area = st.container()
+    with st.container(height=600, border=True):
+        st.markdown(pager.render(st.session_state[key]))
+
+def go_to_line(play: Play, line_ref: str) -> bool:
+    """Switch to the scene containing a line reference like 3.2.15 or ftln-1234."""
+    location = play.locate(line_ref)
+    if location is None:
+        return False
+    navigate("scene", location.act.number, location.scene.number, line_ref)
+    return True
+
+def on_goto_line():
+    """Turn the Go to line input into a ?line= deep link."""
+    st.query_params["line"] = st.session_state.goto_line.strip()
+
+def navigate(view: str, act_number: Optional[str] = None, scene_number: Optional[str] = None,
+             line_ref: Optional[str] = None):
+    """Switch views and record the route in the URL, e.g. ?view=scene&act=3&scene=7.
     
-    # Sidebar navigation
-    with sidebar:
-        st.title("Navigation")
-        
-        # Custom CSS for box styling
-        st.markdown("""
-        <style>
-        div.stButton > button {
-            background-color: #f0f2f6;
-            border: 1px solid #ddd;
-            border-radius: 4px;
-            padding: 0.5rem 1rem;
-            margin: 0.25rem 0;
-            width: 100%;
-            text-align: left;
-            transition: all 0.2s;
-        }
-        div.stButton > button:hover {
-            background-color: #e0e2e6;
-            border-color: #999;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-        
-        # Home button
-        if st.button("🏠 Home", key="home", use_container_width=True):
-            st.session_state.current_view = "home"
-            st.rerun()
-        
-        # Characters button
-        if st.button("👥 Characters", key="characters", use_container_width=True):
-            st.session_state.current_view = "characters"
-            st.rerun()
-        
-        # Synopsis button
-        if st.button("📜 Synopsis", key="synopsis", use_container_width=True):
-            st.session_state.current_view = "synopsis"
-            st.rerun()
-        
-        # Entire Play button
-        if st.button("📖 Entire Play", key="entire_play", use_container_width=True):
-            st.session_state.current_view = "full"
-            st.rerun()
-        
-        # Act and Scene navigation
-        for act in play.acts:
-            # Expand only if this act is currently selected
-            expanded = (
-                (st.session_state.current_view == "act" and st.session_state.current_act == act.number) or
-                (st.session_state.current_view == "scene" and st.session_state.current_act == act.number)
-            )
-            with st.expander(f"📁 Act {act.number}", expanded=expanded):
-                # Act button
-                if st.button(f"📄 Act {act.number} (All Scenes)", 
-                           key=f"act_{act.number}", 
-                           use_container_width=True):
-                    st.session_state.current_view = "act"
-                    st.session_state.current_act = act.number
-                    st.rerun()
-                
-                # Scene buttons
-                for scene in act.scenes:
-                    if st.button(f"　　📄 Scene {scene.number}", 
-                               key=f"scene_{act.number}_{scene.number}", 
-                               use_container_width=True):
-                        st.session_state.current_view = "scene"
-                        st.session_state.current_act = act.number
-                        st.session_state.current_scene = scene.number
-                        st.rerun()
+    Used as an on_click callback, so a click costs one rerun rather than a
+    rerun followed by st.rerun(). A linked line is kept only when line_ref
+    names it, so a stale ?line= cannot override the route on reload.
+    """
+    st.session_state.current_view = view
+    if act_number is not None:
+        st.session_state.current_act = act_number
+    if scene_number is not None:
+        st.session_state.current_scene = scene_number
+    st.session_state.current_line = line_ref
+    st.session_state.linked_line = line_ref
     
-    # Main content area
-    with main_area:
+    params = {"view": view} if view != "home" else {}
+    if view in ("act", "scene"):
+        params["act"] = st.session_state.current_act
+    if view == "scene":
+        params["scene"] = st.session_state.current_scene
+    if line_ref:
+        params["line"] = line_ref
+    for key in ROUTE_PARAMS:
+        if key not in params:
+            st.query_params.pop(key, None)
+    st.query_params.update(params)
+
+def read_route():
+    """Take the view, act and scene from the URL when it names them."""
+    view = st.query_params.get("view")
+    if view in VIEWS:
+        st.session_state.current_view = view
+    if "act" in st.query_params:
+        st.session_state.current_act = st.query_params["act"]
+    if "scene" in st.query_params:
+        st.session_state.current_scene = st.query_params["scene"]
+
+def on_change_play():
+    """Start the newly picked play from its home page."""
+    navigate("home", "1", "1")
+    st.query_params["play"] = st.session_state.current_play
+    for key in [key for key in st.session_state if str(key).startswith("page_")]:
+        # Page numbers belong to the previous play
+        del st.session_state[key]
+
+def show_view_buttons():
+    """Draw the sidebar buttons switching between the views of the current play."""
+    # Home button
+    st.button("🏠 Home", key="home", use_container_width=True, on_click=navigate, args=("home",))
+    
+    # Characters button
+    st.button("👥 Characters", key="characters", use_container_width=True,
+              on_click=navigate, args=("characters",))
+    
+    # Synopsis button
+    st.button("📜 Synopsis", key="synopsis", use_container_width=True, on_click=navigate, args=("synopsis",))
+    
+    # Entire Play button
+    st.button("📖 Entire Play", key="entire_play", use_container_width=True, on_click=navigate, args=("full",))
+    
+    # Search button
+    st.button("🔍 Search", key="search", use_container_width=True, on_click=navigate, args=("search",))
+    
+    # Concordance button
+    st.button("📑 Concordance", key="concordance", use_container_width=True,
+              on_click=navigate, args=("concordance",))
+    
+    # Frequency button
+    st.button("📊 Frequencies", key="frequency", use_container_width=True,
+              on_click=navigate, args=("frequency",))
+    
+    # Stage presence button
+    st.button("🎬 On Stage", key="on_stage", use_container_width=True, on_click=navigate, args=("stage",))
+
+def act_scene_links(play: Play, play_id: str, open_act: Optional[str]) -> str:
+    """Return the act and scene list as HTML links to their routes, with one act expanded.
+    
+    One Markdown element instead of a button per act and scene: the sidebar
+    costs next to nothing to redraw, and a link opens its route directly.
+    """
+    blocks = []
+    for act in play.acts:
+        base = f"?play={play_id}&view=act&act={act.number}"
+        links = [f'<a class="nav-link" href="{base}" target="_self">📄 Act {act.number} (All Scenes)</a>']
+        for scene in act.scenes:
+            links.append(f'<a class="nav-link nav-scene" href="?play={play_id}&view=scene&act={act.number}'
+                         f'&scene={scene.number}" target="_self">📄 Scene {scene.number}</a>')
+        # Expand only if this act is currently selected
+        state = " open" if act.number == open_act else ""
+        blocks.append(f'<details{state}><summary>📁 Act {act.number}</summary>{"".join(links)}</details>')
+    return '<nav class="act-scene-links">' + "".join(blocks) + "</nav>"
+
+@st.fragment
+def show_view(play: Play, play_id: str, renderer: PlayRenderer):
+    """Draw the content pane for the current view.
+    
+    A fragment: widgets inside the pane (pagers, search and concordance inputs,
+    stage and statistics pickers) rerun only this function, not the sidebar.
+    """
+    synopsis = SYNOPSES.get(play_id, "No synopsis is available for this play.")
+    
+    with timing.span(f"main.view.{st.session_state.current_view}"):
         # Display content based on current view and selection
         if st.session_state.current_view == "home":
             # Center the title with dark crimson color
-            st.markdown("<h1 style='text-align: center; color: #8B0000;'>King Lear</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
             
             # Add separator
             st.markdown("---")
@@ -134,7 +266,7 @@ def main():
             with col2:
                 # Display the synopsis
                 st.markdown("### Synopsis")
-                st.markdown(KING_LEAR_SYNOPSIS)
+                st.markdown(synopsis)
             
             # Add separator and acknowledgment
             st.markdown("---")
@@ -147,10 +279,30 @@ def main():
             )
         
         elif st.session_state.current_view == "characters":
-            st.markdown("<h1 style='text-align: center; color: #8B0000;'>King Lear</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
             st.subheader("Characters")
             st.write(f"Total characters: {len(play.characters)}")
             
+            stats = load_character_stats(play_id)
+            if stats.tokens is not play.tokens:
+                # The play was reloaded; recount for it
+                load_character_stats.clear()
+                stats = load_character_stats(play_id)
+            
+            # Speaking statistics, precomputed per play; columns sort on click
+            col1, col2 = st.columns(2)
+            with col1:
+                scope = st.selectbox("Scope", ["Whole play"] + [act.get_formatted_title() for act in play.acts],
+                                     key="stats_scope")
+            with col2:
+                sort_by = st.selectbox("Sort by", SORT_KEYS, index=SORT_KEYS.index("Lines"), key="stats_sort")
+            act_number = None if scope == "Whole play" else scope.split()[-1]
+            st.dataframe(
+                stats.table(act_number=act_number, sort_by=sort_by, descending=sort_by != "Character"),
+                hide_index=True,
+                column_config={"Share": st.column_config.NumberColumn("Share", format="%.1f%%")},
+            )
+            
             # Display characters in a scrollable container
             with st.container(height=600, border=True):
                 # Group characters by their groups if available
@@ -186,49 +338,227 @@ def main():
                     st.markdown("")
         
         elif st.session_state.current_view == "synopsis":
-            st.markdown("<h1 style='text-align: center; color: #8B0000;'>King Lear</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
             st.subheader("Synopsis")
             
             # Display synopsis in a scrollable container
             with st.container(height=600, border=True):
-                st.markdown(KING_LEAR_SYNOPSIS)
+                st.markdown(synopsis)
         
         elif st.session_state.current_view == "full":
-            st.markdown("<h1 style='text-align: center; color: #8B0000;'>King Lear</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
             st.subheader(f"Complete text of {play.title}")
             st.write(f"Acts: {play.get_act_count()} | Total scenes: {play.get_total_scenes()}")
             
-            # Display entire play with all acts and scenes
-            with st.container(height=600, border=True):
-                for act in play.acts:
-                    st.markdown(f"# {act.get_formatted_title()}")
-                    st.markdown("---")
-                    
-                    for scene in act.scenes:
-                        st.markdown(f"## {scene.title}")
-                        formatted_content = scene.get_formatted_content()
-                        st.markdown(formatted_content)
-                        st.markdown("")  # Add spacing between scenes
+            pager = load_pager(play_id)
+            if pager.play is not play:
+                # The play was reloaded; repaginate it
+                load_pager.clear()
+                pager = load_pager(play_id)
+            
+            # Display one page of the play at a time
+            show_page(pager, "page_full")
+            
+        elif st.session_state.current_view == "search":
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
+            st.subheader("Search")
             
+            search_index = load_search_index(play_id)
+            if search_index.tokens is not play.tokens:
+                # The play was reloaded; rebuild the index for it
+                load_search_index.clear()
+                search_index = load_search_index(play_id)
+            
+            query = st.text_input("Word or phrase", key="search_query", placeholder="nothing, thou art, …")
+            use_lemma = st.checkbox("Match all forms of each word (lemma)", key="search_lemma")
+            
+            if query:
+                total, hits = search_index.search(query, lemma=use_lemma, limit=SEARCH_RESULT_LIMIT)
+                if total > len(hits):
+                    st.write(f"Matches: {total} (showing the first {len(hits)})")
+                else:
+                    st.write(f"Matches: {total}")
+                
+                # Display hits with their act.scene.line and context
+                with st.container(height=600, border=True):
+                    results = []
+                    for hit in hits:
+                        left, match, right = search_index.snippet(hit)
+                        ref = hit.ref or f"{hit.act_number}.{hit.scene_number}"
+                        if hit.ftln:
+                            ref = f"[{ref}](?play={play_id}&line=ftln-{hit.ftln:04d})"
+                        context = " ".join(part for part in (left, f"**{match}**", right) if part)
+                        results.append(f"- {ref} — {context}")
+                    st.markdown("\n".join(results))
+        
+        elif st.session_state.current_view == "concordance":
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
+            st.subheader("Concordance")
+            
+            concordance = load_concordance(play_id)
+            if concordance.tokens is not play.tokens:
+                # The play was reloaded; rebuild the engine for it
+                load_concordance.clear()
+                concordance = load_concordance(play_id)
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                lemma = st.text_input("Lemma", key="kwic_lemma", placeholder="nature").strip()
+            with col2:
+                pos = st.text_input("Part of speech", key="kwic_pos", placeholder="n1, or n* for all nouns").strip()
+            with col3:
+                form = st.text_input("Word form", key="kwic_form", placeholder="Nature").strip()
+            col1, col2 = st.columns(2)
+            with col1:
+                width = st.slider("Context words", min_value=1, max_value=12, value=5, key="kwic_width")
+            with col2:
+                sort_label = st.radio("Sort by", ["Position", "Left context", "Right context"],
+                                      horizontal=True, key="kwic_sort")
+            sort = {"Position": None, "Left context": "left", "Right context": "right"}[sort_label]
+            
+            if lemma or pos or form:
+                lines = concordance.kwic(lemma=lemma or None, pos=pos or None, form=form or None,
+                                         width=width, sort=sort)
+                st.write(f"Matches: {len(lines)}")
+                st.dataframe(
+                    [
+                        {
+                            "Line": line.ref,
+                            "Speaker": line.speaker,
+                            "Left": line.left,
+                            "Keyword": line.keyword,
+                            "Right": line.right,
+                        }
+                        for line in lines[:CONCORDANCE_LIMIT]
+                    ],
+                    height=600,
+                    hide_index=True,
+                )
+        
+        elif st.session_state.current_view == "frequency":
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
+            st.subheader("Word Frequencies")
+            
+            engine = load_frequency(play_id)
+            if engine.tokens is not play.tokens:
+                # The play was reloaded; rebuild the engine for it
+                load_frequency.clear()
+                engine = load_frequency(play_id)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                unit_label = st.radio("Count", ["Lemmas", "Word forms"], horizontal=True, key="freq_unit")
+            with col2:
+                n = st.slider("Words per n-gram", min_value=1, max_value=MAX_N, value=1, key="freq_n")
+            unit = {"Lemmas": "lemma", "Word forms": "form"}[unit_label]
+            
+            # Scope: the whole play or an act or scene, optionally one speaker's words
+            act_numbers = [None] + [act.number for act in play.acts]
+            if st.session_state.get("freq_act") not in act_numbers:
+                st.session_state.freq_act = None
+            act = play.get_act(st.session_state.get("freq_act")) if st.session_state.get("freq_act") else None
+            scene_numbers = [None] + ([scene.number for scene in act.scenes] if act else [])
+            if st.session_state.get("freq_scene") not in scene_numbers:
+                st.session_state.freq_scene = None
+            speakers = [None] + [char.id for char in play.characters if char.id and play.speeches_by(char.id)]
+            names = {char.id: char.name for char in play.characters if char.id}
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                act_number = st.selectbox("Act", act_numbers, key="freq_act",
+                                          format_func=lambda number: "Whole play" if number is None else f"Act {number}")
+            with col2:
+                scene_number = st.selectbox("Scene", scene_numbers, key="freq_scene", disabled=act is None,
+                                            format_func=lambda number: "All scenes" if number is None else f"Scene {number}")
+            with col3:
+                speaker = st.selectbox("Speaker", speakers, key="freq_speaker",
+                                       format_func=lambda ref: "Everyone" if ref is None else names.get(ref, ref))
+            
+            table = engine.counts(unit, n, act_number=act_number, scene_number=scene_number, speaker=speaker)
+            label = "Lemma" if unit == "lemma" else "Word"
+            st.write(f"{table.total:,} {label.lower() + 's' if n == 1 else f'{n}-grams'} · {len(table):,} distinct")
+            st.dataframe(
+                [
+                    {
+                        "Rank": rank,
+                        label if n == 1 else f"{label} {n}-gram": text,
+                        "Count": count,
+                        "Per 1,000": round(count * 1000 / table.total, 2),
+                    }
+                    for rank, (text, count) in enumerate(table.top(FREQUENCY_LIMIT), start=1)
+                ],
+                height=600,
+                hide_index=True,
+            )
+        
+        elif st.session_state.current_view == "stage":
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
+            st.subheader("On Stage")
+            
+            stage = play.stage
+            names = {char.id: char.name for char in play.characters if char.id}
+            
+            # Who is on stage at one line
+            line_ref = st.text_input("On stage at line", key="stage_line", placeholder="3.7.40 or ftln-1234").strip()
+            if line_ref:
+                present = play.on_stage(line_ref)
+                if present is None:
+                    st.warning(f"Line {line_ref} not found")
+                else:
+                    st.write(", ".join(names.get(ref, ref) for ref in present) or "Nobody")
+            
+            # Spans where every picked character is on stage together
+            picked = st.multiselect("Characters", stage.ids, key="stage_who",
+                                    format_func=lambda ref: names.get(ref, ref))
+            if picked:
+                spans = stage.spans(*picked)
+                st.write(f"Shared spans: {len(spans)} · {sum(end - start for start, end in spans)} lines")
+                rows = []
+                for start, end in spans:
+                    act_number, scene_number = stage.scene_of(start)
+                    rows.append({
+                        "Scene": f"{act_number}.{scene_number}",
+                        "From": play.lines.ref_for(start),
+                        "To": play.lines.ref_for(end - 1),
+                        "Lines": end - start,
+                    })
+                st.dataframe(rows, hide_index=True)
+            
+            # Timeline: lines on stage per character and scene
+            st.markdown("### Timeline")
+            counts = stage.scene_lines()
+            scene_labels = [f"{act_number}.{scene_number}" for act_number, scene_number in stage.scene_keys]
+            shown = [stage.column(ref) for ref in picked] if picked else range(len(stage))
+            st.dataframe(
+                [
+                    {"Character": names.get(stage.ids[row], stage.ids[row]),
+                     **dict(zip(scene_labels, counts[row].tolist()))}
+                    for row in shown
+                ],
+                height=600,
+                hide_index=True,
+            )
+        
         elif st.session_state.current_view == "act":
-            st.markdown("<h1 style='text-align: center; color: #8B0000;'>King Lear</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
             current_act = play.get_act(st.session_state.current_act)
             if current_act:
                 st.subheader(f"{current_act.get_formatted_title()}")
                 st.write(f"Scenes: {current_act.get_scene_count()}")
                 
-                # Display all scenes in this act
-                with st.container(height=600, border=True):
-                    for scene in current_act.scenes:
-                        st.markdown(f"## {scene.title}")
-                        formatted_content = scene.get_formatted_content()
-                        st.markdown(formatted_content)
-                        st.markdown("---")  # Divider between scenes
+                pager = load_pager(play_id, current_act.number)
+                if pager.play is not play:
+                    # The play was reloaded; repaginate it
+                    load_pager.clear()
+                    pager = load_pager(play_id, current_act.number)
+                
+                # Display one page of the act at a time
+                show_page(pager, f"page_act_{current_act.number}")
             else:
                 st.error("Act not found")
                 
         elif st.session_state.current_view == "scene":
-            st.markdown("<h1 style='text-align: center; color: #8B0000;'>King Lear</h1>", unsafe_allow_html=True)
+            st.markdown(f"<h1 style='text-align: center; color: #8B0000;'>{play.title}</h1>", unsafe_allow_html=True)
             current_act = play.get_act(st.session_state.current_act)
             if current_act:
                 current_scene = current_act.get_scene(st.session_state.current_scene)
@@ -236,14 +566,147 @@ def main():
                     st.subheader(current_scene.title)
                     st.write(f"Content: {len(current_scene.content)} items")
                     
+                    # Show the linked line when it falls in this scene
+                    location = play.locate(st.session_state.current_line) if st.session_state.current_line else None
+                    if location and location.scene is current_scene:
+                        # The line itself, not the whole prose paragraph holding it
+                        line = play.line(st.session_state.current_line)
+                        text = line.text if line else current_scene.content[location.offset]['text']
+                        st.info(f"📍 Line {location.ref}: {text}")
+                    
                     # Display the selected scene with full formatting
                     with st.container(height=600, border=True):
-                        formatted_content = current_scene.get_formatted_content()
-                        st.markdown(formatted_content)
+                        st.markdown(renderer.scene(current_act.number, current_scene.number))
+                    
+                    # Warm the next and previous scenes while the reader reads this one
+                    renderer.prefetch(current_act.number, current_scene.number)
                 else:
                     st.error("Scene not found")
             else:
                 st.error("Act not found")
 
+def main():
+    # Collect timing spans for this rerun (no-op unless CORDELIA_TIMING is set)
+    timing.begin_run()
+    
+    # Initialize session state
+    if "current_view" not in st.session_state:
+        st.session_state.current_view = "home"
+    if "current_act" not in st.session_state:
+        st.session_state.current_act = "1"
+    if "current_scene" not in st.session_state:
+        st.session_state.current_scene = "1"
+    if "current_line" not in st.session_state:
+        st.session_state.current_line = None
+    # The URL wins, so routes survive a reload and can be shared
+    read_route()
+    
+    # Load the corpus and the selected play
+    with timing.span("main.load_play"):
+        corpus = load_corpus()
+        if not len(corpus):
+            st.error(f"No TEI plays found in {DATA_DIR}")
+            return
+        if st.query_params.get("play") in corpus.plays:
+            st.session_state.current_play = st.query_params["play"]
+        if st.session_state.get("current_play") not in corpus.plays:
+            st.session_state.current_play = DEFAULT_PLAY_ID if DEFAULT_PLAY_ID in corpus.plays else next(iter(corpus.plays))
+        play_id = st.session_state.current_play
+        # Fetched once per rerun; an edited source file is reloaded in the background
+        play = load_play(play_id)
+        # Titled after the selected play; Streamlit accepts the config after other elements
+        st.set_page_config(
+            page_title=f"{play.title} - Shakespeare",
+            page_icon="📖",
+            layout="wide"
+        )
+        renderer = load_renderer(play_id)
+        if renderer.play is not play:
+            # The play was reloaded; cached Markdown belongs to the old one
+            renderer.invalidate(play)
+    
+    # Deep link to a line, e.g. ?line=3.2.15 or ?line=ftln-1234
+    line_ref = st.query_params.get("line")
+    line_not_found = False
+    if line_ref and line_ref != st.session_state.get("linked_line"):
+        st.session_state.linked_line = line_ref
+        line_not_found = not go_to_line(play, line_ref)
+    
+    # Create two-column layout
+    sidebar = st.sidebar
+    main_area = st.container()
+    
+    # Sidebar navigation
+    with sidebar, timing.span("main.sidebar"):
+        st.title("Navigation")
+        
+        # Play picker, shown when the data directory holds more than one play
+        if len(corpus) > 1:
+            st.selectbox("🎭 Play", list(corpus.plays), key="current_play",
+                         format_func=lambda pid: corpus.plays[pid].title, on_change=on_change_play)
+        for failure in corpus.failures:
+            st.warning(f"Could not load {failure.path.name}")
+        
+        # Custom CSS for box styling
+        st.markdown("""
+        <style>
+        div.stButton > button {
+            background-color: #f0f2f6;
+            border: 1px solid #ddd;
+            border-radius: 4px;
+            padding: 0.5rem 1rem;
+            margin: 0.25rem 0;
+            width: 100%;
+            text-align: left;
+            transition: all 0.2s;
+        }
+        div.stButton > button:hover {
+            background-color: #e0e2e6;
+            border-color: #999;
+        }
+        nav.act-scene-links summary {
+            cursor: pointer;
+            padding: 0.4rem 0;
+        }
+        nav.act-scene-links a.nav-link {
+            display: block;
+            padding: 0.3rem 0.5rem;
+            color: inherit;
+            text-decoration: none;
+            border-radius: 4px;
+        }
+        nav.act-scene-links a.nav-scene {
+            padding-left: 2rem;
+        }
+        nav.act-scene-links a.nav-link:hover {
+            background-color: #e0e2e6;
+        }
+        </style>
+        """, unsafe_allow_html=True)
+        
+        show_view_buttons()
+        
+        # Jump to a line reference
+        st.text_input("🔎 Go to line", key="goto_line", placeholder="3.2.15 or ftln-1234",
+                      on_change=on_goto_line)
+        if line_not_found:
+            st.warning(f"Line {line_ref} not found")
+        
+        # Act and Scene navigation, as links to their routes
+        with timing.span("main.sidebar.act_links"):
+            view = st.session_state.current_view
+            open_act = st.session_state.current_act if view in ("act", "scene") else None
+            st.markdown(act_scene_links(play, play_id, open_act), unsafe_allow_html=True)
+    
+    # Main content area
+    with main_area:
+        show_view(play, play_id, renderer)
+    
+    spans = timing.end_run()
+    if timing.PANEL:
+        # Debug panel: where this rerun's time went
+        with main_area, st.expander("⏱ Timings for this rerun"):
+            st.dataframe(timing.summarize(spans), hide_index=True)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
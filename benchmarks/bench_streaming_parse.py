@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Compare TEIParser.parse() against parse_streaming() for time and peak memory.
+
+Each measurement runs in a fresh interpreter so that peak RSS is not polluted
+by earlier runs. Larger plays are simulated by repeating the acts of the
+King Lear body, which shows how each mode scales with the size of the text.
+Both modes grow linearly, since the returned Play holds every scene and its
+indexes; streaming saves the element tree of all but the current scene.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+XML_PATH = ROOT / "data" / "king-lear_TEIsimple_FolgerShakespeare.xml"
+
+# Runs inside the child interpreter; prints one JSON line
+CHILD = """
+import json, resource, sys, time, tracemalloc
+from pathlib import Path
+sys.path.insert(0, {root!r})
+from parser import TEIParser
+
+parser = TEIParser(Path({path!r}))
+parse = getattr(parser, {method!r})
+tracemalloc.start()
+start = time.perf_counter()
+play = parse()
+elapsed = time.perf_counter() - start
+_, peak = tracemalloc.get_traced_memory()
+print(json.dumps({{
+    "seconds": elapsed,
+    "traced_peak_mb": peak / 2**20,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "scenes": play.get_total_scenes(),
+}}))
+"""
+
+
+def make_scaled_play(factor: int, directory: Path) -> Path:
+    """Write a copy of the play whose body repeats every act `factor` times."""
+    if factor == 1:
+        return XML_PATH
+    text = XML_PATH.read_text(encoding="utf-8")
+    start = text.index("<body>") + len("<body>")
+    end = text.index("</body>")
+    scaled = text[:start] + text[start:end] * factor + text[end:]
+    out_path = directory / f"king-lear-x{factor}.xml"
+    out_path.write_text(scaled, encoding="utf-8")
+    return out_path
+
+
+def measure(path: Path, method: str) -> dict:
+    """Run one parse in a child interpreter and return its measurements."""
+    code = CHILD.format(root=str(ROOT), path=str(path), method=method)
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--scales", type=int, nargs="+", default=[1, 2, 4, 8],
+                            help="play size multipliers to measure")
+    arg_parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = arg_parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for factor in args.scales:
+            path = make_scaled_play(factor, Path(tmp))
+            size_mb = path.stat().st_size / 2**20
+            for method in ("parse", "parse_streaming"):
+                row = measure(path, method)
+                row.update({"scale": factor, "file_mb": size_mb, "method": method})
+                results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'scale':>5} {'file MB':>8} {'method':<16} {'seconds':>8} {'traced MB':>10} {'max RSS MB':>11}")
+    for row in results:
+        print(f"{row['scale']:>5} {row['file_mb']:>8.1f} {row['method']:<16} "
+              f"{row['seconds']:>8.3f} {row['traced_peak_mb']:>10.1f} {row['max_rss_mb']:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
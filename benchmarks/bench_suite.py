@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Benchmark the parse, format, lookup, search, frequency and render paths of the app.
+
+Each case is warmed up and then timed over --repeat runs; the median and the
+fastest run are reported. Peak traced memory is measured in one further run
+under tracemalloc, kept apart so tracing does not slow the timed runs.
+
+Cases:
+    parse[<backend>]   TEIParser.parse() of King Lear, once per XML backend
+    format_content     Scene.get_formatted_content() for every scene
+    lookup             Play.get_act() and Act.get_scene() for every scene, 10,000 times
+    search             SearchIndex.search() of a lemma phrase, 1,000 times
+    frequency          a new FrequencyEngine counting 1- to 3-grams of lemmas in every act
+    render[<view>]     a headless rerun of app.py showing one view, via Streamlit's AppTest
+
+Save results with --output, and compare a run against saved results with
+--compare; the run exits with status 1 when any case's median time or peak
+memory grows by more than --threshold (a fraction, 0.25 = 25%):
+
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json --threshold 0.2
+"""
+
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from functools import lru_cache, partial
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+from parser import TEIParser
+from xmlbackend import available_backends
+
+XML_PATH = ROOT / "data" / "king-lear_TEIsimple_FolgerShakespeare.xml"
+
+# Rounds of act and scene lookups per lookup run; each lookup takes well
+# under a microsecond, so a run needs this many to stay clear of timer noise
+LOOKUP_ROUNDS = 10000
+
+# Lemma phrase queries per search run
+SEARCH_ROUNDS = 1000
+
+# Session state that selects each app view, with inputs that give it work to do
+VIEWS = {
+    "home": {"current_view": "home"},
+    "characters": {"current_view": "characters"},
+    "synopsis": {"current_view": "synopsis"},
+    "full": {"current_view": "full"},
+    "act": {"current_view": "act", "current_act": "3"},
+    "scene": {"current_view": "scene", "current_act": "3", "current_scene": "7"},
+    "search": {"current_view": "search", "search_query": "nothing"},
+    "concordance": {"current_view": "concordance", "kwic_lemma": "nature"},
+    "stage": {"current_view": "stage", "stage_line": "3.7.40", "stage_who": ["Lear_Lr", "Cordelia_Lr"]},
+    "frequency": {"current_view": "frequency", "freq_n": 2, "freq_act": "3"},
+}
+
+
+def parse_case(backend: str):
+    """Return a run function parsing the play with one XML backend."""
+    def run():
+        TEIParser(XML_PATH, backend=backend).parse()
+    return run
+
+
+def format_case(play):
+    """Return a run function formatting every scene of a play."""
+    scenes = [scene for act in play.acts for scene in act.scenes]
+    def run():
+        for scene in scenes:
+            scene.get_formatted_content()
+    return run
+
+
+def lookup_case(play):
+    """Return a run function looking up every act and scene of a play by number."""
+    numbers = [(act.number, scene.number) for act in play.acts for scene in act.scenes]
+    def run():
+        for _ in range(LOOKUP_ROUNDS):
+            for act_number, scene_number in numbers:
+                play.get_act(act_number).get_scene(scene_number)
+    return run
+
+
+def search_case(play):
+    """Return a run function querying the play's search index for a lemma phrase."""
+    from search import SearchIndex
+
+    index = SearchIndex(play.tokens)
+    def run():
+        for _ in range(SEARCH_ROUNDS):
+            index.search("thou art", lemma=True)
+    return run
+
+
+def frequency_case(play):
+    """Return a run function counting n-grams of every act with a new, uncached engine."""
+    from frequency import FrequencyEngine
+
+    act_numbers = [act.number for act in play.acts]
+    def run():
+        engine = FrequencyEngine(play.tokens)
+        for act_number in act_numbers:
+            for n in (1, 2, 3):
+                engine.counts("lemma", n=n, act_number=act_number)
+    return run
+
+
+def render_case(state: dict):
+    """Return a run function rerunning app.py headlessly in one view."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(str(ROOT / "app.py"), default_timeout=120)
+    for key, value in state.items():
+        app.session_state[key] = value
+    def run():
+        app.run()
+        if app.exception:
+            raise RuntimeError(f"app raised: {app.exception[0].message}")
+    return run
+
+
+@lru_cache(maxsize=None)
+def load_play():
+    """Parse the play shared by the cases that do not rerun the app."""
+    return TEIParser(XML_PATH).parse()
+
+
+def build_cases() -> dict:
+    """Return every benchmark case as name -> function returning its run function."""
+    cases = {f"parse[{backend}]": partial(parse_case, backend) for backend in available_backends()}
+    cases["format_content"] = lambda: format_case(load_play())
+    cases["lookup"] = lambda: lookup_case(load_play())
+    cases["search"] = lambda: search_case(load_play())
+    cases["frequency"] = lambda: frequency_case(load_play())
+    for view, state in VIEWS.items():
+        cases[f"render[{view}]"] = partial(render_case, state)
+    return cases
+
+
+def measure(run, repeat: int, warmup: int) -> dict:
+    """Time repeat runs after warmup runs, then trace the peak memory of one more."""
+    for _ in range(warmup):
+        run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_seconds": statistics.median(times),
+        "min_seconds": min(times),
+        "runs": repeat,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Return a line for every case whose time or memory grew past the threshold."""
+    regressions = []
+    for name, row in results.items():
+        old = baseline.get(name)
+        if old is None:
+            continue
+        for metric in ("median_seconds", "peak_mb"):
+            if old[metric] > 0 and row[metric] > old[metric] * (1 + threshold):
+                change = row[metric] / old[metric] - 1
+                regressions.append(f"{name}: {metric} {old[metric]:.4g} → {row[metric]:.4g} (+{change:.0%})")
+    return regressions
+
+
+def main() -> int:
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=5, help="timed runs per case")
+    arg_parser.add_argument("--warmup", type=int, default=1, help="untimed runs before timing")
+    arg_parser.add_argument("--only", nargs="+", metavar="PATTERN",
+                            help="run only cases matching these glob patterns, e.g. 'render*'")
+    arg_parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    arg_parser.add_argument("--compare", type=Path, metavar="BASELINE", help="JSON results to compare against")
+    arg_parser.add_argument("--threshold", type=float, default=0.25,
+                            help="allowed growth of median time and peak memory (default: 0.25)")
+    args = arg_parser.parse_args()
+
+    # The app reads data/ and images/ relative to the working directory
+    os.chdir(ROOT)
+    cases = build_cases()
+    if args.only:
+        cases = {name: setup for name, setup in cases.items()
+                 if any(fnmatch.fnmatchcase(name, pattern) for pattern in args.only)}
+
+    results = {}
+    print(f"{'case':<22} {'median ms':>10} {'min ms':>10} {'peak MB':>9}")
+    for name, setup in cases.items():
+        row = results[name] = measure(setup(), args.repeat, args.warmup)
+        print(f"{name:<22} {row['median_seconds'] * 1000:>10.2f} {row['min_seconds'] * 1000:>10.2f} "
+              f"{row['peak_mb']:>9.2f}")
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "results": results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+        print(f"✓ Wrote {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"✗ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"✓ No regressions beyond {args.threshold:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Time text extraction on every element the parser turns into text.
+
+Compares the single-pass _element_text against the recursive extractor it
+replaced (kept below as the baseline), over all speakers, <p>, <l>, stage
+directions and roleDesc elements of King Lear. The two differ only in where
+they put spaces, which is checked before timing.
+"""
+
+import argparse
+import json
+import sys
+import time
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+from parser import TEI_NS, _element_text
+
+XML_PATH = ROOT / "data" / "king-lear_TEIsimple_FolgerShakespeare.xml"
+
+
+def recursive_element_text(elem) -> str:
+    """The previous TEIParser._get_element_text, for comparison."""
+    text_parts = []
+    if elem.text:
+        cleaned_text = ' '.join(elem.text.split())
+        if cleaned_text:
+            text_parts.append(cleaned_text)
+    for child in elem:
+        if child.tag == f"{{{TEI_NS['tei']}}}w":
+            if child.text:
+                word = child.text.strip()
+                if word:
+                    text_parts.append(word)
+        elif child.tag == f"{{{TEI_NS['tei']}}}c":
+            text_parts.append(" ")
+        elif child.tag == f"{{{TEI_NS['tei']}}}pc":
+            if child.text:
+                punct = child.text.strip()
+                if punct:
+                    text_parts.append(punct)
+        else:
+            child_text = recursive_element_text(child)
+            if child_text:
+                text_parts.append(child_text)
+        if child.tail:
+            cleaned_tail = ' '.join(child.tail.split())
+            if cleaned_tail:
+                text_parts.append(cleaned_tail)
+    result = ' '.join(text_parts)
+    return ' '.join(result.split())
+
+
+def text_elements(root) -> list:
+    """Return the elements the parser extracts text from, in document order."""
+    names = ("speaker", "p", "l", "stage", "roleDesc")
+    return [elem for name in names for elem in root.iter(f"{{{TEI_NS['tei']}}}{name}")]
+
+
+def best_of(function, elements, repeat: int) -> float:
+    """Return the fastest of repeat passes of function over all elements."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for elem in elements:
+            function(elem)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--repeat", type=int, default=7, help="passes per extractor; the fastest counts")
+    arg_parser.add_argument("--json", action="store_true", help="print raw JSON results")
+    args = arg_parser.parse_args()
+    
+    elements = text_elements(ET.parse(XML_PATH).getroot())
+    for elem in elements:
+        old, new = recursive_element_text(elem), _element_text(elem)
+        assert old.replace(" ", "") == new.replace(" ", ""), (old, new)
+    
+    results = {
+        "elements": len(elements),
+        "recursive_seconds": best_of(recursive_element_text, elements, args.repeat),
+        "single_pass_seconds": best_of(_element_text, elements, args.repeat),
+    }
+    results["speedup"] = results["recursive_seconds"] / results["single_pass_seconds"]
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    
+    print(f"{results['elements']:,} elements, best of {args.repeat}")
+    print(f"recursive    {results['recursive_seconds'] * 1000:8.1f} ms")
+    print(f"single pass  {results['single_pass_seconds'] * 1000:8.1f} ms")
+    print(f"speedup      {results['speedup']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
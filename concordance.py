@@ -0,0 +1,140 @@
+"""Keyword-in-context concordances over lemma and POS annotations.
+
+Matching, context windows and sorting all work on the integer-coded columns
+of a TokenStore with NumPy masks, fancy indexing and lexsort; Python only
+touches the final rows when they are joined into strings.
+
+    >>> concordance = Concordance(play.tokens)
+    >>> lines = concordance.kwic(lemma="nature", pos="n1", width=6, sort="right")
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from tokens import NO_CODE, TokenStore
+
+SORT_KEYS = (None, 'left', 'right')
+
+
+@dataclass
+class ConcordanceLine:
+    """One keyword with its left and right context."""
+    position: int
+    act_number: str
+    scene_number: str
+    ref: Optional[str]
+    speaker: Optional[str]
+    left: str
+    keyword: str
+    right: str
+
+
+class Concordance:
+    """KWIC queries against a TokenStore."""
+    
+    def __init__(self, tokens: TokenStore):
+        self.tokens = tokens
+        # Case-insensitive alphabetical rank of every string code, for sorting;
+        # the extra trailing slot ranks NO_CODE (empty context) first
+        lowered = [text.lower() for text in tokens.strings.strings]
+        rank_of = {text: rank for rank, text in enumerate(sorted(set(lowered)), start=1)}
+        self._rank = np.array([rank_of[text] for text in lowered] + [0], dtype=np.int32)
+    
+    def _codes_matching(self, value: str) -> np.ndarray:
+        """Codes of strings equal to value, or starting with it if it ends in '*'."""
+        strings = self.tokens.strings
+        if value.endswith('*'):
+            prefix = value[:-1]
+            return np.array([code for code, text in enumerate(strings.strings) if text.startswith(prefix)],
+                            dtype=np.int32)
+        code = strings.code(value)
+        return np.array([code] if code != NO_CODE else [], dtype=np.int32)
+    
+    def positions(self, lemma: Optional[str] = None, pos: Optional[str] = None,
+                  form: Optional[str] = None) -> np.ndarray:
+        """Return token positions matching every given criterion.
+        
+        POS tags are MorphAdorner tags without the '#' (e.g. "n1"); any value
+        ending in '*' matches as a prefix (e.g. pos="n*" for all nouns).
+        """
+        tokens = self.tokens
+        mask = np.ones(len(tokens), dtype=bool)
+        for column, value in ((tokens.lemma, lemma), (tokens.pos, pos), (tokens.form, form)):
+            if value:
+                mask &= np.isin(column, self._codes_matching(value))
+        if not (lemma or pos or form):
+            mask[:] = False
+        return np.nonzero(mask)[0]
+    
+    def windows(self, positions: np.ndarray, width: int) -> np.ndarray:
+        """Return form codes of each keyword's context, one row per keyword.
+        
+        Rows hold `width` tokens of left context, the keyword and `width`
+        tokens of right context; slots outside the keyword's speech (or scene,
+        for stage directions) are NO_CODE.
+        """
+        tokens = self.tokens
+        windows = positions[:, None] + np.arange(-width, width + 1)
+        
+        # Bounds of the speech containing each keyword, else of its scene
+        speech = np.searchsorted(tokens.speech_start, positions, side='right') - 1
+        clipped_speech = np.clip(speech, 0, None)
+        in_speech = (speech >= 0) & (positions < tokens.speech_end[clipped_speech])
+        scene = tokens.scene[positions]
+        low = np.where(in_speech, tokens.speech_start[clipped_speech], tokens.scene_start[scene])
+        high = np.where(in_speech, tokens.speech_end[clipped_speech], tokens.scene_end[scene])
+        
+        valid = (windows >= low[:, None]) & (windows < high[:, None])
+        codes = tokens.form[np.clip(windows, 0, max(len(tokens) - 1, 0))]
+        return np.where(valid, codes, NO_CODE)
+    
+    def kwic(self, lemma: Optional[str] = None, pos: Optional[str] = None, form: Optional[str] = None,
+             width: int = 5, sort: Optional[str] = None, limit: Optional[int] = None) -> List[ConcordanceLine]:
+        """Return concordance lines for the matching keywords.
+        
+        sort=None keeps document order; 'left' sorts by the words preceding
+        the keyword (nearest first) and 'right' by the words following it.
+        """
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {SORT_KEYS}")
+        positions = self.positions(lemma=lemma, pos=pos, form=form)
+        if not len(positions):
+            return []
+        windows = self.windows(positions, width)
+        
+        if sort is not None:
+            ranks = self._rank[windows]
+            if sort == 'left':
+                columns = [ranks[:, width - i] for i in range(1, width + 1)]
+            else:
+                columns = [ranks[:, width + i] for i in range(1, width + 1)]
+            # lexsort treats the last key as primary: nearest context word first,
+            # then the keyword itself, then document order
+            order = np.lexsort([positions, ranks[:, width]] + columns[::-1])
+            positions, windows = positions[order], windows[order]
+        
+        if limit is not None:
+            positions, windows = positions[:limit], windows[:limit]
+        return self._lines(positions, windows, width)
+    
+    def _lines(self, positions: np.ndarray, windows: np.ndarray, width: int) -> List[ConcordanceLine]:
+        tokens = self.tokens
+        strings = tokens.strings
+        words = strings.as_array()[windows].tolist()
+        scenes = tokens.scene[positions].tolist()
+        lines = []
+        for position, row, scene in zip(positions.tolist(), words, scenes):
+            act_number, scene_number = tokens.scene_keys[scene]
+            lines.append(ConcordanceLine(
+                position=position,
+                act_number=act_number,
+                scene_number=scene_number,
+                ref=strings[tokens.line[position]],
+                speaker=strings[tokens.speaker[position]],
+                left=' '.join(word for word in row[:width] if word),
+                keyword=row[width],
+                right=' '.join(word for word in row[width + 1:] if word),
+            ))
+        return lines
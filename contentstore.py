@@ -0,0 +1,157 @@
+"""Scene content packed into one UTF-8 buffer.
+
+The parser gives each scene a list of {"type": ..., "text": ...} dicts, one
+str and one dict per item. ContentStore keeps the text of every item of a play
+in a single bytes buffer instead, with a type code per item and the byte
+offsets between items in typed arrays:
+
+    item i:  type   = kinds[codes[i]]
+             text   = text[offsets[i]:offsets[i + 1]].decode("utf-8")
+    scene s: items scene_bounds[s] .. scene_bounds[s + 1]
+
+pack_play() moves the content of a parsed Play into a store and gives each
+scene a ContentView, a read-only sequence of item dicts over its slice, so
+code indexing, slicing or iterating Scene.content is unchanged. Items are
+decoded as they are read.
+
+Pickled with protocol 5, the buffer goes through pickle's out-of-band buffer
+mechanism; snapshot.py writes it after the pickle and maps it back with mmap,
+so a play loaded from a snapshot reads its text straight from the page cache,
+shared by every process that maps the same file.
+"""
+
+import pickle
+from array import array
+from typing import Dict, Iterator, List, Sequence, Union
+
+# Type codes in the order they are first assigned; other types are appended
+ITEM_TYPES = ('speaker', 'line', 'stage')
+
+
+class ContentStore:
+    """The text and item types of every content item of a play."""
+
+    def __init__(self, text: Union[bytes, memoryview], kinds: List[str], codes: array,
+                 offsets: array, scene_bounds: array):
+        self.text = text                  # UTF-8 text of every item, back to back
+        self.kinds = kinds                # item type names, indexed by code
+        self.codes = codes                # array('B'): type code of each item
+        self.offsets = offsets            # array('I'): item i is text[offsets[i]:offsets[i + 1]]
+        self.scene_bounds = scene_bounds  # array('I'): scene s is items scene_bounds[s]:scene_bounds[s + 1]
+
+    @classmethod
+    def from_scenes(cls, scene_contents: Sequence[Sequence[Dict[str, str]]]) -> "ContentStore":
+        """Pack the content lists of several scenes, in order."""
+        kinds = list(ITEM_TYPES)
+        kind_codes = {kind: code for code, kind in enumerate(kinds)}
+        codes = array('B')
+        offsets = array('I', [0])
+        scene_bounds = array('I', [0])
+        parts = []
+        size = 0
+
+        for content in scene_contents:
+            for item in content:
+                code = kind_codes.get(item['type'])
+                if code is None:
+                    code = kind_codes[item['type']] = len(kinds)
+                    kinds.append(item['type'])
+                encoded = item['text'].encode('utf-8')
+                parts.append(encoded)
+                size += len(encoded)
+                codes.append(code)
+                offsets.append(size)
+            scene_bounds.append(len(codes))
+
+        return cls(b''.join(parts), kinds, codes, offsets, scene_bounds)
+
+    def __len__(self) -> int:
+        """Return the number of items."""
+        return len(self.codes)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the text buffer and arrays in bytes."""
+        arrays = (self.codes, self.offsets, self.scene_bounds)
+        return len(self.text) + sum(len(a) * a.itemsize for a in arrays)
+
+    def item(self, index: int) -> Dict[str, str]:
+        """Decode one item as a content dict."""
+        return {
+            "type": self.kinds[self.codes[index]],
+            "text": str(self.text[self.offsets[index]:self.offsets[index + 1]], 'utf-8'),
+        }
+
+    def scene(self, index: int) -> "ContentView":
+        """Return the content of the index-th packed scene."""
+        return ContentView(self, self.scene_bounds[index], self.scene_bounds[index + 1])
+
+    def __reduce_ex__(self, protocol):
+        # Protocol 5 lets the pickler write the text buffer out of band
+        text = pickle.PickleBuffer(self.text) if protocol >= 5 else bytes(self.text)
+        return (_restore_store, (text, self.kinds, self.codes, self.offsets, self.scene_bounds))
+
+
+def _restore_store(text, kinds, codes, offsets, scene_bounds) -> ContentStore:
+    if isinstance(text, pickle.PickleBuffer):
+        text = text.raw()
+    return ContentStore(text, kinds, codes, offsets, scene_bounds)
+
+
+class ContentView(Sequence):
+    """Read-only content items [start, end) of a ContentStore, as dicts."""
+    __slots__ = ('store', 'start', 'end')
+
+    def __init__(self, store: ContentStore, start: int, end: int):
+        self.store = store
+        self.start = start
+        self.end = end
+
+    def __len__(self) -> int:
+        return self.end - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return ContentView(self.store, self.start + start, self.start + max(start, stop))
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("content index out of range")
+        return self.store.item(self.start + index)
+
+    def __iter__(self) -> Iterator[Dict[str, str]]:
+        item = self.store.item
+        for index in range(self.start, self.end):
+            yield item(index)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ContentView) and other.store is self.store:
+            return (other.start, other.end) == (self.start, self.end)
+        if not isinstance(other, (ContentView, list, tuple)):
+            return NotImplemented
+        return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"ContentView({len(self)} items)"
+
+    def __getstate__(self):
+        return self.store, self.start, self.end
+
+    def __setstate__(self, state):
+        self.store, self.start, self.end = state
+
+
+def pack_play(play) -> ContentStore:
+    """Move the content of every parsed scene of a play into one ContentStore.
+
+    Scenes of a lazily parsed play that have not been loaded yet are left
+    alone. Returns the new store.
+    """
+    scenes = [scene for act in play.acts for scene in act.scenes if scene.is_loaded()]
+    store = ContentStore.from_scenes([scene.content for scene in scenes])
+    for index, scene in enumerate(scenes):
+        scene.content = store.scene(index)
+    return store
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""Load every TEI play in a directory, parsing files in parallel.
+
+    corpus = Corpus.load(Path("data"))
+    for result in corpus.results:
+        print(result.path.name, result.seconds, result.error)
+    play = corpus.get("king-lear_TEIsimple_FolgerShakespeare")
+
+Files are parsed in a ProcessPoolExecutor. With snapshots enabled (the
+default) each worker only makes sure a fresh snapshot of its file exists,
+parsing and writing one when needed, and the caller then maps every snapshot
+with snapshot.read_snapshot, so the text buffers of all plays are memory-mapped
+rather than copied back through a pipe. Without snapshots the Play objects are
+pickled back to the caller.
+"""
+
+import argparse
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from parser import TEI_NS, Play, TEIParser
+import snapshot
+
+# Bytes read from the start of a file to decide whether it is TEI
+_SNIFF_BYTES = 4096
+
+
+@dataclass
+class ParseResult:
+    """Outcome of loading one file of the corpus."""
+    path: Path
+    play: Optional[Play]
+    seconds: float
+    error: Optional[str] = None
+    
+    @property
+    def play_id(self) -> str:
+        return self.path.stem
+    
+    @property
+    def ok(self) -> bool:
+        return self.play is not None
+
+
+def find_tei_files(directory: Path, pattern: str = "*.xml") -> List[Path]:
+    """Return the TEI XML files in a directory, sorted by name."""
+    files = []
+    for path in sorted(Path(directory).glob(pattern)):
+        with open(path, "rb") as f:
+            head = f.read(_SNIFF_BYTES)
+        if b"<TEI" in head and TEI_NS['tei'].encode() in head:
+            files.append(path)
+    return files
+
+
+def load_file(path: Path, use_snapshots: bool = True) -> ParseResult:
+    """Load one play, capturing the time taken and any error."""
+    start = time.perf_counter()
+    try:
+        play = snapshot.load_play(path) if use_snapshots else TEIParser(path).parse()
+    except Exception:
+        return ParseResult(path=path, play=None, seconds=time.perf_counter() - start,
+                           error=traceback.format_exc(limit=3))
+    return ParseResult(path=path, play=play, seconds=time.perf_counter() - start)
+
+
+def prepare_snapshot(path: Path) -> Tuple[float, Optional[str]]:
+    """Write a fresh snapshot of one play unless there is one; return the time taken and any error."""
+    start = time.perf_counter()
+    try:
+        snapshot.load_play(path)
+    except Exception:
+        return time.perf_counter() - start, traceback.format_exc(limit=3)
+    return time.perf_counter() - start, None
+
+
+class Corpus:
+    """The plays of a directory, keyed by file stem."""
+    
+    def __init__(self, results: List[ParseResult], seconds: float = 0.0):
+        self.results = results
+        self.seconds = seconds
+        self.plays: Dict[str, Play] = {r.play_id: r.play for r in results if r.ok}
+        self.paths: Dict[str, Path] = {r.play_id: r.path for r in results if r.ok}
+    
+    @classmethod
+    def load(cls, directory: Path, pattern: str = "*.xml", max_workers: Optional[int] = None,
+             use_snapshots: bool = True) -> "Corpus":
+        """Find and load every TEI file in directory, in parallel."""
+        start = time.perf_counter()
+        files = find_tei_files(directory, pattern)
+        
+        workers = min(max_workers or os.cpu_count() or 1, len(files))
+        if workers <= 1:
+            # Not worth starting worker processes
+            results = [load_file(path, use_snapshots) for path in files]
+        elif not use_snapshots:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(load_file, files, [False] * len(files)))
+        else:
+            # Workers parse and snapshot; the plays are then mapped here, not pickled back
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                prepared = list(pool.map(prepare_snapshot, files))
+            results = []
+            for path, (seconds, error) in zip(files, prepared):
+                if error is not None:
+                    results.append(ParseResult(path=path, play=None, seconds=seconds, error=error))
+                    continue
+                result = load_file(path)
+                result.seconds += seconds
+                results.append(result)
+        
+        return cls(results, seconds=time.perf_counter() - start)
+    
+    def __len__(self) -> int:
+        return len(self.plays)
+    
+    def __iter__(self) -> Iterator[Play]:
+        return iter(self.plays.values())
+    
+    def get(self, play_id: str) -> Optional[Play]:
+        """Return a play by its file stem."""
+        return self.plays.get(play_id)
+    
+    @property
+    def failures(self) -> List[ParseResult]:
+        return [r for r in self.results if not r.ok]
+    
+    def report(self) -> str:
+        """Return a per-file summary of load times and failures."""
+        lines = []
+        for result in sorted(self.results, key=lambda r: r.seconds, reverse=True):
+            status = result.play.title if result.ok else "FAILED"
+            lines.append(f"{result.seconds:7.3f}s  {result.path.name}  {status}")
+            if result.error:
+                lines.append("          " + result.error.strip().splitlines()[-1])
+        lines.append(f"{len(self.plays)} plays loaded, {len(self.failures)} failed in {self.seconds:.2f}s")
+        return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Load a directory of TEI plays and report timings.")
+    arg_parser.add_argument("directory", type=Path, nargs="?", default=Path("data"))
+    arg_parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    arg_parser.add_argument("--no-snapshots", action="store_true", help="always parse the XML")
+    args = arg_parser.parse_args(argv)
+    
+    corpus = Corpus.load(args.directory, max_workers=args.workers, use_snapshots=not args.no_snapshots)
+    print(corpus.report())
+    return 1 if corpus.failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""Export a parsed play as static Markdown, HTML and JSON shards.
+
+Every scene and every act becomes three files, and a manifest records the
+SHA-256 of each:
+
+    <out>/<play id>/
+        index.html, index.json       outline linking every act and scene
+        act-1.md, act-1.html, act-1.json
+        act-1/scene-1.md, act-1/scene-1.html, act-1/scene-1.json
+        ...
+        manifest.json
+
+Markdown comes from Scene.get_formatted_content, the rules the app uses, and HTML
+is converted from that Markdown, so the export reads exactly like the app.
+Shards are produced and written scene by scene; an act's shards follow its
+last scene. On re-export a shard whose hash matches the previous manifest
+(and whose file is still there) is not rewritten, and shards that no longer
+exist are removed.
+
+    python export.py data/king-lear_TEIsimple_FolgerShakespeare.xml --out export/
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+from parser import PARSER_VERSION, Play
+
+# Bump when the layout or contents of exported shards change
+EXPORT_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+
+# Inline Markdown used by format_content: **bold** and *italic*
+_BOLD_RE = re.compile(r'\*\*(.+?)\*\*')
+_ITALIC_RE = re.compile(r'\*(.+?)\*')
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ max-width: 46rem; margin: 2rem auto; padding: 0 1rem; font-family: Georgia, serif; line-height: 1.5; }}
+h1, h2 {{ color: #8B0000; }}
+nav {{ font-size: 0.9em; }}
+</style>
+</head>
+<body>
+<nav>{nav}</nav>
+{body}
+</body>
+</html>
+"""
+
+
+def markdown_to_html(markdown: str) -> str:
+    """Convert the Markdown subset produced by render (headings, rules, bold, italic) to HTML."""
+    blocks = []
+    for block in markdown.split('\n\n'):
+        block = block.strip()
+        if not block:
+            continue
+        if block == '---':
+            blocks.append('<hr>')
+            continue
+        level = len(block) - len(block.lstrip('#'))
+        text = html.escape(block[level:].strip() if level else block, quote=False)
+        text = _ITALIC_RE.sub(r'<em>\1</em>', _BOLD_RE.sub(r'<strong>\1</strong>', text))
+        if level:
+            blocks.append(f'<h{level}>{text}</h{level}>')
+        else:
+            blocks.append(f'<p>{text}</p>')
+    return '\n'.join(blocks)
+
+
+def html_page(title: str, markdown: str, nav: str = '') -> str:
+    """Wrap converted Markdown in a standalone HTML page."""
+    return PAGE_TEMPLATE.format(title=html.escape(title), nav=nav, body=markdown_to_html(markdown))
+
+
+def _json_bytes(data) -> bytes:
+    return (json.dumps(data, ensure_ascii=False, indent=1) + '\n').encode('utf-8')
+
+
+def iter_shards(play: Play) -> Iterator[Tuple[str, bytes]]:
+    """Yield (relative path, contents) for every shard of a play, scene by scene."""
+    outline = []
+    for act in play.acts:
+        act_title = act.get_formatted_title()
+        act_blocks = []
+        act_scenes = []
+        for scene in act.scenes:
+            markdown = scene.get_formatted_content()
+            base = f"act-{act.number}/scene-{scene.number}"
+            nav = f'<a href="../index.html">{html.escape(play.title)}</a> · <a href="../act-{act.number}.html">{html.escape(act_title)}</a>'
+
+            yield f"{base}.md", f"# {scene.title}\n\n{markdown}\n".encode('utf-8')
+            yield f"{base}.html", html_page(scene.title, f"# {scene.title}\n\n{markdown}", nav).encode('utf-8')
+            yield f"{base}.json", _json_bytes({
+                "act": act.number,
+                "scene": scene.number,
+                "title": scene.title,
+                "content": list(scene.content),
+            })
+
+            # Same layout as the app's act view
+            act_blocks += [f"## {scene.title}", markdown, "---"]
+            act_scenes.append({"scene": scene.number, "title": scene.title, "content": list(scene.content)})
+
+        act_markdown = '\n\n'.join([f"# {act_title}"] + act_blocks)
+        nav = f'<a href="index.html">{html.escape(play.title)}</a>'
+        yield f"act-{act.number}.md", (act_markdown + '\n').encode('utf-8')
+        yield f"act-{act.number}.html", html_page(act_title, act_markdown, nav).encode('utf-8')
+        yield f"act-{act.number}.json", _json_bytes({"act": act.number, "title": act_title, "scenes": act_scenes})
+        outline.append({
+            "act": act.number,
+            "title": act_title,
+            "scenes": [{"scene": scene.number, "title": scene.title} for scene in act.scenes],
+        })
+
+    yield "index.json", _json_bytes({"title": play.title, "acts": outline})
+    links = []
+    for act in outline:
+        scenes = ' · '.join(f'<a href="act-{act["act"]}/scene-{scene["scene"]}.html">Scene {scene["scene"]}</a>'
+                            for scene in act["scenes"])
+        links.append(f'<h2><a href="act-{act["act"]}.html">{html.escape(act["title"])}</a></h2>\n<p>{scenes}</p>')
+    yield "index.html", PAGE_TEMPLATE.format(title=html.escape(play.title), nav='',
+                                             body=f"<h1>{html.escape(play.title)}</h1>\n" + '\n'.join(links)).encode('utf-8')
+
+
+@dataclass
+class ExportResult:
+    """What an export wrote, skipped and removed, by relative path."""
+    written: List[str] = field(default_factory=list)
+    skipped: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+def read_manifest(out_dir: Path) -> Dict[str, dict]:
+    """Return the shard entries of the manifest in out_dir, or {} if it is missing or stale."""
+    try:
+        manifest = json.loads((out_dir / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("format") != EXPORT_FORMAT:
+        return {}
+    return manifest.get("shards", {})
+
+
+def _write_atomic(path: Path, data: bytes):
+    """Write a file through a temporary file so readers never see half of it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+
+
+def export_play(play: Play, out_dir: Path, force: bool = False) -> ExportResult:
+    """Write the shards of a play into out_dir, skipping those that are unchanged."""
+    out_dir = Path(out_dir)
+    previous = {} if force else read_manifest(out_dir)
+    shards = {}
+    result = ExportResult()
+
+    for relative, data in iter_shards(play):
+        digest = hashlib.sha256(data).hexdigest()
+        shards[relative] = {"sha256": digest, "bytes": len(data)}
+        path = out_dir / relative
+        old = previous.get(relative)
+        if old == shards[relative] and path.is_file() and path.stat().st_size == len(data):
+            result.skipped.append(relative)
+            continue
+        _write_atomic(path, data)
+        result.written.append(relative)
+
+    for relative in previous.keys() - shards.keys():
+        try:
+            (out_dir / relative).unlink()
+            result.removed.append(relative)
+        except OSError:
+            pass
+
+    manifest = {
+        "format": EXPORT_FORMAT,
+        "parser_version": PARSER_VERSION,
+        "title": play.title,
+        "shards": shards,
+    }
+    _write_atomic(out_dir / MANIFEST_NAME, _json_bytes(manifest))
+    return result
+
+
+def main(argv=None) -> int:
+    from snapshot import load_play
+
+    arg_parser = argparse.ArgumentParser(description="Export TEI plays as static Markdown, HTML and JSON.")
+    arg_parser.add_argument("xml_files", nargs="+", type=Path, help="TEI XML files to export")
+    arg_parser.add_argument("--out", type=Path, default=Path("export"), help="output directory (default: export)")
+    arg_parser.add_argument("--force", action="store_true", help="rewrite every shard even if unchanged")
+    args = arg_parser.parse_args(argv)
+
+    for xml_path in args.xml_files:
+        start = time.perf_counter()
+        play = load_play(xml_path)
+        out_dir = args.out / xml_path.stem
+        result = export_play(play, out_dir, force=args.force)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {xml_path} → {out_dir}: {len(result.written)} written, {len(result.skipped)} unchanged, "
+              f"{len(result.removed)} removed ({elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
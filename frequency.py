@@ -0,0 +1,174 @@
+"""Word, lemma and n-gram frequencies for any scope of a play.
+
+Counts come straight from the integer-coded columns of the TokenStore: a
+scope (the whole play, an act, a scene, a speaker, or an act or scene of one
+speaker) is a boolean mask over the tokens, unigrams are one np.bincount over
+the masked codes, and n-grams are np.unique over the rows of a (grams x n)
+code matrix. An n-gram never crosses from one speech into the next, but does
+step over a stage direction in the middle of a speech.
+
+    >>> engine = FrequencyEngine(play.tokens)
+    >>> engine.counts("lemma", act_number="3").top(10)        # [("the", 199), ...]
+    >>> engine.counts("form", n=2, speaker="Edmund_Lr").top(5)  # [("in the", 10), ...]
+
+Only spoken words count; stage directions are left out. Word forms are
+case-folded, so "The" and "the" are one word. Each result is kept in a small
+LRU cache keyed on its unit, n and scope, so reports that are run again skip
+the computation entirely.
+"""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tokens import NO_CODE, TokenStore
+
+# Units that can be counted: lemmas or case-folded word forms
+UNITS = ('lemma', 'form')
+
+# Longest n-gram counted
+MAX_N = 5
+
+# Results kept per engine
+CACHE_SIZE = 128
+
+
+@dataclass
+class FrequencyTable:
+    """Distinct n-grams of a scope with their counts, most frequent first."""
+    grams: np.ndarray   # (distinct n-grams x n) codes into vocabulary
+    counts: np.ndarray  # occurrences of each row of grams
+    total: int          # n-grams in scope
+    vocabulary: List[str]
+
+    def __len__(self) -> int:
+        return len(self.counts)
+
+    def top(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Return (n-gram, count) pairs, most frequent first."""
+        vocabulary = self.vocabulary
+        return [
+            (' '.join(vocabulary[code] for code in row), count)
+            for row, count in zip(self.grams[:limit].tolist(), self.counts[:limit].tolist())
+        ]
+
+    def count(self, *words: str) -> int:
+        """Return how often an n-gram occurs in scope, or 0."""
+        codes = {text: code for code, text in enumerate(self.vocabulary)}
+        row = [codes.get(word, -1) for word in words]
+        if len(row) != self.grams.shape[1] or -1 in row:
+            return 0
+        match = np.flatnonzero((self.grams == row).all(axis=1))
+        return int(self.counts[match[0]]) if len(match) else 0
+
+
+class FrequencyEngine:
+    """Scoped unigram and n-gram counts over a TokenStore, memoized per scope."""
+
+    def __init__(self, tokens: TokenStore, max_entries: int = CACHE_SIZE):
+        self.tokens = tokens
+        self.max_entries = max_entries
+        strings = tokens.strings.strings
+
+        # Case-folded forms get their own vocabulary; lemmas use the string table
+        folded: Dict[str, int] = {}
+        fold = [folded.setdefault(text.lower(), len(folded)) for text in strings]
+        self._fold = np.array(fold + [NO_CODE], dtype=np.int32)
+        self._vocabulary = {'lemma': list(strings), 'form': list(folded)}
+
+        # Speech of every token, or -1 outside speeches; n-grams stay within one
+        speech = np.full(len(tokens), -1, dtype=np.int32)
+        for index, (start, end) in enumerate(zip(tokens.speech_start.tolist(), tokens.speech_end.tolist())):
+            speech[start:end] = index
+        self._speech = speech
+        self._spoken = tokens.speaker != NO_CODE
+
+        self._cache: "OrderedDict[tuple, FrequencyTable]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Return the number of cached results."""
+        return len(self._cache)
+
+    def codes(self, unit: str) -> np.ndarray:
+        """Return the code of every token for a unit, NO_CODE where it has none."""
+        if unit == 'lemma':
+            return self.tokens.lemma
+        if unit == 'form':
+            # NO_CODE indexes the trailing NO_CODE slot of _fold
+            return self._fold[self.tokens.form]
+        raise ValueError(f"unit must be one of {UNITS}")
+
+    def scope_mask(self, act_number: Optional[str] = None, scene_number: Optional[str] = None,
+                   speaker: Optional[str] = None) -> np.ndarray:
+        """Return a mask of the spoken tokens in an act, a scene and/or of a speaker."""
+        tokens = self.tokens
+        mask = self._spoken.copy()
+        if act_number is not None:
+            scenes = [i for i, (act, scene) in enumerate(tokens.scene_keys)
+                      if act == act_number and scene_number in (None, scene)]
+            mask &= np.isin(tokens.scene, scenes)
+        elif scene_number is not None:
+            raise ValueError("scene_number needs act_number")
+        if speaker is not None:
+            # Speeches shared by several speakers count for each of them
+            ref = '#' + speaker.lstrip('#')
+            who = [code for code in np.unique(tokens.speaker[self._spoken]).tolist()
+                   if ref in tokens.strings[code].split()]
+            mask &= np.isin(tokens.speaker, who)
+        return mask
+
+    def counts(self, unit: str = 'lemma', n: int = 1, act_number: Optional[str] = None,
+               scene_number: Optional[str] = None, speaker: Optional[str] = None) -> FrequencyTable:
+        """Return the n-gram counts of a unit in a scope; None scopes cover the whole play."""
+        if unit not in UNITS:
+            raise ValueError(f"unit must be one of {UNITS}")
+        if not 1 <= n <= MAX_N:
+            raise ValueError(f"n must be between 1 and {MAX_N}")
+        key = (unit, n, act_number, scene_number, speaker.lstrip('#') if speaker else None)
+        with self._lock:
+            table = self._cache.get(key)
+            if table is not None:
+                self._cache.move_to_end(key)
+                return table
+
+        # Computed outside the lock; two threads may both compute a new key
+        table = self._count(unit, n, self.scope_mask(act_number, scene_number, speaker))
+        with self._lock:
+            self._cache[key] = table
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return table
+
+    def _count(self, unit: str, n: int, mask: np.ndarray) -> FrequencyTable:
+        codes = self.codes(unit)
+        vocabulary = self._vocabulary[unit]
+
+        if n == 1:
+            counts = np.bincount(codes[mask & (codes != NO_CODE)], minlength=len(vocabulary))
+            grams = np.flatnonzero(counts)
+            counts = counts[grams]
+            grams = grams[:, None]
+        else:
+            # Windows of n consecutive in-scope words, stepping over stage
+            # directions inside a speech but never from one speech to the next
+            positions = np.flatnonzero(mask)
+            speech = self._speech[positions]
+            starts = np.arange(max(len(positions) - n + 1, 0))
+            # Speech numbers never decrease, so equal ends mean one speech
+            starts = starts[(speech[starts] >= 0) & (speech[starts + n - 1] == speech[starts])]
+            windows = codes[positions[starts[:, None] + np.arange(n)]]
+            windows = windows[(windows != NO_CODE).all(axis=1)]
+            if len(windows):
+                grams, counts = np.unique(windows, axis=0, return_counts=True)
+            else:
+                grams, counts = np.empty((0, n), dtype=codes.dtype), np.empty(0, dtype=np.int64)
+
+        # Most frequent first; ties keep code order
+        order = np.argsort(-counts, kind='stable')
+        return FrequencyTable(grams=grams[order], counts=counts[order],
+                              total=int(counts.sum()), vocabulary=vocabulary)
@@ -0,0 +1,160 @@
+"""Index of the xml:ids of a play, linking speeches and stage directions to the cast.
+
+The Folger files give an xml:id to every element the parser models:
+
+    <castItem xml:id="Kent_Lr">                  Character (Play.character)
+    <sp xml:id="sp-0001" who="#Kent_Lr">         Speech
+    <stage xml:id="stg-0000" who="#Kent_Lr ..."> StageDirection
+    <lb xml:id="ftln-0034">                      a Folger line (Play.locate)
+    <w xml:id="fs-lr-0000260">                   a token (TokenStore.index_of)
+
+IdIndexBuilder records each speech and stage direction as the scenes are
+parsed. IdIndex keeps them as small frozen records, with dicts from their
+xml:ids and from every character id in their who attributes, so resolving an
+id or finding every speech of a character is one dictionary lookup:
+
+    >>> play.ids.speeches_by("Gloucester_Lr")     # [Speech(id='sp-0003', ...), ...]
+    >>> play.resolve("#Kent_Lr"), play.resolve("stg-0033.1")
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Union
+
+
+def _refs(who: Optional[str]) -> Tuple[str, ...]:
+    """Split a who attribute ("#Kent_Lr #Gloucester_Lr") into character ids."""
+    return tuple(ref.lstrip('#') for ref in (who or '').split())
+
+
+@dataclass(frozen=True)
+class Speech:
+    """One <sp> of the play."""
+    id: Optional[str]
+    index: int          # position among the play's speeches, as in TokenStore.speech_start
+    act_number: str
+    scene_number: str
+    who: Tuple[str, ...]  # character ids, without "#"
+    ftln: int           # first Folger line of the speech, or 0 if it has none
+    offset: int         # index into scene.content of its first item, or -1
+
+
+@dataclass(frozen=True)
+class StageDirection:
+    """One <stage> of the play, at the top level of a scene or inside a speech."""
+    id: Optional[str]
+    index: int
+    act_number: str
+    scene_number: str
+    kind: Optional[str]   # @type: entrance, exit, business, sound, ...
+    who: Tuple[str, ...]
+    ftln: int             # Folger line it follows, or 0 at the top of a scene
+    offset: int           # index into scene.content, or -1 inside a speech
+    speech: Optional[int] = None  # index of the enclosing speech
+
+
+Record = Union[Speech, StageDirection]
+
+
+class IdIndex:
+    """The speeches and stage directions of a play, by xml:id and by character."""
+
+    def __init__(self, speeches: List[Speech], directions: List[StageDirection]):
+        self.speeches = speeches
+        self.directions = directions
+        self._by_id: Dict[str, Record] = {}
+        self._speeches_by: Dict[str, List[Speech]] = {}
+        self._directions_for: Dict[str, List[StageDirection]] = {}
+        for speech in speeches:
+            if speech.id:
+                self._by_id[speech.id] = speech
+            for ref in speech.who:
+                self._speeches_by.setdefault(ref, []).append(speech)
+        for direction in directions:
+            if direction.id:
+                self._by_id[direction.id] = direction
+            for ref in direction.who:
+                self._directions_for.setdefault(ref, []).append(direction)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __getstate__(self):
+        return {'speeches': self.speeches, 'directions': self.directions}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def get(self, xml_id: str) -> Optional[Record]:
+        """Return the speech or stage direction with an xml:id ("sp-0001" or "#sp-0001")."""
+        return self._by_id.get(xml_id.lstrip('#'))
+
+    def speeches_by(self, character_id: str) -> List[Speech]:
+        """Return every speech whose who names a character, in play order."""
+        return self._speeches_by.get(character_id.lstrip('#'), [])
+
+    def directions_for(self, character_id: str) -> List[StageDirection]:
+        """Return every stage direction whose who names a character, in play order."""
+        return self._directions_for.get(character_id.lstrip('#'), [])
+
+
+class IdIndexBuilder:
+    """Collects speeches and stage directions while scenes are parsed."""
+
+    def __init__(self):
+        self.speeches: List[Speech] = []
+        self.directions: List[StageDirection] = []
+        # Content offsets reported by the content extractor, by xml:id
+        self.offsets: Dict[str, int] = {}
+        self._scene: Tuple[str, str] = ('', '')
+        self._speech: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+    def begin_scene(self, act_number: str, scene_number: str):
+        self._scene = (act_number, scene_number)
+
+    def begin_speech(self, xml_id: Optional[str], who: Optional[str]):
+        self._speech = (xml_id, who)
+
+    def end_speech(self, first_ftln: int):
+        """Record the open speech, whose first line is first_ftln (0 if none)."""
+        xml_id, who = self._speech
+        self.speeches.append(Speech(
+            id=xml_id,
+            index=len(self.speeches),
+            act_number=self._scene[0],
+            scene_number=self._scene[1],
+            who=_refs(who),
+            ftln=first_ftln,
+            offset=-1,
+        ))
+        self._speech = None
+
+    def direction(self, xml_id: Optional[str], kind: Optional[str], who: Optional[str], ftln: int):
+        """Record a stage direction following line ftln."""
+        self.directions.append(StageDirection(
+            id=xml_id,
+            index=len(self.directions),
+            act_number=self._scene[0],
+            scene_number=self._scene[1],
+            kind=kind,
+            who=_refs(who),
+            ftln=ftln,
+            offset=-1,
+            speech=len(self.speeches) if self._speech is not None else None,
+        ))
+
+    def offset(self, xml_id: Optional[str], offset: int):
+        """Record the index into scene.content where an element's content starts."""
+        if xml_id:
+            self.offsets[xml_id] = offset
+
+    def build(self) -> IdIndex:
+        def with_offset(record):
+            offset = self.offsets.get(record.id, -1)
+            if offset < 0:
+                return record
+            return type(record)(**{**record.__dict__, 'offset': offset})
+
+        return IdIndex(
+            speeches=[with_offset(speech) for speech in self.speeches],
+            directions=[with_offset(direction) for direction in self.directions],
+        )
@@ -0,0 +1,112 @@
+"""Index from Folger line references to scene content offsets.
+
+Every verse <l> and prose <lb> in the Folger TEI files carries an FTLN id
+(xml:id="ftln-0034") and an act.scene.line reference (n="1.1.34"). LineIndex
+keeps the FTLN of each line that starts a content item in a sorted array, so
+any line can be mapped to its scene and content offset with one bisect.
+"""
+
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class LineHit:
+    """Where a line reference points: a scene and an offset into its content."""
+    act_number: str
+    scene_number: str
+    offset: int
+    ftln: int
+    ref: Optional[str]
+
+
+class LineIndex:
+    """Sorted FTLN array with the scene and content offset of each entry."""
+    
+    def __init__(self, ftlns: array, scenes: array, offsets: array,
+                 refs: Dict[str, int], scene_keys: List[Tuple[str, str]]):
+        self.ftlns = ftlns
+        self.scenes = scenes
+        self.offsets = offsets
+        self.refs = refs
+        self.scene_keys = scene_keys
+        self._ref_by_ftln = {ftln: ref for ref, ftln in refs.items()}
+    
+    def __len__(self) -> int:
+        return len(self.ftlns)
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_ref_by_ftln']
+        return state
+    
+    def __setstate__(self, state):
+        self.__init__(**state)
+    
+    def ftln_for(self, ref: str) -> Optional[int]:
+        """Return the FTLN of "act.scene.line" or "ftln-NNNN", or None."""
+        ref = ref.strip()
+        if ref.lower().startswith('ftln-'):
+            digits = ref[5:]
+            return int(digits) if digits.isdigit() else None
+        return self.refs.get(ref)
+    
+    def ref_for(self, ftln: int) -> Optional[str]:
+        """Return the act.scene.line reference of an FTLN, or None."""
+        return self._ref_by_ftln.get(ftln)
+    
+    def lookup(self, ref: str) -> Optional[LineHit]:
+        """Return the scene and content offset of the item containing a line."""
+        ftln = self.ftln_for(ref)
+        if ftln not in self._ref_by_ftln:
+            # Not a line of any parsed scene
+            return None
+        # Last entry starting at or before the line
+        position = bisect_right(self.ftlns, ftln) - 1
+        if position < 0:
+            return None
+        act_number, scene_number = self.scene_keys[self.scenes[position]]
+        return LineHit(
+            act_number=act_number,
+            scene_number=scene_number,
+            offset=self.offsets[position],
+            ftln=ftln,
+            ref=self._ref_by_ftln.get(ftln),
+        )
+
+
+class LineIndexBuilder:
+    """Collects line references while scenes are parsed."""
+    
+    def __init__(self):
+        self.ftlns = array('i')
+        self.scenes = array('i')
+        self.offsets = array('i')
+        self.refs = {}
+        self.scene_keys = []
+    
+    def begin_scene(self, act_number: str, scene_number: str):
+        self.scene_keys.append((act_number, scene_number))
+    
+    def add_ref(self, ref: str, ftln: int):
+        """Record the FTLN of an act.scene.line reference."""
+        self.refs.setdefault(ref, ftln)
+    
+    def add_line(self, ftln: int, offset: int):
+        """Record that line ftln starts in content item offset of the current scene."""
+        self.ftlns.append(ftln)
+        self.scenes.append(len(self.scene_keys) - 1)
+        self.offsets.append(offset)
+    
+    def build(self) -> LineIndex:
+        # FTLNs increase through the file; sort anyway in case a file is out of order
+        order = sorted(range(len(self.ftlns)), key=self.ftlns.__getitem__)
+        return LineIndex(
+            ftlns=array('i', (self.ftlns[i] for i in order)),
+            scenes=array('i', (self.scenes[i] for i in order)),
+            offsets=array('i', (self.offsets[i] for i in order)),
+            refs=self.refs,
+            scene_keys=list(self.scene_keys),
+        )
@@ -0,0 +1,213 @@
+"""The spoken text of a play one Folger line at a time.
+
+Scene.content keeps a prose <p> as one item, however many typeset lines it
+runs over. The Folger files mark each of those lines, and each verse line:
+
+    <p><lb xml:id="ftln-0001" n="1.1.1"/>I thought the King ... Duke
+       <lb xml:id="ftln-0002" n="1.1.2"/>of Albany than Cornwall.</p>
+    <l xml:id="ftln-0034" n="1.1.34">Attend the lords of France and Burgundy, Gloucester.</l>
+
+LineStore keeps one record per FTLN, in play order: the line's text in a
+single UTF-8 buffer, and its FTLN, act.scene.line number, scene, speech,
+speaker and verse/prose kind in typed arrays. Records are decoded only when
+they are read, and any range of lines is a slice:
+
+    >>> play.line_store[10:20]                        # [Line(ftln=11, ref='1.1.11', ...), ...]
+    >>> play.line_range("3.2.1", "3.2.9")             # by reference, inclusive
+    >>> play.line_store.scene_lines("1", "1")[:3]
+
+Like ContentStore, the text buffer is pickled out of band with protocol 5, so
+a snapshot maps it back without copying.
+"""
+
+import pickle
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+# Kind codes; a line of an <l> is verse, a line started by <lb> is prose
+LINE_KINDS = ('verse', 'prose')
+
+
+class Line(NamedTuple):
+    """One Folger line."""
+    ftln: int
+    ref: Optional[str]     # act.scene.line, e.g. "1.1.34"
+    act: str
+    scene: str
+    speaker: Optional[str]  # sp/@who, e.g. "#Kent_Lr"
+    kind: str               # "verse" or "prose"
+    text: str
+    speech: int             # index of the speech, as in play.ids.speeches, or -1
+
+
+class LineStore:
+    """Every Folger line of a play, in order, packed into arrays and one text buffer."""
+
+    def __init__(self, text: Union[bytes, memoryview], offsets: array, ftlns: array,
+                 numbers: array, scenes: array, speeches: array, speakers: array, kinds: array,
+                 speaker_names: List[Optional[str]], scene_keys: List[Tuple[str, str]],
+                 scene_bounds: array, odd_refs: Dict[int, str]):
+        self.text = text                  # UTF-8 text of every line, back to back
+        self.offsets = offsets            # array('I'): line i is text[offsets[i]:offsets[i + 1]]
+        self.ftlns = ftlns                # array('I'): FTLN of each line, ascending
+        self.numbers = numbers            # array('I'): last part of the line's act.scene.line
+        self.scenes = scenes              # array('H'): index into scene_keys
+        self.speeches = speeches          # array('i'): index of the line's speech
+        self.speakers = speakers          # array('h'): index into speaker_names, or -1
+        self.kinds = kinds                # array('B'): index into LINE_KINDS
+        self.speaker_names = speaker_names
+        self.scene_keys = scene_keys
+        self.scene_bounds = scene_bounds  # array('I'): scene s is lines scene_bounds[s]:scene_bounds[s + 1]
+        self.odd_refs = odd_refs          # refs not of the form "<act>.<scene>.<number>", by position
+        self._scene_index = {key: i for i, key in enumerate(scene_keys)}
+
+    def __len__(self) -> int:
+        return len(self.ftlns)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the text buffer and arrays in bytes."""
+        arrays = (self.offsets, self.ftlns, self.numbers, self.scenes, self.speeches,
+                  self.speakers, self.kinds, self.scene_bounds)
+        return len(self.text) + sum(len(a) * a.itemsize for a in arrays)
+
+    def line(self, position: int) -> Line:
+        """Decode the line at a position (not an FTLN)."""
+        act_number, scene_number = self.scene_keys[self.scenes[position]]
+        ref = self.odd_refs.get(position)
+        if ref is None and self.numbers[position]:
+            ref = f"{act_number}.{scene_number}.{self.numbers[position]}"
+        speaker = self.speakers[position]
+        return Line(
+            ftln=self.ftlns[position],
+            ref=ref,
+            act=act_number,
+            scene=scene_number,
+            speaker=self.speaker_names[speaker] if speaker >= 0 else None,
+            kind=LINE_KINDS[self.kinds[position]],
+            text=str(self.text[self.offsets[position]:self.offsets[position + 1]], 'utf-8'),
+            speech=self.speeches[position],
+        )
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.line(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("line index out of range")
+        return self.line(index)
+
+    def position(self, ftln: int) -> int:
+        """Return the position of the line with an FTLN, or -1."""
+        position = bisect_left(self.ftlns, ftln)
+        if position < len(self.ftlns) and self.ftlns[position] == ftln:
+            return position
+        return -1
+
+    def span(self, first_ftln: int, last_ftln: int) -> Tuple[int, int]:
+        """Return the [start, end) positions of the lines with FTLNs first..last inclusive."""
+        return bisect_left(self.ftlns, first_ftln), bisect_right(self.ftlns, last_ftln)
+
+    def scene_span(self, act_number: str, scene_number: str) -> Tuple[int, int]:
+        """Return the [start, end) positions of a scene's lines."""
+        index = self._scene_index.get((act_number, scene_number))
+        if index is None:
+            return (0, 0)
+        return self.scene_bounds[index], self.scene_bounds[index + 1]
+
+    def scene_lines(self, act_number: str, scene_number: str) -> List[Line]:
+        """Return every line of a scene."""
+        return self[slice(*self.scene_span(act_number, scene_number))]
+
+    def __reduce_ex__(self, protocol):
+        state = self.__dict__.copy()
+        del state['_scene_index']
+        # Protocol 5 lets the pickler write the text buffer out of band
+        state['text'] = pickle.PickleBuffer(self.text) if protocol >= 5 else bytes(self.text)
+        return (_restore_store, (state,))
+
+
+def _restore_store(state) -> LineStore:
+    if isinstance(state['text'], pickle.PickleBuffer):
+        state['text'] = state['text'].raw()
+    return LineStore(**state)
+
+
+class LineStoreBuilder:
+    """Collects Folger lines while scenes are parsed."""
+
+    def __init__(self):
+        self.parts: List[bytes] = []
+        self.offsets = array('I', [0])
+        self.ftlns = array('I')
+        self.numbers = array('I')
+        self.scenes = array('H')
+        self.speeches = array('i')
+        self.speakers = array('h')
+        self.kinds = array('B')
+        self.speaker_names: List[Optional[str]] = []
+        self.scene_keys: List[Tuple[str, str]] = []
+        self.scene_bounds = array('I', [0])
+        self.odd_refs: Dict[int, str] = {}
+        self._speaker_codes: Dict[str, int] = {}
+        self._speaker = -1
+        self._speech = -1
+        self._speech_count = 0
+        self._size = 0
+
+    def begin_scene(self, act_number: str, scene_number: str):
+        self.scene_keys.append((act_number, scene_number))
+
+    def end_scene(self):
+        self.scene_bounds.append(len(self.ftlns))
+
+    def begin_speech(self, who: Optional[str]):
+        code = self._speaker_codes.get(who, -1) if who else -1
+        if who and code < 0:
+            code = self._speaker_codes[who] = len(self.speaker_names)
+            self.speaker_names.append(who)
+        self._speaker = code
+        self._speech = self._speech_count
+
+    def end_speech(self):
+        self._speech_count += 1
+        self._speaker = -1
+        self._speech = -1
+
+    def add(self, ftln: int, ref: Optional[str], kind: str, text: str):
+        """Append a line of the current speech."""
+        act_number, scene_number = self.scene_keys[-1]
+        prefix, _, number = (ref or '').rpartition('.')
+        if prefix == f"{act_number}.{scene_number}" and number.isdigit():
+            self.numbers.append(int(number))
+        else:
+            self.numbers.append(0)
+            if ref:
+                self.odd_refs[len(self.ftlns)] = ref
+        encoded = text.encode('utf-8')
+        self.parts.append(encoded)
+        self._size += len(encoded)
+        self.offsets.append(self._size)
+        self.ftlns.append(ftln)
+        self.scenes.append(len(self.scene_keys) - 1)
+        self.speeches.append(self._speech)
+        self.speakers.append(self._speaker)
+        self.kinds.append(LINE_KINDS.index(kind))
+
+    def build(self) -> LineStore:
+        return LineStore(
+            text=b''.join(self.parts),
+            offsets=self.offsets,
+            ftlns=self.ftlns,
+            numbers=self.numbers,
+            scenes=self.scenes,
+            speeches=self.speeches,
+            speakers=self.speakers,
+            kinds=self.kinds,
+            speaker_names=self.speaker_names,
+            scene_keys=list(self.scene_keys),
+            scene_bounds=self.scene_bounds,
+            odd_refs=self.odd_refs,
+        )
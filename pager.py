@@ -0,0 +1,150 @@
+"""Fixed-size pages of a play's text for windowed reading.
+
+Rendering the whole play, or even a whole act, sends every line to the
+browser on each rerun. PlayPager lays the scenes of a play (or of one act)
+end to end and cuts them into pages of page_size content items, so a view
+only renders the page around the reader's position:
+
+    pager = PlayPager(play, act_number="3")
+    number = pager.page_for_line("3.2.15")
+    markdown = pager.render(number)
+
+Pages count content items, not verse or prose lines: a speaker label, a
+stage direction and a whole prose paragraph are one item each, so a page of
+80 items holds a varying number of Folger lines. The label of each page gives
+its first and last line reference.
+
+Page boundaries and line-range labels are computed up front; Markdown for a
+page is rendered on first use and cached.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from render import format_content
+
+if TYPE_CHECKING:
+    from parser import Play
+
+# Content items (speaker labels, verse lines, prose paragraphs, stage directions) per page
+PAGE_SIZE = 80
+
+
+@dataclass(frozen=True)
+class Page:
+    """A slice [start, end) of the content items in reading order."""
+    number: int
+    start: int
+    end: int
+    label: str
+
+
+class PlayPager:
+    """Splits a play, or one of its acts, into pages of content items."""
+    
+    def __init__(self, play: "Play", act_number: Optional[str] = None, page_size: int = PAGE_SIZE):
+        self.play = play
+        self.act_number = act_number
+        self.page_size = page_size
+        
+        # Scenes in reading order and the position of each one's first item
+        self._scenes: List[tuple] = []
+        self._scene_start: List[int] = []
+        self._scene_by_key: Dict[tuple, int] = {}
+        total = 0
+        for act in play.acts:
+            if act_number is not None and act.number != act_number:
+                continue
+            for scene in act.scenes:
+                self._scene_by_key[(act.number, scene.number)] = len(self._scenes)
+                self._scenes.append((act, scene))
+                self._scene_start.append(total)
+                total += len(scene.content)
+        self.total = total
+        
+        self._ref_positions, self._refs = self._line_refs()
+        self.pages = [
+            Page(number=i + 1, start=start, end=min(start + page_size, total),
+                 label=self._label(start, min(start + page_size, total)))
+            for i, start in enumerate(range(0, max(total, 1), page_size))
+        ]
+        self._markdown: Dict[int, str] = {}
+    
+    def _line_refs(self):
+        """Return sorted item positions that start a line, with their references."""
+        lines = self.play.lines
+        if lines is None:
+            return [], []
+        entries = []
+        for ftln, scene, offset in zip(lines.ftlns, lines.scenes, lines.offsets):
+            index = self._scene_by_key.get(tuple(lines.scene_keys[scene]))
+            ref = lines.ref_for(ftln)
+            if index is not None and ref is not None:
+                entries.append((self._scene_start[index] + offset, ftln, ref))
+        entries.sort()
+        return [position for position, _, _ in entries], [ref for _, _, ref in entries]
+    
+    def _label(self, start: int, end: int) -> str:
+        """Describe a page by its first and last line reference."""
+        first = bisect_left(self._ref_positions, start)
+        last = bisect_left(self._ref_positions, end) - 1
+        if first <= last:
+            if first == last:
+                return self._refs[first]
+            return f"{self._refs[first]} – {self._refs[last]}"
+        # No numbered lines on the page: fall back to the scene title
+        if not self._scenes:
+            return "Empty"
+        _, scene = self._scenes[bisect_right(self._scene_start, start) - 1]
+        return scene.title
+    
+    def __len__(self) -> int:
+        return len(self.pages)
+    
+    def page_for(self, act_number: str, scene_number: str, offset: int = 0) -> Optional[int]:
+        """Return the number of the page holding a scene's content item, or None."""
+        index = self._scene_by_key.get((act_number, scene_number))
+        if index is None:
+            return None
+        position = self._scene_start[index] + offset
+        return min(position // self.page_size, len(self.pages) - 1) + 1
+    
+    def page_for_line(self, ref: str) -> Optional[int]:
+        """Return the number of the page holding a line like 3.2.15 or ftln-1234, or None."""
+        location = self.play.locate(ref)
+        if location is None:
+            return None
+        return self.page_for(location.act.number, location.scene.number, location.offset)
+    
+    def render(self, number: int) -> str:
+        """Return the Markdown of one page, with headings for the scenes it touches."""
+        if number not in self._markdown:
+            page = self.pages[number - 1]
+            self._markdown[number] = self._render(page.start, page.end)
+        return self._markdown[number]
+    
+    def _render(self, start: int, end: int) -> str:
+        blocks = []
+        # First scene starting at the page start, else the scene running into it
+        index = bisect_left(self._scene_start, start)
+        if index == len(self._scenes) or self._scene_start[index] > start:
+            index -= 1
+        while index < len(self._scenes) and self._scene_start[index] < end:
+            act, scene = self._scenes[index]
+            scene_start = self._scene_start[index]
+            lo = max(start - scene_start, 0)
+            hi = min(end - scene_start, len(scene.content))
+            if lo == 0:
+                if self.act_number is None and scene is act.scenes[0]:
+                    blocks.append(f"# {act.get_formatted_title()}")
+                    blocks.append("---")
+                blocks.append(f"## {scene.title}")
+            else:
+                blocks.append(f"## {scene.title} (continued)")
+            blocks.append(format_content(scene.content[lo:hi]))
+            if self.act_number is not None and hi == len(scene.content):
+                # Divider between scenes, as in the full act view
+                blocks.append("---")
+            index += 1
+        return '\n\n'.join(blocks)
@@ -1,23 +1,89 @@
-from dataclasses import dataclass
-from typing import List, Dict, Optional
+from dataclasses import dataclass, field, replace
+from typing import List, Dict, Optional, Tuple, Union
 from pathlib import Path
-import xml.etree.ElementTree as ET
-from bs4 import BeautifulSoup
+import hashlib
+import mmap
+import re
+from idindex import IdIndex, IdIndexBuilder, Record, Speech
+from lineindex import LineIndex, LineIndexBuilder
+from linestore import Line, LineStore, LineStoreBuilder
+from render import format_content
+from stageindex import StageIndex, StageIndexBuilder
+from timing import timed
+from tokens import Token, TokenStore, TokenStoreBuilder
+from xmlbackend import TEI_NS, get_backend
 
-# TEI namespace
-TEI_NS = {'tei': 'http://www.tei-c.org/ns/1.0'}
+# Attribute name of xml:id once parsed
+XML_ID = '{http://www.w3.org/XML/1998/namespace}id'
+
+# Bump whenever a change alters the parsed Play, so stored snapshots are rebuilt
+PARSER_VERSION = 9
+
+# Byte-level patterns used to outline a file without building its element tree
+_DIV_TAG_RE = re.compile(rb'<(/?)div\b([^>]*?)(/?)>')
+_ATTR_RE = re.compile(rb'([\w:.-]+)\s*=\s*"([^"]*)"')
+_HEADER_RE = re.compile(rb'<teiHeader\b.*?</teiHeader>', re.DOTALL)
+_FRONT_RE = re.compile(rb'<front\b.*?</front>', re.DOTALL)
+_BODY_OPEN_RE = re.compile(rb'<body\b[^>]*>')
+
+# Namespaced tags, built once
+_TEI = '{' + TEI_NS['tei'] + '}'
+W_TAG = _TEI + 'w'
+C_TAG = _TEI + 'c'
+PC_TAG = _TEI + 'pc'
+LB_TAG = _TEI + 'lb'
+L_TAG = _TEI + 'l'
+P_TAG = _TEI + 'p'
+SP_TAG = _TEI + 'sp'
+SPEAKER_TAG = _TEI + 'speaker'
+STAGE_TAG = _TEI + 'stage'
+CAST_GROUP_TAG = _TEI + 'castGroup'
+CAST_ITEM_TAG = _TEI + 'castItem'
 
 @dataclass
 class Character:
     name: str
     description: Optional[str] = None
     group: Optional[str] = None
+    id: Optional[str] = None  # castItem xml:id, e.g. "Kent_Lr"; sp/@who refers to it as "#Kent_Lr"
+
+@dataclass(frozen=True)
+class SceneSource:
+    """Location of a scene div in its source file."""
+    file_path: Path
+    start: int  # byte offset of "<div"
+    end: int    # byte offset just past "</div>"
+
+class _LazyContent:
+    """Descriptor for Scene.content that parses the scene on first access."""
+    
+    def __set_name__(self, owner, name):
+        self.name = name
+    
+    def __get__(self, scene, owner=None):
+        if scene is None:
+            # Dataclass default when no content is given
+            return None
+        content = scene.__dict__.get(self.name)
+        if content is None and scene.source is not None:
+            content = TEIParser(scene.source.file_path).load_scene_content(scene.source)
+            scene.__dict__[self.name] = content
+        return content
+    
+    def __set__(self, scene, content):
+        scene.__dict__[self.name] = content
 
 @dataclass
 class Scene:
     number: str
     title: str
-    content: List[Dict[str, str]]  # [{"type": "speaker"|"line"|"stage", "text": "..."}]
+    # [{"type": "speaker"|"line"|"stage", "text": "..."}], or a ContentView once packed
+    content: List[Dict[str, str]] = _LazyContent()
+    source: Optional[SceneSource] = field(default=None, repr=False, compare=False)
+    
+    def is_loaded(self) -> bool:
+        """Check if the scene content has been parsed."""
+        return self.__dict__.get('content') is not None
     
     def get_formatted_title(self) -> str:
         """Return a formatted scene title."""
@@ -29,29 +95,19 @@ class Scene:
     
     def get_formatted_content(self) -> str:
         """Return markdown-formatted content for display."""
-        formatted_lines = []
-        
-        for item in self.content:
-            if item['type'] == 'speaker':
-                # Bold speakers
-                formatted_lines.append(f"**{item['text'].upper()}.**")
-            elif item['type'] == 'stage':
-                # Italicize stage directions
-                formatted_lines.append(f"*{item['text']}*")
-            elif item['type'] == 'line':
-                # Regular dialogue with preserved line breaks
-                formatted_lines.append(item['text'])
-            
-            # Add blank line after each element for spacing
-            formatted_lines.append("")
-        
-        return '\n'.join(formatted_lines).strip()
+        return format_content(self.content)
 
 @dataclass
 class Act:
     number: str
     title: str
     scenes: List[Scene]
+    _scene_index: Dict[str, Scene] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._scene_index = {}
+        for scene in self.scenes:
+            self._scene_index.setdefault(scene.number, scene)
     
     def get_formatted_title(self) -> str:
         """Return a formatted act title."""
@@ -63,16 +119,38 @@ class Act:
     
     def get_scene(self, scene_number: str) -> Scene:
         """Get a scene by its number."""
-        for scene in self.scenes:
-            if scene.number == scene_number:
-                return scene
-        return None
+        return self._scene_index.get(scene_number)
+
+@dataclass
+class Location:
+    """A line reference resolved to its scene and content offset."""
+    act: Act
+    scene: Scene
+    offset: int  # index into scene.content of the item containing the line
+    ftln: int
+    ref: Optional[str]  # act.scene.line, e.g. "3.2.15"
 
 @dataclass
 class Play:
     title: str
     acts: List[Act]
     characters: List[Character]
+    tokens: Optional[TokenStore] = field(default=None, repr=False, compare=False)
+    lines: Optional[LineIndex] = field(default=None, repr=False, compare=False)
+    stage: Optional[StageIndex] = field(default=None, repr=False, compare=False)
+    ids: Optional[IdIndex] = field(default=None, repr=False, compare=False)
+    line_store: Optional[LineStore] = field(default=None, repr=False, compare=False)
+    _act_index: Dict[str, Act] = field(default=None, init=False, repr=False, compare=False)
+    _character_index: Dict[str, Character] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._act_index = {}
+        for act in self.acts:
+            self._act_index.setdefault(act.number, act)
+        self._character_index = {}
+        for character in self.characters:
+            if character.id:
+                self._character_index.setdefault(character.id, character)
     
     def get_act_count(self) -> int:
         """Return the number of acts in the play."""
@@ -80,26 +158,139 @@ class Play:
     
     def get_act(self, act_number: str) -> Act:
         """Get an act by its number."""
-        for act in self.acts:
-            if act.number == act_number:
-                return act
+        return self._act_index.get(act_number)
+    
+    def locate(self, ref: str) -> Optional[Location]:
+        """Resolve "act.scene.line" (e.g. "3.2.15") or "ftln-1234" to a Location."""
+        if self.lines is None:
+            return None
+        hit = self.lines.lookup(ref)
+        if hit is None:
+            return None
+        act = self.get_act(hit.act_number)
+        scene = act.get_scene(hit.scene_number) if act else None
+        if scene is None:
+            return None
+        return Location(act=act, scene=scene, offset=hit.offset, ftln=hit.ftln, ref=hit.ref)
+    
+    def line(self, ref: str) -> Optional[Line]:
+        """Return the Folger line "act.scene.line" or "ftln-1234", or None."""
+        if self.lines is None or self.line_store is None:
+            return None
+        ftln = self.lines.ftln_for(ref)
+        position = self.line_store.position(ftln) if ftln is not None else -1
+        return self.line_store[position] if position >= 0 else None
+    
+    def line_range(self, first: str, last: str) -> List[Line]:
+        """Return the Folger lines from first to last inclusive, as references or "ftln-" ids."""
+        if self.lines is None or self.line_store is None:
+            return []
+        first_ftln, last_ftln = self.lines.ftln_for(first), self.lines.ftln_for(last)
+        if first_ftln is None or last_ftln is None:
+            return []
+        return self.line_store[slice(*self.line_store.span(first_ftln, last_ftln))]
+    
+    def on_stage(self, ref: str) -> Optional[List[str]]:
+        """Return the ids of the characters on stage at "act.scene.line" or "ftln-1234"."""
+        if self.lines is None or self.stage is None:
+            return None
+        ftln = self.lines.ftln_for(ref)
+        if ftln is None or self.lines.ref_for(ftln) is None:
+            return None
+        return self.stage.at(ftln)
+    
+    def character(self, ref: str) -> Optional[Character]:
+        """Get a character by castItem id ("Kent_Lr") or who reference ("#Kent_Lr")."""
+        return self._character_index.get(ref.lstrip('#'))
+    
+    def speakers(self, record: Record) -> List[Character]:
+        """Return the characters a speech or stage direction names in its who attribute."""
+        characters = []
+        for ref in record.who:
+            character = self._character_index.get(ref)
+            if character is not None:
+                characters.append(character)
+        return characters
+    
+    def speeches_by(self, character: Union[Character, str]) -> List[Speech]:
+        """Return every speech of a character (a Character, "Kent_Lr" or "#Kent_Lr"), in order."""
+        if isinstance(character, Character):
+            character = character.id or ''
+        if self.ids is None:
+            return []
+        return self.ids.speeches_by(character)
+    
+    def resolve(self, xml_id: str) -> Union[Character, Record, Location, Token, None]:
+        """Return the object an xml:id refers to, with or without a leading "#".
+        
+        castItem ids give a Character, sp and stage ids a Speech or
+        StageDirection, "ftln-" ids a Location and word ids a Token.
+        """
+        xml_id = xml_id.lstrip('#')
+        character = self._character_index.get(xml_id)
+        if character is not None:
+            return character
+        if self.ids is not None:
+            record = self.ids.get(xml_id)
+            if record is not None:
+                return record
+        if xml_id.startswith('ftln-'):
+            return self.locate(xml_id)
+        if self.tokens is not None:
+            index = self.tokens.index_of(xml_id)
+            if index >= 0:
+                return self.tokens.token(index)
         return None
     
     def get_total_scenes(self) -> int:
         """Return the total number of scenes in the play."""
         return sum(act.get_scene_count() for act in self.acts)
 
+@dataclass
+class ParsedAct:
+    """An act parsed from the bytes of its div, with the index builder calls made meanwhile."""
+    act: Act
+    # (builder attribute, method, args, kwargs), replayed when the act is reused
+    index_calls: List[Tuple[str, str, tuple, dict]] = field(repr=False)
+
+class _RecordingBuilder:
+    """Forwards method calls to an index builder and records them for replay."""
+    
+    def __init__(self, builder, attribute: str, calls: list):
+        self._builder = builder
+        self._attribute = attribute
+        self._calls = calls
+    
+    def __getattr__(self, name):
+        method = getattr(self._builder, name)
+        attribute, calls = self._attribute, self._calls
+        
+        def record(*args, **kwargs):
+            calls.append((attribute, name, args, kwargs))
+            return method(*args, **kwargs)
+        # Later calls find the wrapper without going through __getattr__
+        setattr(self, name, record)
+        return record
+
 class TEIParser:
-    def __init__(self, file_path: Path):
+    def __init__(self, file_path: Path, backend: Optional[str] = None):
         self.file_path = file_path
+        # etree unless named here or in CORDELIA_XML_BACKEND; both backends produce the same Play
+        self.backend = get_backend(backend)
         self.tree = None
         self.root = None
+        self._token_builder = None
+        self._line_builder = None
+        self._stage_builder = None
+        self._id_builder = None
+        self._line_store_builder = None
     
     def parse(self) -> Play:
         """Parse the TEI XML file and return a Play object."""
         # Parse the XML file
-        self.tree = ET.parse(self.file_path)
+        self.tree = self.backend.parse(self.file_path)
         self.root = self.tree.getroot()
+        self._begin_indexes()
         
         # Get play title
         title = self._get_play_title()
@@ -110,27 +301,282 @@ class TEIParser:
         # Get characters
         characters = self._get_characters()
         
+        return Play(title=title, acts=acts, characters=characters, **self._end_indexes())
+    
+    def _begin_indexes(self):
+        """Start collecting the parse-time indexes attached to the Play."""
+        self._token_builder = TokenStoreBuilder()
+        self._line_builder = LineIndexBuilder()
+        self._stage_builder = StageIndexBuilder()
+        self._id_builder = IdIndexBuilder()
+        self._line_store_builder = LineStoreBuilder()
+    
+    def _end_indexes(self) -> Dict[str, object]:
+        """Build the collected indexes, keyed by their Play field names."""
+        indexes = {
+            'tokens': self._token_builder.build(),
+            'lines': self._line_builder.build(),
+            'stage': self._stage_builder.build(),
+            'ids': self._id_builder.build(),
+            'line_store': self._line_store_builder.build(),
+        }
+        self._token_builder = None
+        self._line_builder = None
+        self._stage_builder = None
+        self._id_builder = None
+        self._line_store_builder = None
+        return indexes
+    
+    def parse_streaming(self) -> Play:
+        """Parse the TEI XML file incrementally and return a Play object.
+        
+        Unlike parse(), the full element tree is never held in memory: each
+        scene is built as soon as its div closes and the subtree is then
+        dropped, so the XML held at once is bounded by the largest scene.
+        The Play it returns, its content store and its indexes still grow with
+        the play: bench_streaming_parse.py measures about 16 MB traced (80 MB
+        RSS) for King Lear and 63 MB (194 MB) at four times its size, against
+        38 MB (139 MB) and 151 MB (446 MB) for parse().
+        """
+        tei = TEI_NS['tei']
+        div_tag = f"{{{tei}}}div"
+        title_path = (f"{{{tei}}}teiHeader", f"{{{tei}}}fileDesc", f"{{{tei}}}titleStmt")
+        
+        title = None
+        characters = None
+        acts = []
+        act_div = None
+        act_scenes = []
+        
+        # Open elements from the root down to the current one
+        stack = []
+        # Number of open elements whose subtree is still needed (scene, castList)
+        keep = 0
+        self._begin_indexes()
+        
+        for event, elem in self.backend.iterparse(self.file_path, ('start', 'end')):
+            if event == 'start':
+                stack.append(elem)
+                if elem.tag == div_tag:
+                    parent = stack[-2] if len(stack) > 1 else None
+                    if elem.get('type') == 'act' and parent is not None and parent.tag == f"{{{tei}}}body":
+                        act_div = elem
+                        act_scenes = []
+                    elif elem.get('type') == 'scene' and act_div is not None and parent is act_div:
+                        keep += 1
+                elif elem.tag == f"{{{tei}}}castList" and characters is None:
+                    keep += 1
+                continue
+            
+            stack.pop()
+            parent = stack[-1] if stack else None
+            tag = elem.tag
+            
+            if tag == div_tag and elem.get('type') == 'scene' and parent is act_div and act_div is not None:
+                act_scenes.append(self._build_scene(elem, act_div.get('n', '')))
+                keep -= 1
+            elif elem is act_div:
+                act_number = elem.get('n', '')
+                acts.append(Act(
+                    number=act_number,
+                    title=f"Act {act_number}",
+                    scenes=act_scenes
+                ))
+                act_div = None
+            elif tag == f"{{{tei}}}castList" and characters is None:
+                if parent is not None and parent.tag == f"{{{tei}}}front":
+                    characters = self._parse_cast_list(elem)
+                keep -= 1
+            elif tag == f"{{{tei}}}title" and title is None:
+                if tuple(e.tag for e in stack[-3:]) == title_path and elem.text:
+                    title = elem.text.strip()
+            
+            # Drop finished subtrees unless an enclosing scene still needs them
+            if keep == 0 and parent is not None:
+                parent.remove(elem)
+        
+        return Play(
+            title=title or "Unknown Play",
+            acts=acts,
+            characters=characters or [],
+            **self._end_indexes()
+        )
+    
+    def parse_lazy(self) -> Play:
+        """Parse only the outline of the TEI file and return a skeleton Play.
+        
+        Act and scene divs are located by scanning the raw bytes, so no element
+        tree is built for the body. Each Scene records the byte range of its div
+        and parses its content on first access to Scene.content.
+        """
+        with open(self.file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            # Header and front matter are small; parse them as one fragment
+            fragments = [m.group(0) for m in (_HEADER_RE.search(data), _FRONT_RE.search(data)) if m]
+            self.root = self._parse_fragment(b''.join(fragments))
+            
+            title = self._get_play_title()
+            characters = self._get_characters()
+            
+            acts = []
+            body = _BODY_OPEN_RE.search(data)
+            if body:
+                acts = self._outline_acts(data, body.end(), data.rfind(b'</body>'))
+        
         return Play(title=title, acts=acts, characters=characters)
     
+    def _outline_acts(self, data, start: int, end: int) -> List[Act]:
+        """Build skeleton acts from the div tags found in data[start:end]."""
+        acts = []
+        # Open divs as (attributes, byte offset, scenes closed inside it)
+        stack = []
+        
+        for match in _DIV_TAG_RE.finditer(data, start, end):
+            closing, attr_text, self_closing = match.groups()
+            if not closing:
+                attrs = {k.decode(): v.decode() for k, v in _ATTR_RE.findall(attr_text)}
+                stack.append((attrs, match.start(), []))
+                if not self_closing:
+                    continue
+            attrs, div_start, scenes = stack.pop()
+            
+            if not stack and attrs.get('type') == 'act':
+                act_number = attrs.get('n', '')
+                acts.append(Act(
+                    number=act_number,
+                    title=f"Act {act_number}",
+                    scenes=scenes
+                ))
+            elif len(stack) == 1 and attrs.get('type') == 'scene' and stack[0][0].get('type') == 'act':
+                act_number = stack[0][0].get('n', '')
+                scene_number = attrs.get('n', '')
+                stack[0][2].append(Scene(
+                    number=scene_number,
+                    title=f"Act {act_number}, Scene {scene_number}",
+                    source=SceneSource(self.file_path, div_start, match.end())
+                ))
+        
+        return acts
+    
+    def parse_incremental(self, previous: Optional[Dict[str, ParsedAct]] = None
+                          ) -> Tuple[Play, Dict[str, ParsedAct]]:
+        """Parse the TEI file, reusing the acts whose div bytes are unchanged.
+        
+        previous maps the SHA-256 of an act div's bytes to the act parsed from
+        it, as returned by an earlier call. Changed acts are parsed from their
+        own bytes with _get_scenes; unchanged ones are reused and their index
+        builder calls replayed, so their XML is not parsed at all. A reused act
+        and its scenes are shallow copies sharing the earlier content, so
+        packing the new Play never changes one that readers still hold.
+        Returns the Play and the mapping to pass to the next call.
+        """
+        previous = previous or {}
+        parsed = {}
+        acts = []
+        
+        with open(self.file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            fragments = [m.group(0) for m in (_HEADER_RE.search(data), _FRONT_RE.search(data)) if m]
+            self.root = self._parse_fragment(b''.join(fragments))
+            title = self._get_play_title()
+            characters = self._get_characters()
+            
+            body = _BODY_OPEN_RE.search(data)
+            body_end = data.rfind(b'</body>')
+            if body is None or body_end < body.end():
+                # Most likely a file caught halfway through being saved
+                raise ValueError(f"{self.file_path}: no complete <body> element")
+            self._begin_indexes()
+            act_ranges = self._act_ranges(data, body.end(), body_end)
+            for act_number, start, end in act_ranges:
+                act_bytes = data[start:end]
+                digest = hashlib.sha256(act_bytes).hexdigest()
+                entry = previous.get(digest)
+                if entry is None:
+                    entry = self._parse_act(act_bytes, act_number)
+                else:
+                    for attribute, name, args, kwargs in entry.index_calls:
+                        getattr(getattr(self, attribute), name)(*args, **kwargs)
+                    entry = replace(entry, act=replace(
+                        entry.act, scenes=[replace(scene) for scene in entry.act.scenes]))
+                parsed[digest] = entry
+                acts.append(entry.act)
+        
+        return Play(title=title, acts=acts, characters=characters, **self._end_indexes()), parsed
+    
+    def _act_ranges(self, data, start: int, end: int) -> List[Tuple[str, int, int]]:
+        """Return (act number, start, end) byte ranges of the act divs in data[start:end]."""
+        ranges = []
+        depth = 0
+        top = None
+        
+        for match in _DIV_TAG_RE.finditer(data, start, end):
+            closing, attr_text, self_closing = match.groups()
+            if not closing:
+                if depth == 0:
+                    top = ({k.decode(): v.decode() for k, v in _ATTR_RE.findall(attr_text)}, match.start())
+                if not self_closing:
+                    depth += 1
+                    continue
+            else:
+                depth -= 1
+            if depth == 0 and top is not None:
+                attrs, div_start = top
+                if attrs.get('type') == 'act':
+                    ranges.append((attrs.get('n', ''), div_start, match.end()))
+                top = None
+        
+        return ranges
+    
+    def _parse_act(self, act_bytes: bytes, act_number: str) -> ParsedAct:
+        """Parse one act div, recording the index builder calls its scenes make."""
+        calls = []
+        attributes = ('_token_builder', '_line_builder', '_stage_builder', '_id_builder',
+                      '_line_store_builder')
+        builders = [getattr(self, attribute) for attribute in attributes]
+        for attribute, builder in zip(attributes, builders):
+            setattr(self, attribute, _RecordingBuilder(builder, attribute, calls))
+        try:
+            act_div = self._parse_fragment(act_bytes)[0]
+            scenes = self._get_scenes(act_div, act_number)
+        finally:
+            for attribute, builder in zip(attributes, builders):
+                setattr(self, attribute, builder)
+        
+        return ParsedAct(
+            act=Act(number=act_number, title=f"Act {act_number}", scenes=scenes),
+            index_calls=calls
+        )
+    
+    def load_scene_content(self, source: SceneSource) -> List[Dict[str, str]]:
+        """Parse the content of a single scene from its byte range."""
+        with open(source.file_path, 'rb') as f:
+            f.seek(source.start)
+            scene_div = self._parse_fragment(f.read(source.end - source.start))[0]
+        return self._extract_scene_content(scene_div)
+    
+    def _parse_fragment(self, data: bytes):
+        """Parse a piece of a TEI file inside a TEI-namespaced wrapper element."""
+        return self.backend.fromstring(b'<TEI xmlns="' + TEI_NS['tei'].encode() + b'">' + data + b'</TEI>')
+    
     def _get_play_title(self) -> str:
         """Extract the play title from the TEI header."""
         # Look for title in teiHeader/fileDesc/titleStmt/title
-        title_elem = self.root.find('.//tei:teiHeader/tei:fileDesc/tei:titleStmt/tei:title', TEI_NS)
+        title_elem = self.backend.find(self.root, 'title')
         if title_elem is not None and title_elem.text:
             return title_elem.text.strip()
         return "Unknown Play"
     
+    @timed("parser._get_acts")
     def _get_acts(self) -> List[Act]:
         """Extract all acts from the play with their scenes."""
         acts = []
         
         # Find all act divs in the body
-        body = self.root.find('.//tei:body', TEI_NS)
+        body = self.backend.find(self.root, 'body')
         if body is None:
             return acts
         
         # Get only direct children act divs, not nested ones
-        act_divs = body.findall('./tei:div[@type="act"]', TEI_NS)
+        act_divs = self.backend.findall(body, 'acts')
         
         for act_div in act_divs:
             act_number = act_div.get('n', '')
@@ -147,175 +593,343 @@ class TEIParser:
         
         return acts
     
+    @timed("parser._get_scenes")
     def _get_scenes(self, act_div, act_number: str) -> List[Scene]:
         """Extract all scenes from an act."""
         scenes = []
         
         # Find all scene divs within this act
-        scene_divs = act_div.findall('./tei:div[@type="scene"]', TEI_NS)
+        scene_divs = self.backend.findall(act_div, 'scenes')
         
         for scene_div in scene_divs:
-            scene_number = scene_div.get('n', '')
-            scene_title = f"Act {act_number}, Scene {scene_number}"
-            
-            # Extract scene content
-            content = self._extract_scene_content(scene_div)
-            
-            scenes.append(Scene(
-                number=scene_number,
-                title=scene_title,
-                content=content
-            ))
+            scenes.append(self._build_scene(scene_div, act_number))
         
         return scenes
     
+    def _build_scene(self, scene_div, act_number: str) -> Scene:
+        """Build a Scene from its scene div."""
+        scene_number = scene_div.get('n', '')
+        scene_title = f"Act {act_number}, Scene {scene_number}"
+        
+        if self._token_builder is not None:
+            self._index_scene(scene_div, act_number, scene_number)
+        
+        # Extract scene content
+        content = self._extract_scene_content(scene_div)
+        
+        return Scene(
+            number=scene_number,
+            title=scene_title,
+            content=content
+        )
+    
+    @timed("parser._extract_scene_content")
     def _extract_scene_content(self, scene_div) -> List[Dict[str, str]]:
         """Extract all content from a scene (speakers, lines, stage directions)."""
         content = []
+        ids = self._id_builder
         
         # Process all children elements in order
         for elem in scene_div:
-            if elem.tag == f"{{{TEI_NS['tei']}}}stage":
+            if elem.tag == STAGE_TAG:
                 # Stage direction
                 stage_text = self._get_element_text(elem)
                 if stage_text:
+                    if ids is not None:
+                        ids.offset(elem.get(XML_ID), len(content))
                     content.append({"type": "stage", "text": stage_text})
                     
-            elif elem.tag == f"{{{TEI_NS['tei']}}}sp":
+            elif elem.tag == SP_TAG:
+                if ids is not None:
+                    ids.offset(elem.get(XML_ID), len(content))
                 # Speech - contains speaker and paragraphs
-                speaker_elem = elem.find('./tei:speaker', TEI_NS)
+                speaker_elem = self.backend.find(elem, 'speaker')
                 if speaker_elem is not None:
                     speaker_text = self._get_element_text(speaker_elem)
                     if speaker_text:
                         content.append({"type": "speaker", "text": speaker_text})
                 
                 # Get all paragraphs in this speech (prose)
-                for p in elem.findall('./tei:p', TEI_NS):
+                for p in self.backend.findall(elem, 'prose'):
                     p_text = self._get_element_text(p)
                     if p_text:
                         content.append({"type": "line", "text": p_text})
+                        self._index_item_lines(p, len(content) - 1)
                 
                 # Get all lines in this speech (verse)
-                for l in elem.findall('./tei:l', TEI_NS):
+                for l in self.backend.findall(elem, 'verse'):
                     l_text = self._get_element_text(l)
                     if l_text:
                         content.append({"type": "line", "text": l_text})
+                        self._index_item_lines(l, len(content) - 1)
         
         return content
     
-    def _get_element_text(self, elem) -> str:
-        """Get all text content from an element, including nested elements."""
-        text_parts = []
-        
-        # Get text directly in this element
-        if elem.text:
-            # Clean whitespace and newlines from element text
-            cleaned_text = ' '.join(elem.text.split())
-            if cleaned_text:
-                text_parts.append(cleaned_text)
+    def _index_scene(self, scene_div, act_number: str, scene_number: str):
+        """Record the tokens and line references of a scene in the parse-time indexes."""
+        line_tags = (L_TAG, LB_TAG)
+        builder = self._token_builder
+        builder.begin_scene(act_number, scene_number)
+        lines = self._line_builder
+        lines.begin_scene(act_number, scene_number)
+        stage = self._stage_builder
+        stage.begin_scene(act_number, scene_number)
+        ids = self._id_builder
+        ids.begin_scene(act_number, scene_number)
+        text_lines = self._line_store_builder
+        text_lines.begin_scene(act_number, scene_number)
+        ftln = 0
         
-        # Get text from all child elements
-        for child in elem:
-            # For word elements, get their text
-            if child.tag == f"{{{TEI_NS['tei']}}}w":
-                if child.text:
-                    # Clean the word text
-                    word = child.text.strip()
-                    if word:
-                        text_parts.append(word)
-            # For character elements (spaces), add a space
-            elif child.tag == f"{{{TEI_NS['tei']}}}c":
-                text_parts.append(" ")
-            # For punctuation elements
-            elif child.tag == f"{{{TEI_NS['tei']}}}pc":
-                if child.text:
-                    punct = child.text.strip()
-                    if punct:
-                        text_parts.append(punct)
-            # Recursively get text from other elements
-            else:
-                child_text = self._get_element_text(child)
-                if child_text:
-                    text_parts.append(child_text)
-            
-            # Get any tail text after this child, cleaning whitespace
-            if child.tail:
-                cleaned_tail = ' '.join(child.tail.split())
-                if cleaned_tail:
-                    text_parts.append(cleaned_tail)
+        for elem in scene_div:
+            if elem.tag == STAGE_TAG:
+                stage.direction(elem.get('type'), elem.get('who'), ftln)
+                ids.direction(elem.get(XML_ID), elem.get('type'), elem.get('who'), ftln)
+                for w in elem.iter(W_TAG):
+                    builder.add((w.text or '').strip(), w.get('lemma'), w.get('ana'),
+                                w.get('n'), ftln, w.get(XML_ID), spoken=False)
+                    
+            elif elem.tag == SP_TAG:
+                # One str for every index, so both backends pickle the same
+                who = elem.get('who')
+                builder.begin_speech(who)
+                stage.speak(who, ftln)
+                ids.begin_speech(elem.get(XML_ID), who)
+                text_lines.begin_speech(who)
+                first_ftln = 0
+                # Words of stage directions inside the speech are not spoken
+                unspoken = {w for stage in elem.iter(STAGE_TAG) for w in stage.iter(W_TAG)}
+                
+                for part in elem:
+                    if part.tag == SPEAKER_TAG:
+                        continue
+                    for line, text in _element_lines(part):
+                        kind = 'verse' if line.tag == L_TAG else 'prose'
+                        text_lines.add(_ftln_number(line.get(XML_ID)), line.get('n'), kind, text)
+                    for child in part.iter():
+                        if child.tag == W_TAG:
+                            builder.add((child.text or '').strip(), child.get('lemma'), child.get('ana'),
+                                        child.get('n'), ftln, child.get(XML_ID),
+                                        spoken=child not in unspoken)
+                        elif child.tag in line_tags:
+                            ftln = _ftln_number(child.get(XML_ID)) or ftln
+                            first_ftln = first_ftln or ftln
+                            stage.line(ftln)
+                            if child.get('n'):
+                                lines.add_ref(child.get('n'), ftln)
+                        elif child.tag == STAGE_TAG:
+                            # Entrances and exits in the middle of a speech
+                            stage.direction(child.get('type'), child.get('who'), ftln)
+                            ids.direction(child.get(XML_ID), child.get('type'), child.get('who'), ftln)
+                
+                builder.end_speech()
+                ids.end_speech(first_ftln)
+                text_lines.end_speech()
         
-        # Join and clean up - collapse multiple spaces
-        result = ' '.join(text_parts)
-        # Remove extra spaces and clean up
-        return ' '.join(result.split())
+        builder.end_scene()
+        stage.end_scene()
+        text_lines.end_scene()
+    
+    def _index_item_lines(self, elem, offset: int):
+        """Record the Folger lines that start inside a content item."""
+        if self._line_builder is None:
+            return
+        line_tags = (L_TAG, LB_TAG)
+        for child in elem.iter():
+            if child.tag in line_tags:
+                ftln = _ftln_number(child.get(XML_ID))
+                if ftln:
+                    self._line_builder.add_line(ftln, offset)
+    
+    def _get_element_text(self, elem) -> str:
+        """Get all text content from an element, including nested elements."""
+        return _element_text(elem)
     
     def _format_scene_content(self, content: List[Dict[str, str]]) -> str:
         """Format scene content with markdown for display."""
-        formatted_lines = []
-        
-        for item in content:
-            if item['type'] == 'speaker':
-                # Bold speakers
-                formatted_lines.append(f"**{item['text'].upper()}.**")
-            elif item['type'] == 'stage':
-                # Italicize stage directions
-                formatted_lines.append(f"*{item['text']}*")
-            elif item['type'] == 'line':
-                # Regular dialogue with preserved line breaks
-                formatted_lines.append(item['text'])
-            
-            # Add blank line after each element for spacing
-            formatted_lines.append("")
-        
-        return '\n'.join(formatted_lines).strip()
+        return format_content(content)
     
+    @timed("parser._get_characters")
     def _get_characters(self) -> List[Character]:
         """Extract character information from the TEI castList."""
         characters = []
         
         # Find the castList in the front matter
-        cast_list = self.root.find('.//tei:front/tei:castList', TEI_NS)
+        cast_list = self.backend.find(self.root, 'cast_list')
         if cast_list is None:
             return characters
         
-        # First pass: Find castGroups and their headers
-        cast_groups = {}
-        for cast_group in cast_list.findall('.//tei:castGroup', TEI_NS):
-            head_elem = cast_group.find('./tei:head', TEI_NS)
-            group_name = None
-            if head_elem is not None and head_elem.text:
-                group_name = head_elem.text.strip()
-            
-            # Mark all castItems in this group
-            for cast_item in cast_group.findall('./tei:castItem', TEI_NS):
-                cast_groups[id(cast_item)] = group_name
-        
-        # Process all castItem elements
-        for cast_item in cast_list.findall('.//tei:castItem', TEI_NS):
-            # Skip items that are references to other items (corresp attribute)
-            if cast_item.get('corresp'):
-                continue
-                
-            # Get character name
-            name_elem = cast_item.find('.//tei:name', TEI_NS)
-            if name_elem is None or not name_elem.text:
+        return self._parse_cast_list(cast_list)
+    
+    def _parse_cast_list(self, cast_list) -> List[Character]:
+        """Build Character objects from a castList element in one walk.
+        
+        A castItem belongs to the group named by the head of the innermost
+        castGroup around it.
+        """
+        characters = []
+        self._walk_cast(cast_list, None, characters)
+        return characters
+    
+    def _walk_cast(self, elem, group: Optional[str], characters: List[Character]):
+        """Append the characters of the castItems below elem, in document order."""
+        for child in elem:
+            if child.tag == CAST_ITEM_TAG:
+                character = self._cast_character(child, group)
+                if character is not None:
+                    characters.append(character)
                 continue
-                
-            name = name_elem.text.strip()
-            
-            # Get character description
-            desc_elem = cast_item.find('.//tei:roleDesc', TEI_NS)
-            description = None
-            if desc_elem is not None:
-                description = self._get_element_text(desc_elem).strip()
+            child_group = group
+            if child.tag == CAST_GROUP_TAG:
+                head_elem = self.backend.find(child, 'group_head')
+                child_group = None
+                if head_elem is not None and head_elem.text:
+                    child_group = head_elem.text.strip()
+            self._walk_cast(child, child_group, characters)
+    
+    def _cast_character(self, cast_item, group: Optional[str]) -> Optional[Character]:
+        """Build the Character of a castItem, or None for references and unnamed items."""
+        # Skip items that are references to other items (corresp attribute)
+        if cast_item.get('corresp'):
+            return None
             
-            # Check if this castItem is in a group
-            group = cast_groups.get(id(cast_item))
+        # Get character name
+        name_elem = self.backend.find(cast_item, 'name')
+        if name_elem is None or not name_elem.text:
+            return None
             
-            characters.append(Character(
-                name=name,
-                description=description,
-                group=group
-            ))
+        name = name_elem.text.strip()
+        
+        # Get character description
+        desc_elem = self.backend.find(cast_item, 'role_desc')
+        description = None
+        if desc_elem is not None:
+            description = self._get_element_text(desc_elem).strip()
         
-        return characters
\ No newline at end of file
+        return Character(
+            name=name,
+            description=description,
+            group=group,
+            id=cast_item.get(XML_ID)
+        )
+
+def _ftln_number(xml_id: Optional[str]) -> int:
+    """Return the number in an id like "ftln-0034", or 0 for other ids."""
+    if xml_id and xml_id.startswith('ftln-'):
+        return int(xml_id[5:])
+    return 0
+
+
+# How _element_text treats each TEI tag; anything else is descended into
+_TOKEN, _SPACE, _BREAK, _DESCEND = range(4)
+_TEXT_ACTIONS = {
+    W_TAG: _TOKEN,   # words and punctuation carry their own text
+    PC_TAG: _TOKEN,
+    C_TAG: _SPACE,   # <c> is the only source of spaces between tokens
+    LB_TAG: _BREAK,  # a prose line break is a space unless break="no"
+}
+
+def _element_text(elem) -> str:
+    """Return the text of an element in one pass over its subtree.
+    
+    Whitespace-only text and tails are layout and are skipped, so punctuation
+    attaches to the word before it. Other text (untokenized prose in the
+    header and cast list) is kept, any other element is a word boundary, and
+    runs of whitespace collapse to one space.
+    """
+    parts = []
+    append = parts.append
+    action_for = _TEXT_ACTIONS.get
+    text = elem.text
+    if text and not text.isspace():
+        append(text)
+    # Children still to visit at each level, with the tail of that level's element
+    stack = [(iter(elem), None)]
+    while stack:
+        for node in stack[-1][0]:
+            action = action_for(node.tag, _DESCEND)
+            if action is _TOKEN:
+                text = node.text
+                if text:
+                    append(text.strip())
+            elif action is _SPACE:
+                append(' ')
+            elif action is _BREAK:
+                if node.get('break') != 'no':
+                    append(' ')
+            else:
+                # Containers (list items, <gi> names) are word boundaries
+                append(' ')
+                text = node.text
+                if text and not text.isspace():
+                    append(text)
+                stack.append((iter(node), node.tail))
+                break
+            tail = node.tail
+            if tail and not tail.isspace():
+                append(tail)
+        else:
+            # Level finished: its element's tail follows
+            tail = stack.pop()[1]
+            append(' ')
+            if tail and not tail.isspace():
+                append(tail)
+    return ' '.join(''.join(parts).split())
+
+def _element_lines(elem) -> List[Tuple[object, str]]:
+    """Split the text of an element at the Folger lines that start inside it.
+    
+    Returns (line element, text) for each <l> or <lb> with an FTLN id in the
+    subtree, elem included, in document order. A verse line ends with its
+    <l>; a prose line runs to the next line or the end of the element holding
+    its <lb>. Text is built by the rules of _element_text, and text outside
+    any line (a stage direction between verse lines) is dropped.
+    """
+    lines = []
+    line_tags = (L_TAG, LB_TAG)
+    action_for = _TEXT_ACTIONS.get
+    # The element that started the current line, its text so far, and the
+    # stack depth below which the line ends
+    line, parts, depth = None, [], 0
+    if elem.tag in line_tags and _ftln_number(elem.get(XML_ID)):
+        line, depth = elem, 1
+    text = elem.text
+    if text and not text.isspace():
+        parts.append(text)
+    stack = [(iter(elem), None)]
+    while stack:
+        for node in stack[-1][0]:
+            if node.tag in line_tags and _ftln_number(node.get(XML_ID)):
+                if line is not None:
+                    lines.append((line, ' '.join(''.join(parts).split())))
+                # An <l> holds its line; an <lb> starts one in its parent
+                line, parts = node, []
+                depth = len(stack) + 1 if node.tag == L_TAG else len(stack)
+            action = action_for(node.tag, _DESCEND)
+            if action is _TOKEN:
+                text = node.text
+                if text:
+                    parts.append(text.strip())
+            elif action is _SPACE:
+                parts.append(' ')
+            elif action is _BREAK:
+                if node.get('break') != 'no':
+                    parts.append(' ')
+            else:
+                parts.append(' ')
+                text = node.text
+                if text and not text.isspace():
+                    parts.append(text)
+                stack.append((iter(node), node.tail))
+                break
+            tail = node.tail
+            if tail and not tail.isspace():
+                parts.append(tail)
+        else:
+            tail = stack.pop()[1]
+            if line is not None and len(stack) < depth:
+                lines.append((line, ' '.join(''.join(parts).split())))
+                line, parts = None, []
+            parts.append(' ')
+            if tail and not tail.isspace():
+                parts.append(tail)
+    return lines
@@ -0,0 +1,182 @@
+"""Markdown rendering of scenes, acts and the whole play.
+
+format_content() holds the formatting rules for scene content. PlayRenderer
+applies them once per loaded Play and keeps the Markdown for recently used
+scenes, acts and the full text in a bounded LRU cache, so repeated views cost
+a dictionary lookup. After a scene is shown, PlayRenderer.prefetch() renders
+the scenes either side of it on a small shared thread pool, so the next or
+previous click usually finds its Markdown ready.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from timing import timed
+
+if TYPE_CHECKING:
+    from parser import Play
+
+# Most Markdown strings one renderer keeps; the least recently used go first
+CACHE_SIZE = 64
+# Threads shared by every renderer for prefetching
+PREFETCH_WORKERS = 2
+
+_prefetch_pool: Optional[ThreadPoolExecutor] = None
+_prefetch_pool_lock = threading.Lock()
+
+
+def get_prefetch_pool() -> ThreadPoolExecutor:
+    """Return the thread pool that prefetches Markdown, starting it on first use."""
+    global _prefetch_pool
+    with _prefetch_pool_lock:
+        if _prefetch_pool is None:
+            _prefetch_pool = ThreadPoolExecutor(max_workers=PREFETCH_WORKERS, thread_name_prefix="prefetch")
+        return _prefetch_pool
+
+
+def format_item(item: Dict[str, str]) -> Optional[str]:
+    """Format one content item as Markdown, or None for unknown item types."""
+    if item['type'] == 'speaker':
+        # Bold speakers
+        return f"**{item['text'].upper()}.**"
+    if item['type'] == 'stage':
+        # Italicize stage directions
+        return f"*{item['text']}*"
+    if item['type'] == 'line':
+        # Regular dialogue with preserved line breaks
+        return item['text']
+    return None
+
+
+@timed("render.format_content")
+def format_content(content: List[Dict[str, str]]) -> str:
+    """Format scene content as Markdown, one blank line between items."""
+    formatted_lines = []
+    
+    for item in content:
+        formatted = format_item(item)
+        if formatted is not None:
+            formatted_lines.append(formatted)
+        # Add blank line after each element for spacing
+        formatted_lines.append("")
+    
+    return '\n'.join(formatted_lines).strip()
+
+
+class PlayRenderer:
+    """Renders a Play to Markdown on first use and caches the results.
+    
+    Safe to share between Streamlit sessions and the prefetch threads.
+    """
+    
+    def __init__(self, play: "Play", max_entries: int = CACHE_SIZE):
+        self.play = play
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[str, ...], Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Scene keys queued for prefetching
+        self._pending = set()
+    
+    def invalidate(self, play: Optional["Play"] = None):
+        """Drop all cached Markdown, optionally switching to a reloaded play."""
+        with self._lock:
+            if play is not None:
+                self.play = play
+            self._cache = OrderedDict()
+    
+    def _cached(self, key: Tuple[str, ...], render: Callable[["Play"], Optional[str]]) -> Optional[str]:
+        """Return the cached Markdown for key, rendering and storing it on a miss."""
+        with self._lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+            play = self.play
+        
+        # Render outside the lock so other sessions are not held up
+        markdown = render(play)
+        
+        with self._lock:
+            if play is not self.play:
+                # The play was reloaded meanwhile; do not cache the old text
+                return markdown
+            markdown = self._cache.setdefault(key, markdown)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return markdown
+    
+    def __len__(self) -> int:
+        """Return the number of cached entries."""
+        return len(self._cache)
+    
+    def scene(self, act_number: str, scene_number: str) -> Optional[str]:
+        """Return the Markdown body of a scene, or None if it does not exist."""
+        def render(play):
+            act = play.get_act(act_number)
+            scene = act.get_scene(scene_number) if act else None
+            return format_content(scene.content) if scene else None
+        return self._cached(('scene', act_number, scene_number), render)
+    
+    def act(self, act_number: str) -> Optional[str]:
+        """Return the Markdown for every scene of an act, or None if it does not exist."""
+        def render(play):
+            act = play.get_act(act_number)
+            if act is None:
+                return None
+            blocks = []
+            for scene in act.scenes:
+                blocks.append(f"## {scene.title}")
+                blocks.append(self.scene(act.number, scene.number))
+                # Divider between scenes
+                blocks.append("---")
+            return '\n\n'.join(blocks)
+        return self._cached(('act', act_number), render)
+    
+    def full_play(self) -> str:
+        """Return the Markdown for the entire play."""
+        def render(play):
+            blocks = []
+            for act in play.acts:
+                blocks.append(f"# {act.get_formatted_title()}")
+                blocks.append("---")
+                for scene in act.scenes:
+                    blocks.append(f"## {scene.title}")
+                    blocks.append(self.scene(act.number, scene.number))
+            return '\n\n'.join(blocks)
+        return self._cached(('play',), render)
+    
+    def warm(self):
+        """Render every scene, act and the full play ahead of time."""
+        for act in self.play.acts:
+            self.act(act.number)
+        self.full_play()
+    
+    def neighbours(self, act_number: str, scene_number: str) -> List[Tuple[str, str]]:
+        """Return the (act, scene) keys after and before a scene in reading order."""
+        order = [(act.number, scene.number) for act in self.play.acts for scene in act.scenes]
+        try:
+            index = order.index((act_number, scene_number))
+        except ValueError:
+            return []
+        return [order[i] for i in (index + 1, index - 1) if 0 <= i < len(order)]
+    
+    def prefetch(self, act_number: str, scene_number: str) -> List[Future]:
+        """Render the scenes either side of a scene in the background, unless already cached."""
+        futures = []
+        for neighbour in self.neighbours(act_number, scene_number):
+            key = ('scene',) + neighbour
+            with self._lock:
+                if key in self._cache or key in self._pending:
+                    continue
+                self._pending.add(key)
+            futures.append(get_prefetch_pool().submit(self._prefetch, key))
+        return futures
+    
+    def _prefetch(self, key: Tuple[str, str, str]):
+        try:
+            self.scene(key[1], key[2])
+        finally:
+            with self._lock:
+                self._pending.discard(key)
@@ -0,0 +1,151 @@
+"""Inverted index over a play's word tokens, with phrase and lemma queries.
+
+Postings are stored CSR-style: for each term, a slice of one sorted array of
+token positions. Terms are the lowercased surface forms and lemmas taken from
+the TokenStore, so a phrase query is an intersection of shifted position
+arrays and never rescans scene text.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import re
+
+import numpy as np
+
+from tokens import NO_CODE, TokenStore
+
+# Words in a query; keeps apostrophes inside words ("either’s", "o'er")
+_QUERY_WORD_RE = re.compile(r"[\w’']+")
+
+
+@dataclass
+class SearchHit:
+    """A match, reported at the line where it starts."""
+    position: int  # token offset of the first matched word
+    length: int    # number of matched words
+    act_number: str
+    scene_number: str
+    ref: Optional[str]  # act.scene.line, or "SD a.s.n" in stage directions
+    ftln: int
+    speaker: Optional[str]
+
+
+class _Postings:
+    """Sorted token positions for every term of one field."""
+    
+    def __init__(self, codes: np.ndarray, strings: List[Optional[str]]):
+        # Lowercase the string table, then map each token to a term id
+        terms: Dict[str, int] = {}
+        term_of_code = np.full(len(strings) + 1, -1, dtype=np.int32)
+        for code, text in enumerate(strings):
+            if text:
+                term_of_code[code] = terms.setdefault(text.lower(), len(terms))
+        token_terms = term_of_code[codes]  # NO_CODE maps to the trailing -1
+        
+        indexed = np.nonzero(token_terms >= 0)[0]
+        order = np.argsort(token_terms[indexed], kind='stable')
+        self.positions = indexed[order].astype(np.int32)
+        counts = np.bincount(token_terms[indexed], minlength=len(terms))
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.terms = terms
+    
+    def get(self, term: str) -> np.ndarray:
+        term_id = self.terms.get(term.lower())
+        if term_id is None:
+            return np.empty(0, dtype=np.int32)
+        return self.positions[self.offsets[term_id]:self.offsets[term_id + 1]]
+
+
+class SearchIndex:
+    """Positional inverted index keyed on surface forms and lemmas."""
+    
+    def __init__(self, tokens: TokenStore):
+        self.tokens = tokens
+        strings = tokens.strings.strings
+        self.forms = _Postings(tokens.form, strings)
+        self.lemmas = _Postings(tokens.lemma, strings)
+        # Lemmas each surface form is annotated with, for lemma queries typed as forms
+        self._form_lemmas: Dict[str, Tuple[str, ...]] = {}
+        pairs = np.unique(np.stack([tokens.form, tokens.lemma], axis=1), axis=0)
+        for form_code, lemma_code in pairs.tolist():
+            if lemma_code != NO_CODE:
+                form = strings[form_code].lower()
+                self._form_lemmas[form] = self._form_lemmas.get(form, ()) + (strings[lemma_code].lower(),)
+    
+    def postings(self, word: str, lemma: bool = False) -> np.ndarray:
+        """Return the sorted token positions matching one query word."""
+        if not lemma:
+            return self.forms.get(word)
+        word = word.lower()
+        # "nothing" as a lemma, plus the lemmas of "nothing" as a surface form
+        lemmas = {word, *self._form_lemmas.get(word, ())}
+        found = [self.lemmas.get(term) for term in lemmas]
+        return np.unique(np.concatenate(found)) if found else np.empty(0, dtype=np.int32)
+    
+    def match(self, words: List[str], lemma: bool = False) -> np.ndarray:
+        """Return start positions where the words occur consecutively."""
+        if not words:
+            return np.empty(0, dtype=np.int32)
+        starts = self.postings(words[0], lemma)
+        for i, word in enumerate(words[1:], start=1):
+            if not len(starts):
+                break
+            starts = np.intersect1d(starts, self.postings(word, lemma) - i, assume_unique=True)
+        if len(words) > 1 and len(starts):
+            starts = starts[self._within_one_speech(starts, len(words))]
+        return starts
+    
+    def _within_one_speech(self, starts: np.ndarray, length: int) -> np.ndarray:
+        """Mask of phrase matches that do not cross a speech boundary."""
+        tokens = self.tokens
+        ends = starts + length - 1
+        return (self._speech_of(starts) == self._speech_of(ends)) & (tokens.scene[starts] == tokens.scene[ends])
+    
+    def _speech_of(self, positions: np.ndarray) -> np.ndarray:
+        """Return the index of the speech holding each token, or -1 outside speeches."""
+        tokens = self.tokens
+        speech = np.searchsorted(tokens.speech_start, positions, side='right') - 1
+        inside = (speech >= 0) & (positions < tokens.speech_end[np.maximum(speech, 0)])
+        return np.where(inside, speech, -1)
+    
+    def search(self, query: str, lemma: bool = False, limit: Optional[int] = None) -> Tuple[int, List[SearchHit]]:
+        """Search for a word or phrase; return the total count and the first hits."""
+        words = _QUERY_WORD_RE.findall(query)
+        starts = self.match(words, lemma)
+        total = len(starts)
+        if limit is not None:
+            starts = starts[:limit]
+        
+        tokens = self.tokens
+        strings = tokens.strings
+        hits = []
+        for position in starts.tolist():
+            act_number, scene_number = tokens.scene_keys[tokens.scene[position]]
+            hits.append(SearchHit(
+                position=position,
+                length=len(words),
+                act_number=act_number,
+                scene_number=scene_number,
+                ref=strings[tokens.line[position]],
+                ftln=int(tokens.ftln[position]),
+                speaker=strings[tokens.speaker[position]],
+            ))
+        return total, hits
+    
+    def snippet(self, hit: SearchHit, width: int = 8) -> Tuple[str, str, str]:
+        """Return (left context, matched words, right context) for a hit."""
+        tokens = self.tokens
+        start, end = self._speech_bounds(hit.position)
+        left = tokens.forms(max(start, hit.position - width), hit.position)
+        match = tokens.forms(hit.position, hit.position + hit.length)
+        right = tokens.forms(hit.position + hit.length, min(end, hit.position + hit.length + width))
+        return ' '.join(left), ' '.join(match), ' '.join(right)
+    
+    def _speech_bounds(self, position: int) -> Tuple[int, int]:
+        """Return the token range of the speech containing position, else its scene."""
+        tokens = self.tokens
+        speech = int(np.searchsorted(tokens.speech_start, position, side='right')) - 1
+        if speech >= 0 and position < tokens.speech_end[speech]:
+            return int(tokens.speech_start[speech]), int(tokens.speech_end[speech])
+        scene = tokens.scene[position]
+        return int(tokens.scene_start[scene]), int(tokens.scene_end[scene])
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Persistent on-disk snapshots of parsed plays.
+
+A snapshot is a pickled Play preceded by a small JSON header recording the
+snapshot format, the parser version and the source file's SHA-256 and mtime.
+load_play() returns the snapshot when all of these still match and otherwise
+re-parses the XML and rewrites the snapshot, so a fresh process only pays for
+XML parsing once per source revision.
+
+The play's content is packed into a ContentStore before it is written. Its
+text buffer is stored after the pickle rather than inside it, and is mapped
+back with mmap on read, so loading a snapshot does not copy the text and
+processes reading the same snapshot share its pages.
+
+Pre-warm snapshots at image build time with:
+
+    python snapshot.py data/king-lear_TEIsimple_FolgerShakespeare.xml
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Optional
+
+from contentstore import pack_play
+from parser import PARSER_VERSION, Play, TEIParser
+
+# Bump when the on-disk layout (not the model) changes
+SNAPSHOT_FORMAT = 2
+SNAPSHOT_MAGIC = b"CORDELIA"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# Can be overridden with the CORDELIA_SNAPSHOT_DIR environment variable
+DEFAULT_SNAPSHOT_DIR = Path(".cache/snapshots")
+
+
+def get_snapshot_dir() -> Path:
+    """Return the directory snapshots are read from and written to."""
+    return Path(os.environ.get("CORDELIA_SNAPSHOT_DIR", DEFAULT_SNAPSHOT_DIR))
+
+
+def snapshot_path(xml_path: Path, snapshot_dir: Optional[Path] = None) -> Path:
+    """Return the snapshot file used for a source XML file."""
+    snapshot_dir = get_snapshot_dir() if snapshot_dir is None else Path(snapshot_dir)
+    return snapshot_dir / f"{Path(xml_path).stem}{SNAPSHOT_SUFFIX}"
+
+
+def source_key(xml_path: Path) -> dict:
+    """Return the header fields identifying the current source and parser."""
+    xml_path = Path(xml_path)
+    digest = hashlib.sha256()
+    with open(xml_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "parser_version": PARSER_VERSION,
+        "source_sha256": digest.hexdigest(),
+        "source_mtime_ns": xml_path.stat().st_mtime_ns,
+    }
+
+
+def write_snapshot(play: Play, xml_path: Path, snapshot_dir: Optional[Path] = None) -> Path:
+    """Write a snapshot of a parsed play, replacing any previous one atomically."""
+    path = snapshot_path(xml_path, snapshot_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    
+    # Text buffers go after the pickle; NumPy arrays and the rest stay inside it
+    buffers = []
+    def out_of_band(buffer: pickle.PickleBuffer) -> bool:
+        owner = buffer.raw().obj
+        if isinstance(owner, memoryview):
+            # Text of a play that was itself loaded from a snapshot
+            owner = owner.obj
+        if isinstance(owner, (bytes, mmap.mmap)):
+            buffers.append(buffer)
+            return False
+        return True
+    payload = pickle.dumps(play, protocol=5, buffer_callback=out_of_band)
+    
+    header = source_key(xml_path)
+    header["payload_bytes"] = len(payload)
+    header["buffer_bytes"] = [buffer.raw().nbytes for buffer in buffers]
+    header = json.dumps(header, sort_keys=True).encode("utf-8")
+    
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(SNAPSHOT_MAGIC)
+            f.write(struct.pack("<I", len(header)))
+            f.write(header)
+            f.write(payload)
+            for buffer in buffers:
+                f.write(buffer.raw())
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
+    return path
+
+
+def read_header(path: Path) -> Optional[dict]:
+    """Return the JSON header of a snapshot file, or None if it is unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return _read_header(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _read_header(f) -> dict:
+    """Read and return the header, leaving the file positioned at the payload."""
+    if f.read(len(SNAPSHOT_MAGIC)) != SNAPSHOT_MAGIC:
+        raise ValueError("not a snapshot file")
+    (length,) = struct.unpack("<I", f.read(4))
+    return json.loads(f.read(length).decode("utf-8"))
+
+
+def read_snapshot(xml_path: Path, snapshot_dir: Optional[Path] = None) -> Optional[Play]:
+    """Return the snapshotted Play if it is fresh for xml_path, otherwise None."""
+    path = snapshot_path(xml_path, snapshot_dir)
+    try:
+        with open(path, "rb") as f:
+            header = _read_header(f)
+            if any(header.get(key) != value for key, value in source_key(xml_path).items()):
+                return None
+            start = f.tell()
+            # The mapping stays open for as long as the text buffers refer to it
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        
+        end = start + header["payload_bytes"]
+        buffers = []
+        for length in header["buffer_bytes"]:
+            buffers.append(data[end:end + length])
+            end += length
+        if end != len(data):
+            raise ValueError("truncated snapshot")
+        return pickle.loads(data[start:start + header["payload_bytes"]], buffers=buffers)
+    except (OSError, ValueError, EOFError, KeyError, TypeError, pickle.UnpicklingError, AttributeError,
+            struct.error):
+        # Missing, truncated, or written by an incompatible model
+        return None
+
+
+def load_play(xml_path: Path, snapshot_dir: Optional[Path] = None) -> Play:
+    """Load a play from its snapshot, re-parsing and re-snapshotting when stale."""
+    play = read_snapshot(xml_path, snapshot_dir)
+    if play is not None:
+        return play
+    
+    play = TEIParser(Path(xml_path)).parse()
+    pack_play(play)
+    try:
+        write_snapshot(play, xml_path, snapshot_dir)
+    except OSError:
+        # A read-only snapshot directory should not stop the app from loading
+        pass
+    return play
+
+
+def main(argv=None) -> int:
+    arg_parser = argparse.ArgumentParser(description="Build snapshots of parsed TEI plays.")
+    arg_parser.add_argument("xml_files", nargs="+", type=Path, help="TEI XML files to snapshot")
+    arg_parser.add_argument("--snapshot-dir", type=Path, default=None,
+                            help=f"output directory (default: $CORDELIA_SNAPSHOT_DIR or {DEFAULT_SNAPSHOT_DIR})")
+    arg_parser.add_argument("--force", action="store_true", help="rebuild even if the snapshot is fresh")
+    args = arg_parser.parse_args(argv)
+    
+    for xml_path in args.xml_files:
+        if not args.force and read_snapshot(xml_path, args.snapshot_dir) is not None:
+            print(f"✓ {xml_path}: snapshot is fresh")
+            continue
+        start = time.perf_counter()
+        play = TEIParser(xml_path).parse()
+        pack_play(play)
+        path = write_snapshot(play, xml_path, args.snapshot_dir)
+        elapsed = time.perf_counter() - start
+        print(f"✓ {xml_path}: wrote {path} ({path.stat().st_size / 1024:.0f} KiB, {elapsed:.2f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""Index of who is on stage at every Folger line.
+
+Stage directions carry the characters they move:
+
+    <stage n="SD 1.1.33.1" type="entrance" who="#Lear_Lr #Cornwall_Lr ...">
+    <stage n="SD 1.1.36" type="exit" who="#Gloucester_Lr">
+
+StageIndexBuilder turns these into half-open FTLN intervals [start, end) per
+character: an entrance takes effect from the next line, an exit after the
+current one, and everyone still on stage leaves when the scene ends. A speaker
+who has no entrance is taken to enter with their speech.
+
+StageIndex cuts the play at every interval boundary into segments with a fixed
+cast, stored as a sorted NumPy array of segment starts and a boolean segment x
+character presence matrix. Who is on stage at a line is one binary search; bulk
+lookups and shared-stage spans are vectorized over the segments.
+
+    >>> play.stage.at(play.lines.ftln_for("3.7.40"))   # ids on stage at 3.7.40
+    >>> play.stage.spans("Lear_Lr", "Cordelia_Lr")    # [(start, end), ...] FTLN spans
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def _refs(who: Optional[str]) -> List[str]:
+    """Split a who attribute ("#Kent_Lr #Gloucester_Lr") into character ids."""
+    return [ref.lstrip('#') for ref in (who or '').split()]
+
+
+class StageIndex:
+    """On-stage segments of a play, keyed by FTLN."""
+    
+    def __init__(self, ids: List[str], bounds: np.ndarray, presence: np.ndarray,
+                 scene_keys: List[Tuple[str, str]], scene_bounds: np.ndarray):
+        self.ids = ids
+        self.bounds = bounds        # segment i covers FTLNs [bounds[i], bounds[i + 1])
+        self.presence = presence    # bool, segments x characters
+        self.scene_keys = scene_keys
+        self.scene_bounds = scene_bounds  # scene i covers [scene_bounds[i, 0], scene_bounds[i, 1])
+        self._column = {character_id: i for i, character_id in enumerate(ids)}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state['_column']
+        return state
+    
+    def __setstate__(self, state):
+        self.__init__(**state)
+    
+    def column(self, character_id: str) -> int:
+        """Return the presence column of a character ("Kent_Lr" or "#Kent_Lr"), or -1."""
+        return self._column.get(character_id.lstrip('#'), -1)
+    
+    def _segments(self, ftlns: np.ndarray) -> np.ndarray:
+        """Return the segment containing each FTLN, or -1 outside every segment."""
+        segments = np.searchsorted(self.bounds, ftlns, side='right') - 1
+        return np.where((segments >= 0) & (segments < len(self.presence)), segments, -1)
+    
+    def at(self, ftln: int) -> List[str]:
+        """Return the ids of the characters on stage at a line."""
+        segment = int(self._segments(np.array([ftln]))[0])
+        if segment < 0:
+            return []
+        return [self.ids[i] for i in np.flatnonzero(self.presence[segment]).tolist()]
+    
+    def at_many(self, ftlns: Sequence[int]) -> np.ndarray:
+        """Return a bool matrix (lines x characters) of who is on stage at each line."""
+        segments = self._segments(np.asarray(ftlns, dtype=np.int64))
+        result = np.zeros((len(segments), len(self.ids)), dtype=bool)
+        inside = segments >= 0
+        result[inside] = self.presence[segments[inside]]
+        return result
+    
+    def spans(self, *character_ids: str) -> List[Tuple[int, int]]:
+        """Return the [start, end) FTLN spans when every given character is on stage.
+
+        Spans never cross a scene boundary. Characters unknown to the index
+        are never on stage.
+        """
+        columns = [self.column(character_id) for character_id in character_ids]
+        if not columns or min(columns) < 0 or not len(self.presence):
+            return []
+        shared = self.presence[:, columns].all(axis=1)
+        starts_scene = np.isin(self.bounds[:-1], self.scene_bounds[:, 0])
+        before = np.concatenate(([False], shared[:-1]))
+        after = np.concatenate((shared[1:], [False]))
+        next_starts_scene = np.concatenate((starts_scene[1:], [True]))
+        first = shared & (~before | starts_scene)
+        last = shared & (~after | next_starts_scene)
+        return list(zip(self.bounds[:-1][first].tolist(), self.bounds[1:][last].tolist()))
+    
+    def scene_of(self, ftln: int) -> Optional[Tuple[str, str]]:
+        """Return the (act, scene) key of the scene containing a line, or None."""
+        index = int(np.searchsorted(self.scene_bounds[:, 0], ftln, side='right')) - 1
+        if index < 0 or ftln >= self.scene_bounds[index, 1]:
+            return None
+        return self.scene_keys[index]
+    
+    def scene_lines(self) -> np.ndarray:
+        """Return the number of lines each character is on stage in each scene (characters x scenes)."""
+        lengths = np.diff(self.bounds)
+        scene_of = np.searchsorted(self.scene_bounds[:, 0], self.bounds[:-1], side='right') - 1
+        weighted = self.presence * lengths[:, None]
+        counts = np.zeros((len(self.ids), len(self.scene_keys)), dtype=np.int64)
+        np.add.at(counts.T, scene_of, weighted)
+        return counts
+
+
+class StageIndexBuilder:
+    """Collects entrances, exits and speeches while scenes are parsed."""
+    
+    def __init__(self):
+        self.intervals: List[Tuple[str, int, int]] = []
+        self.scene_keys: List[Tuple[str, str]] = []
+        self.scene_bounds: List[Tuple[int, int]] = []
+        # Characters on stage in the current scene, with the FTLN they entered at
+        self._on_stage: Dict[str, int] = {}
+        # Every character in order of first entrance
+        self._entered: Dict[str, None] = {}
+        # First FTLN after every line seen so far
+        self._cursor = 1
+        self._scene_start = 1
+    
+    def begin_scene(self, act_number: str, scene_number: str):
+        self.scene_keys.append((act_number, scene_number))
+        self._scene_start = self._cursor
+        self._on_stage = {}
+    
+    def _position(self, ftln: int) -> int:
+        """Return the first line after ftln, or the scene's first line before any line."""
+        return ftln + 1 if ftln else self._scene_start
+    
+    def line(self, ftln: int):
+        """Record that line ftln has been reached."""
+        self._cursor = max(self._cursor, ftln + 1)
+    
+    def enter(self, who: Optional[str], ftln: int):
+        """Bring characters on stage after line ftln (0: at the start of the scene)."""
+        position = self._position(ftln)
+        for ref in _refs(who):
+            self._on_stage.setdefault(ref, position)
+            self._entered.setdefault(ref)
+    
+    def exit(self, who: Optional[str], ftln: int):
+        """Take characters off stage after line ftln."""
+        position = self._position(ftln)
+        for ref in _refs(who):
+            start = self._on_stage.pop(ref, None)
+            if start is not None:
+                self._close(ref, start, position)
+    
+    def direction(self, kind: Optional[str], who: Optional[str], ftln: int):
+        """Apply a stage direction of a given type; only entrances and exits move anyone."""
+        if kind == 'entrance':
+            self.enter(who, ftln)
+        elif kind == 'exit':
+            self.exit(who, ftln)
+    
+    def speak(self, who: Optional[str], ftln: int):
+        """Note a speech starting after line ftln; a speaker not on stage enters with it."""
+        self.enter(who, ftln)
+    
+    def end_scene(self):
+        end = max(self._cursor, self._scene_start)
+        for ref, start in self._on_stage.items():
+            self._close(ref, start, end)
+        self._on_stage = {}
+        self.scene_bounds.append((self._scene_start, end))
+    
+    def _close(self, ref: str, start: int, end: int):
+        if end > start:
+            self.intervals.append((ref, start, end))
+    
+    def build(self) -> StageIndex:
+        # Columns in order of first entrance, for characters on stage for at least one line
+        on_stage = {ref for ref, _, _ in self.intervals}
+        ids = [ref for ref in self._entered if ref in on_stage]
+        column = {ref: i for i, ref in enumerate(ids)}
+        characters = np.array([column[ref] for ref, _, _ in self.intervals], dtype=np.int64)
+        starts = np.array([start for _, start, _ in self.intervals], dtype=np.int64)
+        ends = np.array([end for _, _, end in self.intervals], dtype=np.int64)
+        scene_bounds = np.array(self.scene_bounds, dtype=np.int64).reshape(-1, 2)
+        
+        # Every interval edge and scene edge starts a new segment
+        bounds = np.unique(np.concatenate((starts, ends, scene_bounds.ravel())))
+        
+        # +1 where a character's interval starts, -1 where it ends; running sums give presence
+        delta = np.zeros((len(bounds), len(ids)), dtype=np.int32)
+        np.add.at(delta, (np.searchsorted(bounds, starts), characters), 1)
+        np.add.at(delta, (np.searchsorted(bounds, ends), characters), -1)
+        presence = np.cumsum(delta, axis=0)[:-1] > 0
+        
+        return StageIndex(
+            ids=ids,
+            bounds=bounds,
+            presence=presence,
+            scene_keys=list(self.scene_keys),
+            scene_bounds=scene_bounds,
+        )
@@ -0,0 +1,139 @@
+"""Per-character statistics computed once per play from its TokenStore.
+
+Every speech carries sp/@who (e.g. "#Kent_Lr"), and every spoken token records
+the speech it belongs to. CharacterStats counts speeches, words and lines for
+each character in each scene, and keeps them as character x scene NumPy
+matrices. The counts come from one bincount per measure over (speaker, scene)
+pairs, so scoped totals, first and last appearances and shares of dialogue are
+array reductions rather than walks over Scene.content.
+
+    >>> stats = CharacterStats(play.tokens, play.characters)
+    >>> top = stats.table(act_number="3", sort_by="Lines")[:5]
+
+A speech shared by several speakers (who="#Albany_Lr #Cornwall_Lr") counts
+for each of them. A line counts for every character who speaks a word of it.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tokens import NO_CODE, TokenStore
+
+# Measures stored as character x scene matrices
+MEASURES = ('lines', 'words', 'speeches')
+
+# Columns of table() that rows can be sorted by
+SORT_KEYS = ('Character', 'Lines', 'Words', 'Speeches', 'Scenes', 'Share')
+
+
+class CharacterStats:
+    """Speech, word and line counts per character and scene."""
+    
+    def __init__(self, tokens: TokenStore, characters: Optional[List] = None):
+        self.tokens = tokens
+        self.scene_keys: List[Tuple[str, str]] = list(tokens.scene_keys)
+        n_scenes = len(self.scene_keys)
+        
+        # Distinct sp/@who values, and the characters each one names
+        who_codes = np.unique(tokens.speech_speaker[tokens.speech_speaker != NO_CODE])
+        who_ids = [[ref.lstrip('#') for ref in tokens.strings[code].split()] for code in who_codes.tolist()]
+        
+        # Rows follow the cast list, then speakers missing from it in order of first speech
+        names = {c.id: c.name for c in characters or [] if c.id}
+        spoken = dict.fromkeys(ref for refs in who_ids for ref in refs)
+        self.ids: List[str] = [i for i in names if i in spoken] + [i for i in spoken if i not in names]
+        self.names: List[str] = [names.get(i, i) for i in self.ids]
+        self._row = {character_id: row for row, character_id in enumerate(self.ids)}
+        
+        # Which characters each who value credits: (rows x who values) 0/1 matrix
+        credit = np.zeros((len(self.ids), len(who_codes)), dtype=np.int32)
+        for column, refs in enumerate(who_ids):
+            credit[[self._row[ref] for ref in refs], column] = 1
+        
+        def per_who(speaker_codes: np.ndarray, scenes: np.ndarray) -> np.ndarray:
+            """Count (who value, scene) pairs into a (who values x scenes) matrix."""
+            keep = speaker_codes != NO_CODE
+            who = np.searchsorted(who_codes, speaker_codes[keep])
+            flat = np.bincount(who * n_scenes + scenes[keep], minlength=len(who_codes) * n_scenes)
+            return flat.reshape(len(who_codes), n_scenes)
+        
+        self.speeches = credit @ per_who(tokens.speech_speaker, tokens.speech_scene)
+        self.words = credit @ per_who(tokens.speaker, tokens.scene)
+        
+        # A line is one distinct (speaker, FTLN) pair; the FTLN fixes its scene
+        spoken_lines = (tokens.speaker != NO_CODE) & (tokens.ftln > 0)
+        speaker_codes = tokens.speaker[spoken_lines].astype(np.int64)
+        ftln = tokens.ftln[spoken_lines]
+        _, first = np.unique(speaker_codes * (int(ftln.max(initial=0)) + 1) + ftln, return_index=True)
+        self.lines = credit @ per_who(tokens.speaker[spoken_lines][first], tokens.scene[spoken_lines][first])
+        
+        # First and last scenes with a speech, or -1 for characters who never speak
+        speaks = self.speeches > 0
+        has_speech = speaks.any(axis=1)
+        self.first_scene = np.where(has_speech, speaks.argmax(axis=1), -1)
+        self.last_scene = np.where(has_speech, n_scenes - 1 - speaks[:, ::-1].argmax(axis=1), -1)
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def row(self, character_id: str) -> int:
+        """Return the row of a character by xml:id ("Kent_Lr" or "#Kent_Lr"), or -1."""
+        return self._row.get(character_id.lstrip('#'), -1)
+    
+    def scene_mask(self, act_number: Optional[str] = None) -> np.ndarray:
+        """Return a boolean mask of the scene columns in an act, or of every scene."""
+        if act_number is None:
+            return np.ones(len(self.scene_keys), dtype=bool)
+        return np.array([act == act_number for act, _ in self.scene_keys], dtype=bool)
+    
+    def totals(self, act_number: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Return each measure summed over the scenes in scope, one value per character."""
+        mask = self.scene_mask(act_number)
+        return {measure: getattr(self, measure)[:, mask].sum(axis=1) for measure in MEASURES}
+    
+    def share(self, act_number: Optional[str] = None) -> np.ndarray:
+        """Return each character's fraction of the words spoken in scope."""
+        words = self.totals(act_number)['words']
+        total = words.sum()
+        return words / total if total else np.zeros(len(words))
+    
+    def scene_label(self, index: int) -> Optional[str]:
+        """Return "act.scene" for a scene column, or None for -1."""
+        if index < 0:
+            return None
+        return '.'.join(self.scene_keys[index])
+    
+    def table(self, act_number: Optional[str] = None, sort_by: str = 'Lines',
+              descending: bool = True) -> List[Dict[str, object]]:
+        """Return one row per character who speaks in scope, sorted by a column of SORT_KEYS."""
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"sort_by must be one of {SORT_KEYS}")
+        mask = self.scene_mask(act_number)
+        totals = self.totals(act_number)
+        scenes = (self.speeches[:, mask] > 0).sum(axis=1)
+        share = self.share(act_number)
+        columns = {'Lines': totals['lines'], 'Words': totals['words'], 'Speeches': totals['speeches'],
+                   'Scenes': scenes, 'Share': share}
+        
+        rows = np.flatnonzero(totals['speeches'] > 0)
+        if sort_by == 'Character':
+            order = sorted(rows.tolist(), key=lambda row: self.names[row].lower(), reverse=descending)
+        else:
+            # Stable sort on the row number keeps cast order between ties
+            key = columns[sort_by][rows]
+            order = rows[np.lexsort((rows, -key if descending else key))].tolist()
+        
+        return [
+            {
+                'Character': self.names[row],
+                'Lines': int(totals['lines'][row]),
+                'Words': int(totals['words'][row]),
+                'Speeches': int(totals['speeches'][row]),
+                'Scenes': int(scenes[row]),
+                'First': self.scene_label(int(self.first_scene[row])),
+                'Last': self.scene_label(int(self.last_scene[row])),
+                'Share': round(float(share[row]) * 100, 1),
+            }
+            for row in order
+        ]
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Test the JSON read API: routes, ETags, gzip and idle and concurrent readers."""
+
+import gzip
+import http.client
+import json
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from api import APIServer, PlayAPI
+from parser import TEIParser
+
+PLAY_ID = "king-lear_TEIsimple_FolgerShakespeare"
+
+def fetch(port: int, path: str, **headers):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request("GET", path, headers=headers)
+    response = connection.getresponse()
+    body = response.read()
+    connection.close()
+    return response, body
+
+def test_api():
+    play = TEIParser(Path(f"data/{PLAY_ID}.xml")).parse()
+    api = PlayAPI({PLAY_ID: play})
+    server = APIServer(("127.0.0.1", 0), api)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_port
+
+    print("=== Read API Test ===")
+    try:
+        response, body = fetch(port, "/plays")
+        assert response.status == 200
+        assert json.loads(body) == [{"id": PLAY_ID, "title": play.title, "acts": play.get_act_count(),
+                                     "scenes": play.get_total_scenes(), "lines": len(play.line_store)}]
+
+        response, body = fetch(port, f"/plays/{PLAY_ID}/acts/1/scenes/1")
+        scene = json.loads(body)
+        assert scene["content"] == list(play.get_act("1").get_scene("1").content)
+        assert scene["first_line"] == "1.1.1"
+
+        response, body = fetch(port, f"/plays/{PLAY_ID}/lines?to=3.2.9&from=3.2.1")
+        lines = json.loads(body)["lines"]
+        assert [line["text"] for line in lines] == [line.text for line in play.line_range("3.2.1", "3.2.9")]
+        print(f"✓ 3.2.1: {lines[0]['text']}")
+
+        characters = json.loads(fetch(port, f"/plays/{PLAY_ID}/characters")[1])
+        kent = next(c for c in characters if c["id"] == "Kent_Lr")
+        assert kent["speeches"] == len(play.speeches_by("Kent_Lr"))
+
+        # The same response revalidates with a 304 and no body
+        response, body = fetch(port, f"/plays/{PLAY_ID}")
+        etag = response.getheader("ETag")
+        assert etag.startswith('"') and response.getheader("Content-Encoding") is None
+        response, body = fetch(port, f"/plays/{PLAY_ID}", **{"If-None-Match": etag})
+        assert response.status == 304 and body == b""
+
+        # The gzip encoding is pre-compressed, with its own strong ETag
+        response, compressed = fetch(port, f"/plays/{PLAY_ID}", **{"Accept-Encoding": "gzip"})
+        assert response.getheader("Content-Encoding") == "gzip" and response.getheader("ETag") != etag
+        assert json.loads(gzip.decompress(compressed))["title"] == play.title
+        assert api.get(f"/plays/{PLAY_ID}") is api.get(f"/plays/{PLAY_ID}")
+
+        # A malformed q-value falls back to the uncompressed body
+        response, body = fetch(port, f"/plays/{PLAY_ID}", **{"Accept-Encoding": "gzip;q=abc"})
+        assert response.status == 200 and response.getheader("Content-Encoding") is None
+        assert response.getheader("ETag") == etag
+
+        # A reloaded play gets responses of its own, not those of the Play it replaced
+        cached = api.get(f"/plays/{PLAY_ID}")
+        api.plays[PLAY_ID] = TEIParser(Path(f"data/{PLAY_ID}.xml")).parse()
+        assert api.get(f"/plays/{PLAY_ID}") is not cached
+        assert api.get(f"/plays/{PLAY_ID}").etag == cached.etag
+
+        assert fetch(port, "/plays/nothing")[0].status == 404
+        assert fetch(port, f"/plays/{PLAY_ID}/acts/9/scenes/1")[0].status == 404
+        assert fetch(port, f"/plays/{PLAY_ID}/lines")[0].status == 400
+        assert fetch(port, f"/plays/{PLAY_ID}/lines?from=3.2.9&to=3.2.1")[0].status == 400
+
+        # Idle keep-alive connections do not hold up a new reader
+        idle = [socket.create_connection(("127.0.0.1", port)) for _ in range(32)]
+        try:
+            started = time.perf_counter()
+            assert fetch(port, "/plays")[0].status == 200
+            assert time.perf_counter() - started < 1
+        finally:
+            for connection in idle:
+                connection.close()
+
+        # Many readers at once all get the same bytes
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            bodies = list(pool.map(lambda _: fetch(port, f"/plays/{PLAY_ID}/acts/3/scenes/2")[1], range(64)))
+        assert len(set(bodies)) == 1
+        print(f"✓ 64 concurrent fetches of {len(bodies[0])} bytes")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+if __name__ == "__main__":
+    test_api()
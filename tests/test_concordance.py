@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Test the KWIC concordance engine."""
+
+from pathlib import Path
+
+from concordance import Concordance
+from parser import TEIParser
+
+def test_concordance():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    tokens = play.tokens
+    concordance = Concordance(tokens)
+    
+    print("=== Concordance Test ===")
+    
+    # Every n1 noun with lemma "nature", in document order
+    lines = concordance.kwic(lemma="nature", pos="n1", width=4)
+    assert lines
+    for line in lines:
+        token = tokens.token(line.position)
+        assert (token.lemma, token.pos) == ("nature", "n1")
+        assert line.keyword == token.form
+        assert line.ref == token.line and line.speaker == token.speaker
+        assert len(line.left.split()) <= 4 and len(line.right.split()) <= 4
+    assert [line.position for line in lines] == sorted(line.position for line in lines)
+    print(f"✓ nature/n1: {len(lines)} lines")
+    for line in lines[:3]:
+        print(f"  {line.ref:>8}  {line.left:>30} [{line.keyword}] {line.right}")
+    
+    # Context comes from the keyword's own speech
+    first = lines[0]
+    start, end = next((s, e) for s, e in zip(tokens.speech_start.tolist(), tokens.speech_end.tolist())
+                      if s <= first.position < e)
+    assert first.left == " ".join(tokens.forms(max(start, first.position - 4), first.position))
+    assert first.right == " ".join(tokens.forms(first.position + 1, min(end, first.position + 5)))
+    
+    # Sorting by right context orders on the following word, case-insensitively
+    by_right = concordance.kwic(lemma="nature", pos="n1", width=4, sort="right")
+    assert sorted(l.position for l in by_right) == sorted(l.position for l in lines)
+    followers = [line.right.split()[0].lower() if line.right else "" for line in by_right]
+    assert followers == sorted(followers)
+    
+    # Sorting by left context orders on the nearest preceding word
+    by_left = concordance.kwic(lemma="nature", pos="n1", width=4, sort="left")
+    preceding = [line.left.split()[-1].lower() if line.left else "" for line in by_left]
+    assert preceding == sorted(preceding)
+    print("✓ Left and right sorting")
+    
+    # Prefix POS matching, limits and empty queries
+    nouns = concordance.positions(pos="n*")
+    assert len(nouns) > len(concordance.positions(pos="n1"))
+    assert len(concordance.kwic(pos="n*", limit=10)) == 10
+    assert concordance.kwic(lemma="nosuchlemma") == []
+    assert concordance.kwic() == []
+    try:
+        concordance.kwic(lemma="nature", sort="middle")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+
+if __name__ == "__main__":
+    test_concordance()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""Test packing scene content into a single text buffer."""
+
+import copy
+import pickle
+import tempfile
+from pathlib import Path
+
+import snapshot
+from contentstore import ContentStore, ContentView, pack_play
+from parser import TEIParser
+
+XML_PATH = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+
+def test_pack_play_keeps_content():
+    play = TEIParser(XML_PATH).parse()
+    packed = copy.deepcopy(play)
+    store = pack_play(packed)
+    
+    print("=== Content Store Test ===")
+    assert packed == play and play == packed
+    assert len(store) == sum(len(scene.content) for act in play.acts for scene in act.scenes)
+    print(f"✓ {len(store)} items in {store.nbytes:,} bytes")
+    
+    scene = packed.get_act("3").get_scene("7")
+    original = play.get_act("3").get_scene("7")
+    assert isinstance(scene.content, ContentView)
+    assert scene.content[0] == original.content[0]
+    assert scene.content[-1] == original.content[-1]
+    assert scene.content[10:20] == original.content[10:20]
+    assert list(scene.content[::7]) == original.content[::7]
+    assert scene.get_formatted_content() == original.get_formatted_content()
+    print("✓ Views index, slice and format like lists")
+    
+    # Pickles with and without out-of-band buffers
+    for protocol in (4, 5):
+        assert pickle.loads(pickle.dumps(packed, protocol=protocol)) == play
+    print("✓ Packed play pickles")
+
+def test_store_round_trips_unicode_and_types():
+    contents = [[{"type": "speaker", "text": "Lear"}, {"type": "line", "text": "O, reason not the need! — ’tis"}],
+                [],
+                [{"type": "note", "text": "é"}]]
+    store = ContentStore.from_scenes(contents)
+    assert [list(store.scene(i)) for i in range(3)] == contents
+    assert store.scene(1) == [] and len(store.scene(2)) == 1
+
+def test_snapshot_maps_text_buffer():
+    play = TEIParser(XML_PATH).parse()
+    with tempfile.TemporaryDirectory() as tmp:
+        loaded = snapshot.load_play(XML_PATH, Path(tmp))
+        assert isinstance(loaded.acts[0].scenes[0].content, ContentView)
+        
+        mapped = snapshot.read_snapshot(XML_PATH, Path(tmp))
+        assert mapped == play
+        store = mapped.acts[0].scenes[0].content.store
+        assert isinstance(store.text, memoryview)
+        print("✓ Snapshot text read through mmap")
+
+if __name__ == "__main__":
+    test_pack_play_keeps_content()
+    test_store_round_trips_unicode_and_types()
+    test_snapshot_maps_text_buffer()
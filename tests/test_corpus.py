@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Test loading a directory of plays in parallel."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from corpus import Corpus, find_tei_files
+from parser import TEIParser
+
+def test_corpus_loads_plays_in_parallel():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    
+    print("=== Corpus Test ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        shutil.copy(xml_path, tmp / "lear-a.xml")
+        shutil.copy(xml_path, tmp / "lear-b.xml")
+        (tmp / "notes.xml").write_text("<notes>not a play</notes>")
+        (tmp / "broken.xml").write_text('<TEI xmlns="http://www.tei-c.org/ns/1.0"><text>')
+        
+        # Only TEI files are picked up
+        files = find_tei_files(tmp)
+        assert [f.name for f in files] == ["broken.xml", "lear-a.xml", "lear-b.xml"]
+        print(f"✓ Found {len(files)} TEI files")
+        
+        corpus = Corpus.load(tmp, max_workers=2, use_snapshots=False)
+        print(corpus.report())
+        
+        # Both plays come back from the workers intact
+        assert len(corpus) == 2
+        assert corpus.get("lear-a") == play
+        assert corpus.get("lear-b") == play
+        assert corpus.get("lear-a").locate("1.1.1") is not None
+        assert len(corpus.get("lear-b").tokens) == len(play.tokens)
+        print("✓ Plays parsed in worker processes match a direct parse")
+        
+        # A bad file is reported rather than failing the load
+        assert [r.path.name for r in corpus.failures] == ["broken.xml"]
+        # ElementTree raises ParseError, lxml XMLSyntaxError
+        assert "ParseError" in corpus.failures[0].error or "XMLSyntaxError" in corpus.failures[0].error
+        assert all(r.seconds >= 0 for r in corpus.results)
+        print("✓ Broken file reported as a failure")
+        
+        # With snapshots, workers write them and the parent maps them rather than copying
+        os.environ["CORDELIA_SNAPSHOT_DIR"] = str(tmp / "snapshots")
+        try:
+            mapped = Corpus.load(tmp, max_workers=2)
+        finally:
+            del os.environ["CORDELIA_SNAPSHOT_DIR"]
+        assert mapped.plays == corpus.plays
+        assert sorted(p.name for p in (tmp / "snapshots").iterdir()) == ["lear-a.snapshot", "lear-b.snapshot"]
+        assert all(isinstance(p.line_store.text, memoryview) for p in mapped)
+        print("✓ Snapshotted plays are memory-mapped")
+        
+        # In-process loading gives the same result
+        serial = Corpus.load(tmp, max_workers=1, use_snapshots=False)
+        assert serial.plays == corpus.plays
+        print("✓ Serial load matches")
+
+if __name__ == "__main__":
+    test_corpus_loads_plays_in_parallel()
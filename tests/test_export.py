@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Test the static Markdown, HTML and JSON export."""
+
+import json
+import tempfile
+from pathlib import Path
+
+import export
+from parser import TEIParser
+
+def test_export_shards_and_manifest():
+    play = TEIParser("data/king-lear_TEIsimple_FolgerShakespeare.xml").parse()
+    
+    print("=== Static Export Test ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        result = export.export_play(play, out_dir)
+        n_scenes = sum(len(act.scenes) for act in play.acts)
+        assert len(result.written) == 3 * n_scenes + 3 * len(play.acts) + 2
+        print(f"✓ Wrote {len(result.written)} shards")
+        
+        # Markdown shards match the app's formatting
+        act = play.get_act("3")
+        scene = act.get_scene("7")
+        markdown = (out_dir / "act-3" / "scene-7.md").read_text(encoding="utf-8")
+        assert scene.get_formatted_content() in markdown
+        assert (out_dir / "act-3.md").read_text(encoding="utf-8").startswith("# Act 3")
+        
+        page = (out_dir / "act-3" / "scene-7.html").read_text(encoding="utf-8")
+        assert "<strong>CORNWALL.</strong>" in page
+        assert "**" not in page
+        
+        data = json.loads((out_dir / "act-3" / "scene-7.json").read_text(encoding="utf-8"))
+        assert data["content"] == scene.content
+        print("✓ Markdown, HTML and JSON agree with the parsed scene")
+        
+        # The manifest hashes every shard
+        manifest = json.loads((out_dir / export.MANIFEST_NAME).read_text(encoding="utf-8"))
+        assert sorted(manifest["shards"]) == sorted(result.written)
+        
+        # Re-exporting skips every unchanged shard
+        again = export.export_play(play, out_dir)
+        assert again.written == [] and len(again.skipped) == len(result.written)
+        print("✓ Unchanged shards skipped on re-export")
+        
+        # A deleted shard is rewritten, a stale one removed
+        (out_dir / "act-1" / "scene-1.md").unlink()
+        (out_dir / "act-9.md").write_text("stale", encoding="utf-8")
+        shards = json.loads((out_dir / export.MANIFEST_NAME).read_text(encoding="utf-8"))
+        shards["shards"]["act-9.md"] = {"sha256": "0", "bytes": 5}
+        (out_dir / export.MANIFEST_NAME).write_text(json.dumps(shards), encoding="utf-8")
+        repaired = export.export_play(play, out_dir)
+        assert repaired.written == ["act-1/scene-1.md"]
+        assert repaired.removed == ["act-9.md"] and not (out_dir / "act-9.md").exists()
+        print("✓ Missing shards rewritten, stale shards removed")
+
+def test_markdown_to_html():
+    html = export.markdown_to_html("# Act 1\n\n**KENT.**\n\n*Enter Lear*\n\nA & B\n\n---")
+    assert html == ("<h1>Act 1</h1>\n<p><strong>KENT.</strong></p>\n<p><em>Enter Lear</em></p>\n"
+                    "<p>A &amp; B</p>\n<hr>")
+
+if __name__ == "__main__":
+    test_export_shards_and_manifest()
+    test_markdown_to_html()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Test scoped word, lemma and n-gram frequencies."""
+
+from collections import Counter
+from pathlib import Path
+
+from frequency import FrequencyEngine
+from parser import TEIParser
+
+def test_frequency():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    tokens = play.tokens
+    engine = FrequencyEngine(tokens)
+
+    print("=== Frequency Test ===")
+
+    # Spoken lemmas of Act 3, counted by hand
+    expected = Counter(
+        token.lemma for token in map(tokens.token, range(len(tokens)))
+        if token.act == "3" and token.speaker and token.lemma
+    )
+    table = engine.counts("lemma", act_number="3")
+    assert dict(table.top()) == dict(expected)
+    assert table.total == sum(expected.values())
+    assert [count for _, count in table.top()] == sorted(expected.values(), reverse=True)
+    print(f"✓ Act 3 top lemmas: {table.top(5)}")
+
+    # Case-folded bigrams of Edmund's speeches stay within a speech
+    expected = Counter()
+    for start, end, who in zip(tokens.speech_start.tolist(), tokens.speech_end.tolist(),
+                               tokens.speech_speaker.tolist()):
+        if "#Edmund_Lr" not in (tokens.strings[who] or "").split():
+            continue
+        words = [token.form.lower() for token in map(tokens.token, range(start, end)) if token.speaker]
+        expected.update(" ".join(pair) for pair in zip(words, words[1:]))
+    bigrams = engine.counts("form", n=2, speaker="Edmund_Lr")
+    assert dict(bigrams.top()) == dict(expected)
+    text, count = bigrams.top(1)[0]
+    assert bigrams.count(*text.split()) == count and bigrams.count("no", "such", "words") == 0
+    print(f"✓ Edmund's top bigrams: {bigrams.top(3)}")
+
+    # A scene is part of its act, and results are memoized per scope
+    scene = engine.counts("lemma", act_number="1", scene_number="1")
+    act = engine.counts("lemma", act_number="1")
+    assert 0 < scene.total < act.total
+    assert engine.counts("lemma", act_number="1") is act
+    assert engine.counts("lemma", n=3).total > 0 and engine.counts("form", act_number="9").total == 0
+    assert len(engine) == 6
+
+if __name__ == "__main__":
+    test_frequency()
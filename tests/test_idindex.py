@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""Test the xml:id index linking speeches and stage directions to characters."""
+
+import pickle
+from pathlib import Path
+
+from idindex import IdIndexBuilder, Speech, StageDirection
+from parser import Character, TEIParser, Location
+
+def test_id_builder():
+    builder = IdIndexBuilder()
+    builder.begin_scene("1", "1")
+    builder.direction("stg-0000", "entrance", "#A #B", 0)
+    builder.offset("stg-0000", 0)
+    builder.begin_speech("sp-0001", "#A")
+    builder.direction("stg-0001", "exit", "#B", 1)
+    builder.end_speech(1)
+    builder.offset("sp-0001", 1)
+    builder.begin_speech("sp-0002", "#A #C")
+    builder.end_speech(2)
+    ids = builder.build()
+
+    assert ids.get("#sp-0001") == Speech("sp-0001", 0, "1", "1", ("A",), 1, 1)
+    assert ids.get("sp-0002").offset == -1
+    assert ids.get("stg-0001") == StageDirection("stg-0001", 1, "1", "1", "exit", ("B",), 1, -1, speech=0)
+    assert [s.id for s in ids.speeches_by("#A")] == ["sp-0001", "sp-0002"]
+    assert [d.id for d in ids.directions_for("B")] == ["stg-0000", "stg-0001"]
+    assert ids.speeches_by("Nobody") == [] and ids.get("sp-9999") is None
+
+    restored = pickle.loads(pickle.dumps(ids))
+    assert restored.speeches == ids.speeches and restored.speeches_by("C") == ids.speeches_by("C")
+
+def test_id_index():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    ids = play.ids
+
+    print("=== Id Index Test ===")
+    print(f"Speeches: {len(ids.speeches)} | Stage directions: {len(ids.directions)}")
+
+    # Speeches are numbered like the token store's speech arrays
+    assert len(ids.speeches) == len(play.tokens.speech_start)
+
+    kent = play.resolve("#Kent_Lr")
+    assert isinstance(kent, Character) and kent is play.character("Kent_Lr")
+    speech = play.resolve("sp-0001")
+    assert play.speakers(speech) == [kent]
+
+    # Every speech of Gloucester starts at his speaker label, without string matching
+    speeches = play.speeches_by("Gloucester_Lr")
+    assert speeches and speeches == play.speeches_by(play.character("#Gloucester_Lr"))
+    for speech in speeches:
+        scene = play.get_act(speech.act_number).get_scene(speech.scene_number)
+        assert scene.content[speech.offset] == {"type": "speaker", "text": "GLOUCESTER"}
+    print(f"✓ Gloucester speaks {len(speeches)} times")
+
+    opening = play.resolve("stg-0000")
+    assert opening.kind == "entrance" and opening.offset == 0
+    assert [c.id for c in play.speakers(opening)] == ["Kent_Lr", "Gloucester_Lr", "Edmund_Lr"]
+
+    assert isinstance(play.resolve("ftln-0034"), Location)
+    token = play.resolve("fs-lr-0000260")
+    assert token.xml_id == "fs-lr-0000260"
+    assert play.resolve("#Nobody_Lr") is None and play.resolve("fs-lr-9999999") is None
+
+if __name__ == "__main__":
+    test_id_builder()
+    test_id_index()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Test lazy scene materialization."""
+
+import pickle
+from pathlib import Path
+from parser import TEIParser
+
+def test_lazy_scenes():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    skeleton = TEIParser(xml_path).parse_lazy()
+    
+    print("=== Lazy Scene Test ===")
+    print(f"Outline: {skeleton.get_act_count()} acts, {skeleton.get_total_scenes()} scenes")
+    
+    # The outline matches the full parse without loading any scene
+    assert skeleton.title == play.title
+    assert skeleton.characters == play.characters
+    for act, lazy_act in zip(play.acts, skeleton.acts):
+        assert lazy_act.number == act.number
+        assert [s.number for s in lazy_act.scenes] == [s.number for s in act.scenes]
+        assert [s.title for s in lazy_act.scenes] == [s.title for s in act.scenes]
+    assert not any(s.is_loaded() for act in skeleton.acts for s in act.scenes)
+    print("✓ Skeleton built without parsing scene content")
+    
+    # Accessing content parses only that scene, once
+    scene = skeleton.get_act("3").get_scene("2")
+    content = scene.content
+    assert scene.is_loaded()
+    assert scene.content is content
+    assert content == play.get_act("3").get_scene("2").content
+    assert sum(s.is_loaded() for act in skeleton.acts for s in act.scenes) == 1
+    print(f"✓ {scene.title} loaded on demand: {len(content)} items")
+    
+    # Unloaded scenes survive pickling and load afterwards
+    restored = pickle.loads(pickle.dumps(skeleton))
+    assert not restored.get_act("1").get_scene("1").is_loaded()
+    assert restored == play
+    print("✓ Pickled skeleton loads to the same play")
+
+if __name__ == "__main__":
+    test_lazy_scenes()
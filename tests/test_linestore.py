@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Test the per-line store of the play's spoken text."""
+
+import pickle
+from pathlib import Path
+
+from linestore import LineStoreBuilder
+from parser import TEIParser
+
+def test_line_store_builder():
+    builder = LineStoreBuilder()
+    builder.begin_scene("1", "1")
+    builder.begin_speech("#A")
+    builder.add(1, "1.1.1", "prose", "First line of prose")
+    builder.add(2, "1.1.2", "prose", "and its second.")
+    builder.end_speech()
+    builder.begin_speech("#B")
+    builder.add(3, "1.1.3", "verse", "A line of verse—")
+    builder.end_speech()
+    builder.end_scene()
+    builder.begin_scene("1", "2")
+    builder.begin_speech("#A")
+    builder.add(4, "Prologue.1", "verse", "Odd reference")
+    builder.end_speech()
+    builder.end_scene()
+    store = builder.build()
+
+    assert len(store) == 4
+    assert store[2].text == "A line of verse—" and store[2].speaker == "#B" and store[2].kind == "verse"
+    assert store[-1].ref == "Prologue.1" and store[-1].speech == 2
+    assert [line.ftln for line in store[slice(*store.span(2, 3))]] == [2, 3]
+    assert store.scene_span("1", "2") == (3, 4) and store.scene_span("9", "9") == (0, 0)
+    assert store.position(3) == 2 and store.position(99) == -1
+
+    restored = pickle.loads(pickle.dumps(store, protocol=5))
+    assert restored[:] == store[:] and restored.scene_lines("1", "1") == store.scene_lines("1", "1")
+
+def test_line_store():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    store = play.line_store
+
+    print("=== Line Store Test ===")
+    print(f"Lines: {len(store):,} | {store.nbytes:,} bytes")
+
+    # One prose paragraph split at its <lb> lines
+    first, second = play.line_range("1.1.1", "1.1.2")
+    assert first.text == "I thought the King had more affected the Duke"
+    assert second.text == "of Albany than Cornwall." and second.ftln == 2
+    assert first.kind == "prose" and first.speaker == "#Kent_Lr"
+    scene = play.get_act("1").get_scene("1")
+    assert f"{first.text} {second.text}" == scene.content[2]["text"]
+    assert play.ids.speeches[first.speech].id == "sp-0001"
+
+    line = play.line("3.2.1")
+    assert line.kind == "verse" and line.text.startswith("Blow winds")
+    assert play.line(f"ftln-{line.ftln:04d}") == line
+    assert play.line("9.9.9") is None and play.line_range("1.1.1", "9.9.9") == []
+
+    # Lines are in FTLN order and every line of a scene lies within its span
+    assert list(store.ftlns) == sorted(store.ftlns)
+    for act in play.acts:
+        for scene in act.scenes:
+            assert all((line.act, line.scene) == (act.number, scene.number)
+                       for line in store.scene_lines(act.number, scene.number))
+    print(f"✓ 3.2.1: {line.text}")
+
+if __name__ == "__main__":
+    test_line_store_builder()
+    test_line_store()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Test act/scene indexes and line reference lookup."""
+
+import pickle
+from pathlib import Path
+from parser import TEIParser
+
+def test_locate():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    
+    print("=== Locate Test ===")
+    print(f"Indexed lines: {len(play.lines):,} | References: {len(play.lines.refs):,}")
+    
+    # Dictionary lookups return the same objects as the act and scene lists
+    for act in play.acts:
+        assert play.get_act(act.number) is act
+        for scene in act.scenes:
+            assert act.get_scene(scene.number) is scene
+    assert play.get_act("9") is None
+    assert play.get_act("1").get_scene("99") is None
+    
+    # act.scene.line references
+    location = play.locate("1.1.1")
+    assert (location.act.number, location.scene.number, location.ftln) == ("1", "1", 1)
+    assert location.scene.content[location.offset]["text"].startswith("I thought the King")
+    
+    location = play.locate("3.2.15")
+    print(f"✓ 3.2.15 -> {location.scene.title}, item {location.offset}: {location.scene.content[location.offset]['text'][:50]}")
+    assert (location.act.number, location.scene.number) == ("3", "2")
+    assert location.ref == "3.2.15"
+    
+    # FTLN ids resolve to the same place as their reference
+    by_ftln = play.locate(f"ftln-{location.ftln:04d}")
+    assert by_ftln == location
+    
+    # A prose line in the middle of a <p> resolves to that paragraph
+    location = play.locate("1.1.5")
+    assert location.scene.content[location.offset]["text"].startswith("It did always seem so")
+    
+    # Unknown references
+    for ref in ("9.9.9", "ftln-99999", "ftln-abc", "nonsense"):
+        assert play.locate(ref) is None, ref
+    
+    # Indexes survive a snapshot round trip
+    restored = pickle.loads(pickle.dumps(play))
+    assert restored.locate("3.2.15").ftln == play.locate("3.2.15").ftln
+    assert restored.get_act("2").get_scene("3").title == "Act 2, Scene 3"
+    print("✓ Indexes survive pickling")
+
+if __name__ == "__main__":
+    test_locate()
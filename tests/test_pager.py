@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Test the windowed pages of the play and act views."""
+
+from pathlib import Path
+from pager import PlayPager
+from parser import TEIParser
+
+def test_play_pager():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    
+    print("=== Pager Test ===")
+    pager = PlayPager(play, page_size=50)
+    total = sum(len(scene.content) for act in play.acts for scene in act.scenes)
+    assert pager.total == total
+    assert len(pager) == -(-total // 50)
+    
+    # Pages tile the play with no gaps or overlaps
+    assert pager.pages[0].start == 0
+    assert pager.pages[-1].end == total
+    assert all(a.end == b.start for a, b in zip(pager.pages, pager.pages[1:]))
+    print(f"✓ {total} items in {len(pager)} pages")
+    
+    # Pages are labelled by their line range
+    assert pager.pages[0].label.startswith("1.1.1 – ")
+    assert pager.pages[-1].label.endswith("5.3.395")
+    print(f"✓ Page 1: {pager.pages[0].label}")
+    
+    # The first page opens the play; later pages continue their scene
+    first = pager.render(1)
+    assert first.startswith("# Act 1\n\n---\n\n## Act 1, Scene 1\n\n*Enter Kent")
+    assert pager.render(2).startswith("## Act 1, Scene 1 (continued)")
+    assert pager.render(1) is first
+    
+    # Every item shows up exactly once across all pages
+    speakers = sum(1 for act in play.acts for scene in act.scenes for item in scene.content if item['type'] == 'speaker')
+    assert sum(pager.render(page.number).count(".**") for page in pager.pages) == speakers
+    assert max(len(pager.render(page.number)) for page in pager.pages) < len(play.get_act("1").get_scene("1").get_formatted_content())
+    print("✓ Page Markdown is bounded by the page size")
+    
+    # Lines and scenes map to the page that holds them
+    location = play.locate("3.2.15")
+    number = pager.page_for_line("3.2.15")
+    assert location.scene.content[location.offset]['text'] in pager.render(number)
+    assert pager.page_for("1", "1") == 1
+    assert pager.page_for_line("9.9.9") is None
+    print(f"✓ Line 3.2.15 is on page {number}")
+    
+    # An act pager covers only that act and ends with the scene divider
+    act_pager = PlayPager(play, act_number="3", page_size=50)
+    assert act_pager.total == sum(len(scene.content) for scene in play.get_act("3").scenes)
+    assert act_pager.render(1).startswith("## Act 3, Scene 1")
+    assert act_pager.render(len(act_pager)).endswith("---")
+    assert act_pager.page_for_line("1.1.1") is None
+    print(f"✓ Act 3: {len(act_pager)} pages")
+
+if __name__ == "__main__":
+    test_play_pager()
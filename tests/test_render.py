@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""Test the cached Markdown rendering layer."""
+
+from concurrent.futures import wait
+from pathlib import Path
+from parser import TEIParser
+from render import PlayRenderer, format_content
+
+def test_play_renderer():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    parser = TEIParser(xml_path)
+    play = parser.parse()
+    renderer = PlayRenderer(play)
+    
+    print("=== Renderer Test ===")
+    
+    # Scene Markdown matches the Scene and parser formatting helpers
+    scene = play.get_act("1").get_scene("1")
+    markdown = renderer.scene("1", "1")
+    assert markdown == scene.get_formatted_content() == parser._format_scene_content(scene.content)
+    assert markdown.startswith("*Enter Kent")
+    assert "**KENT.**" in markdown
+    print(f"✓ Scene 1.1: {len(markdown):,} characters")
+    
+    # Results are cached: the same string object comes back
+    assert renderer.scene("1", "1") is markdown
+    act_markdown = renderer.act("1")
+    assert renderer.act("1") is act_markdown
+    assert act_markdown.startswith("## Act 1, Scene 1")
+    assert act_markdown.count("---") >= play.get_act("1").get_scene_count()
+    
+    full = renderer.full_play()
+    assert full.startswith("# Act 1\n\n---\n\n## Act 1, Scene 1")
+    for act in play.acts:
+        for scene in act.scenes:
+            assert renderer.scene(act.number, scene.number) in full
+    print(f"✓ Full play: {len(full):,} characters")
+    
+    # Missing acts and scenes render as None
+    assert renderer.act("9") is None
+    assert renderer.scene("1", "99") is None
+    
+    # Invalidation drops cached Markdown and switches plays
+    reloaded = TEIParser(xml_path).parse()
+    renderer.invalidate(reloaded)
+    assert renderer.play is reloaded
+    assert renderer.scene("1", "1") is not markdown
+    assert renderer.scene("1", "1") == markdown
+    print("✓ Invalidation re-renders from the reloaded play")
+    
+    # Unknown item types only contribute spacing
+    assert format_content([{"type": "note", "text": "x"}, {"type": "line", "text": "Hi"}]) == "Hi"
+
+def test_prefetch_and_lru():
+    play = TEIParser(Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")).parse()
+    renderer = PlayRenderer(play, max_entries=4)
+    
+    print("=== Prefetch Test ===")
+    # Neighbours cross act boundaries, next scene first
+    assert renderer.neighbours("2", "3") == [("2", "4"), ("2", "2")]
+    assert renderer.neighbours("1", "5") == [("2", "1"), ("1", "4")]
+    assert renderer.neighbours("1", "1") == [("1", "2")]
+    assert renderer.neighbours("9", "1") == []
+    
+    renderer.scene("2", "3")
+    futures = renderer.prefetch("2", "3")
+    assert len(futures) == 2
+    wait(futures)
+    assert all(future.exception() is None for future in futures)
+    assert len(renderer) == 3
+    assert renderer.prefetch("2", "3") == []
+    print("✓ Neighbouring scenes rendered in the background")
+    
+    # The cache holds at most max_entries, dropping the least recently used
+    renderer = PlayRenderer(play, max_entries=2)
+    renderer.scene("1", "1")
+    renderer.scene("1", "2")
+    renderer.scene("1", "1")
+    renderer.scene("1", "3")
+    assert len(renderer) == 2
+    assert ('scene', '1', '2') not in renderer._cache
+    assert ('scene', '1', '1') in renderer._cache
+    print("✓ LRU keeps the cache bounded")
+
+if __name__ == "__main__":
+    test_play_renderer()
+    test_prefetch_and_lru()
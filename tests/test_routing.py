@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Test URL routing and callback navigation in the app."""
+
+from pathlib import Path
+
+from streamlit.testing.v1 import AppTest
+
+from pager import PlayPager
+from parser import TEIParser
+
+APP_PATH = str(Path(__file__).parent.parent / "app.py")
+
+def test_deep_link_and_navigation():
+    print("=== Routing Test ===")
+    app = AppTest.from_file(APP_PATH, default_timeout=120)
+    app.query_params["view"] = "scene"
+    app.query_params["act"] = "3"
+    app.query_params["scene"] = "7"
+    app.run()
+    assert not app.exception
+    assert app.session_state.current_view == "scene"
+    assert any(header.value == "Act 3, Scene 7" for header in app.subheader)
+    print("✓ ?view=scene&act=3&scene=7 opens Act 3, Scene 7")
+    
+    # Acts and scenes are links to their routes; the open act is the current one
+    links = next(md.value for md in app.sidebar.markdown if md.value.startswith('<nav class="act-scene-links">'))
+    assert 'href="?play=king-lear_TEIsimple_FolgerShakespeare&view=act&act=2"' in links
+    assert "<details open><summary>📁 Act 3</summary>" in links
+    
+    # One click on a view button switches views without an extra st.rerun()
+    app.button(key="characters").click().run()
+    assert not app.exception
+    assert app.session_state.current_view == "characters"
+    assert any(header.value == "Characters" for header in app.subheader)
+    print("✓ View button navigates through its callback")
+    
+    app.button(key="home").click().run()
+    assert app.session_state.current_view == "home"
+    print("✓ Home button returns home")
+    
+    # Navigating away from a linked line drops it from the URL
+    app.query_params["line"] = "3.2.15"
+    app.run()
+    assert app.session_state.current_line == "3.2.15" and app.session_state.current_view == "scene"
+    app.button(key="home").click().run()
+    assert "line" not in app.query_params and app.session_state.current_line is None
+    print("✓ Navigating drops a stale ?line=")
+    
+    # The paged views jump to the page holding a line
+    app.button(key="entire_play").click().run()
+    app.text_input(key="page_full_line").input("3.2.15").run()
+    assert not app.exception
+    play = TEIParser(Path(__file__).parent.parent / "data" / "king-lear_TEIsimple_FolgerShakespeare.xml").parse()
+    assert app.session_state.page_full == PlayPager(play).page_for_line("3.2.15")
+    app.text_input(key="page_full_line").input("9.9.9").run()
+    assert any("9.9.9" in warning.value for warning in app.warning)
+    print(f"✓ Jump to line 3.2.15 opens page {PlayPager(play).page_for_line('3.2.15')}")
+
+if __name__ == "__main__":
+    test_deep_link_and_navigation()
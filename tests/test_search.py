@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""Test the inverted word and lemma search index."""
+
+from pathlib import Path
+
+import numpy as np
+from parser import TEIParser
+from search import SearchIndex
+
+def test_search_index():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    index = SearchIndex(play.tokens)
+    tokens = play.tokens
+    
+    print("=== Search Index Test ===")
+    print(f"Form terms: {len(index.forms.terms):,} | Lemma terms: {len(index.lemmas.terms):,}")
+    
+    # Single words match case-insensitively, in document order
+    total, hits = index.search("Nothing")
+    forms = [form.lower() if form else form for form in tokens.forms()]
+    assert total == forms.count("nothing")
+    assert [hit.position for hit in hits] == sorted(hit.position for hit in hits)
+    assert all(tokens.token(hit.position).form.lower() == "nothing" for hit in hits)
+    print(f"✓ 'nothing': {total} matches, first at {hits[0].ref} ({hits[0].speaker})")
+    
+    # Phrases match consecutive words and report act.scene.line
+    total, hits = index.search("Nothing will come of nothing")
+    assert total == 1
+    assert (hits[0].ref, hits[0].speaker, hits[0].length) == ("1.1.99", "#Lear_Lr", 5)
+    left, match, right = index.snippet(hits[0])
+    assert match == "Nothing will come of nothing"
+    print(f"✓ Phrase found at {hits[0].ref}: {match}")
+    
+    # A phrase never runs from the end of a speech into the stage direction after it
+    assert index.search("coming Enter") == (0, [])
+    assert index.search("Enter Kent")[0] > 0
+    
+    # Lemma queries match every form annotated with that lemma
+    total, hits = index.search("be", lemma=True)
+    lemma_code = tokens.strings.code("be")
+    assert total == int(np.count_nonzero(tokens.lemma == lemma_code))
+    surface = {tokens.token(hit.position).form.lower() for hit in hits}
+    assert {"be", "is", "are", "was"} <= surface
+    print(f"✓ Lemma 'be': {total} matches in {len(surface)} forms")
+    
+    # A lemma query typed as an inflected form uses that form's lemma
+    assert index.search("is", lemma=True)[0] == total
+    
+    # Limits cap the hits but not the total; unknown words find nothing
+    total, hits = index.search("the", limit=5)
+    assert total > 5 and len(hits) == 5
+    assert index.search("zzzz") == (0, [])
+    assert index.search("") == (0, [])
+
+if __name__ == "__main__":
+    test_search_index()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Test persistent Play snapshots."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import snapshot
+from parser import TEIParser
+
+def test_snapshot_round_trip_and_staleness():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    
+    print("=== Snapshot Test ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        source = tmp / xml_path.name
+        shutil.copy2(xml_path, source)
+        snapshot_dir = tmp / "snapshots"
+        
+        # No snapshot yet: load_play parses and writes one
+        assert snapshot.read_snapshot(source, snapshot_dir) is None
+        loaded = snapshot.load_play(source, snapshot_dir)
+        path = snapshot.snapshot_path(source, snapshot_dir)
+        assert path.exists()
+        assert loaded == play
+        print(f"✓ Snapshot written: {path.name} ({path.stat().st_size:,} bytes)")
+        
+        # Fresh snapshot is read back without parsing
+        assert snapshot.read_snapshot(source, snapshot_dir) == play
+        header = snapshot.read_header(path)
+        print(f"✓ Header: parser v{header['parser_version']}, sha256 {header['source_sha256'][:12]}…")
+        
+        # Touching the source makes the snapshot stale
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        assert snapshot.read_snapshot(source, snapshot_dir) is None
+        print("✓ Modified source invalidates snapshot")
+        
+        # load_play rebuilds it
+        assert snapshot.load_play(source, snapshot_dir) == play
+        assert snapshot.read_snapshot(source, snapshot_dir) == play
+        
+        # A snapshot from another parser version is ignored
+        original_version = snapshot.PARSER_VERSION
+        snapshot.PARSER_VERSION = original_version + 1
+        try:
+            assert snapshot.read_snapshot(source, snapshot_dir) is None
+        finally:
+            snapshot.PARSER_VERSION = original_version
+        print("✓ Parser version change invalidates snapshot")
+        
+        # Corrupt files are treated as missing
+        path.write_bytes(b"not a snapshot")
+        assert snapshot.read_snapshot(source, snapshot_dir) is None
+        print("✓ Corrupt snapshot ignored")
+
+if __name__ == "__main__":
+    test_snapshot_round_trip_and_staleness()
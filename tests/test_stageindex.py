@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Test the on-stage interval index built from entrances and exits."""
+
+from pathlib import Path
+
+import numpy as np
+from parser import TEIParser
+from stageindex import StageIndexBuilder
+
+def test_stage_builder():
+    builder = StageIndexBuilder()
+    builder.begin_scene("1", "1")
+    builder.direction("entrance", "#A #B", 0)      # on from line 1
+    builder.line(1)
+    builder.line(2)
+    builder.direction("exit", "#B", 2)             # off after line 2
+    builder.direction("sound", "#A", 2)            # moves nobody
+    builder.speak("#C", 2)                         # enters with the speech
+    builder.line(3)
+    builder.end_scene()
+    builder.begin_scene("1", "2")
+    builder.direction("entrance", "#B", 0)
+    builder.line(4)
+    builder.line(5)
+    builder.end_scene()
+    stage = builder.build()
+    
+    assert stage.at(1) == ["A", "B"] and stage.at(3) == ["A", "C"] and stage.at(4) == ["B"]
+    assert stage.at(0) == [] and stage.at(6) == []
+    assert stage.spans("A") == [(1, 4)]
+    assert stage.spans("#A", "B") == [(1, 3)]
+    assert stage.spans("B") == [(1, 3), (4, 6)]
+    assert stage.spans("A", "Nobody") == []
+    assert stage.scene_of(3) == ("1", "1") and stage.scene_of(4) == ("1", "2")
+    assert stage.scene_lines().tolist() == [[3, 0], [2, 2], [1, 0]]
+    assert stage.at_many([1, 3, 9]).tolist() == [[True, True, False], [True, False, True], [False, False, False]]
+
+def test_stage_index():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    stage = play.stage
+    
+    print("=== Stage Index Test ===")
+    print(f"Characters: {len(stage)} | Segments: {len(stage.presence)}")
+    
+    assert play.on_stage("1.1.1") == ["Kent_Lr", "Gloucester_Lr", "Edmund_Lr"]
+    assert set(play.on_stage("1.1.34")) >= {"Lear_Lr", "Cordelia_Lr", "Goneril_Lr", "Regan_Lr", "Kent_Lr"}
+    # "He exits." after 1.1.36
+    assert "Gloucester_Lr" in play.on_stage("1.1.36")
+    assert "Gloucester_Lr" not in play.on_stage("1.1.37")
+    assert {"Cornwall_Lr", "Regan_Lr", "Gloucester_Lr"} <= set(play.on_stage("3.7.40"))
+    assert play.on_stage("9.9.9") is None
+    print(f"✓ On stage at 3.7.40: {', '.join(play.on_stage('3.7.40'))}")
+    
+    # Every spoken word's speaker is on stage at its line
+    tokens = play.tokens
+    spoken = np.flatnonzero((tokens.speaker != -1) & (tokens.ftln > 0))
+    present = stage.at_many(tokens.ftln[spoken])
+    for row, who in zip(range(len(spoken)), tokens.strings.decode(tokens.speaker[spoken])):
+        for ref in who.split():
+            assert present[row, stage.column(ref)], (ref, int(tokens.ftln[spoken[row]]))
+    print(f"✓ {len(spoken):,} spoken words have their speaker on stage")
+    
+    # Lear and Cordelia share the stage from their entrance in 1.1 until she leaves
+    spans = stage.spans("Lear_Lr", "Cordelia_Lr")
+    assert spans[0][0] == play.lines.ftln_for("1.1.34")
+    assert [stage.scene_of(start) for start, _ in spans][-1] == ("5", "3")
+    for start, end in spans:
+        assert stage.scene_of(start) == stage.scene_of(end - 1)
+        assert stage.at_many(range(start, end))[:, [stage.column("Lear_Lr"), stage.column("Cordelia_Lr")]].all()
+    print(f"✓ Lear and Cordelia share {len(spans)} spans")
+
+if __name__ == "__main__":
+    test_stage_builder()
+    test_stage_index()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""Test the per-character statistics engine."""
+
+from collections import Counter
+from pathlib import Path
+from parser import TEIParser
+from stats import CharacterStats
+
+def test_character_stats():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    tokens = play.tokens
+    stats = CharacterStats(tokens, play.characters)
+    
+    print("=== Character Stats Test ===")
+    assert stats.speeches.shape == (len(stats), play.get_total_scenes())
+    assert stats.names[stats.row("#Lear_Lr")] == "Lear"
+    assert stats.row("Nobody_Lr") == -1
+    
+    # Counts match a token-by-token walk, crediting every speaker of a joint speech
+    speeches, words, lines = Counter(), Counter(), set()
+    for start, who, scene in zip(tokens.speech_start.tolist(), tokens.strings.decode(tokens.speech_speaker),
+                                 tokens.speech_scene.tolist()):
+        for ref in (who or "").split():
+            speeches[ref.lstrip("#"), scene] += 1
+    for index in range(len(tokens)):
+        token = tokens.token(index)
+        if token.speaker is None:
+            continue
+        scene = tokens.scene_index(token.act, token.scene)
+        for ref in token.speaker.split():
+            words[ref.lstrip("#"), scene] += 1
+            if token.ftln:
+                lines.add((ref.lstrip("#"), scene, token.ftln))
+    lines = Counter((ref, scene) for ref, scene, _ in lines)
+    
+    for measure, expected in (("speeches", speeches), ("words", words), ("lines", lines)):
+        matrix = getattr(stats, measure)
+        actual = {(stats.ids[row], scene): int(matrix[row, scene]) for row, scene in zip(*matrix.nonzero())}
+        assert actual == dict(expected), measure
+    print(f"✓ {len(stats)} speakers x {len(stats.scene_keys)} scenes match a token walk")
+    
+    # Joint speeches count for each speaker
+    assert stats.speeches[stats.row("Albany_Lr")].sum() == speeches_for(tokens, "#Albany_Lr")
+    
+    # First and last appearances, and whole-play totals
+    lear = stats.row("Lear_Lr")
+    assert stats.scene_label(int(stats.first_scene[lear])) == "1.1"
+    assert stats.scene_label(int(stats.last_scene[lear])) == "5.3"
+    assert abs(stats.share().sum() - 1) < 1e-9
+    
+    # Tables are scoped to an act and sortable by any column
+    table = stats.table(sort_by="Lines")
+    assert table[0]["Character"] == "Lear"
+    assert [row["Lines"] for row in table] == sorted((row["Lines"] for row in table), reverse=True)
+    act3 = stats.table(act_number="3", sort_by="Words", descending=False)
+    assert [row["Words"] for row in act3] == sorted(row["Words"] for row in act3)
+    assert all(row["Speeches"] > 0 for row in act3)
+    assert "Cordelia" not in [row["Character"] for row in act3]
+    names = [row["Character"] for row in stats.table(sort_by="Character", descending=False)]
+    assert names == sorted(names, key=str.lower)
+    print(f"✓ Lear: {table[0]['Lines']} lines, {table[0]['Share']}% of the words")
+
+def speeches_for(tokens, ref: str) -> int:
+    """Count the speeches whose sp/@who includes ref."""
+    return sum(ref in (who or "").split() for who in tokens.strings.decode(tokens.speech_speaker))
+
+if __name__ == "__main__":
+    test_character_stats()
@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Test that the streaming parse mode matches the tree-based parse."""
+
+from pathlib import Path
+from parser import TEIParser
+
+def test_streaming_parse_matches_parse():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    streamed = TEIParser(xml_path).parse_streaming()
+    
+    print("=== Streaming Parse Test ===")
+    print(f"Title: {streamed.title}")
+    print(f"Acts: {streamed.get_act_count()} | Total scenes: {streamed.get_total_scenes()}")
+    print(f"Characters: {len(streamed.characters)}")
+    
+    assert streamed.title == play.title
+    assert streamed.characters == play.characters
+    assert [act.number for act in streamed.acts] == [act.number for act in play.acts]
+    for act, streamed_act in zip(play.acts, streamed.acts):
+        for scene, streamed_scene in zip(act.scenes, streamed_act.scenes):
+            assert streamed_scene == scene, scene.title
+    assert streamed == play
+    print("✓ Streaming parse matches parse()")
+
+if __name__ == "__main__":
+    test_streaming_parse_matches_parse()
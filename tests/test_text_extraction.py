@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Test the single-pass text extraction used for speeches, verse and stage directions."""
+
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from parser import TEIParser, _element_text
+
+TEI = "http://www.tei-c.org/ns/1.0"
+
+def test_element_text_spacing():
+    print("=== Text Extraction Test ===")
+    
+    # Only <c> separates tokens; <pc> attaches to the word before it
+    p = ET.fromstring(
+        f'<p xmlns="{TEI}">\n  <w>Is</w><c> </c><w>not</w><c> </c><w>this</w>\n'
+        f'  <pc>,</pc><c> </c><w>my</w><c> </c><w>lord</w><pc>?</pc>\n</p>'
+    )
+    assert _element_text(p) == "Is not this, my lord?"
+    
+    # A line break separates words unless it falls inside one
+    p = ET.fromstring(f'<p xmlns="{TEI}"><w>to</w><lb/><w>us</w><w>bro</w><lb break="no"/><w>ther</w></p>')
+    assert _element_text(p) == "to usbrother"
+    
+    # Untokenized text is kept and nested containers are word boundaries
+    item = ET.fromstring(f'<list xmlns="{TEI}"><item>marked in <gi>l</gi>, tags</item><item>All</item></list>')
+    assert _element_text(item) == "marked in l , tags All"
+    print("✓ Spacing follows <c>, <pc> and <lb>")
+
+def test_parsed_text_uses_tei_spacing():
+    play = TEIParser(Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")).parse()
+    content = play.get_act("1").get_scene("1").content
+    texts = [item["text"] for item in content]
+    
+    assert texts[0].startswith("Enter Kent, Gloucester, and Edmund.")
+    assert texts[2] == "I thought the King had more affected the Duke of Albany than Cornwall."
+    assert any("(Sennet.) The King is coming." in text for text in texts)
+    assert not any(" ," in text or " ." in text for text in texts)
+    print("✓ Scene 1.1 punctuation attaches to words")
+
+if __name__ == "__main__":
+    test_element_text_spacing()
+    test_parsed_text_uses_tei_spacing()
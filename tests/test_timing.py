@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""Test the timing spans behind CORDELIA_TIMING."""
+
+import importlib
+import os
+
+import timing
+
+def test_timing_spans():
+    print("=== Timing Test ===")
+    original = os.environ.get("CORDELIA_TIMING")
+    try:
+        # Off: spans are a shared no-op and decorated functions are untouched
+        os.environ.pop("CORDELIA_TIMING", None)
+        importlib.reload(timing)
+        def work(x):
+            return x * 2
+        assert timing.timed()(work) is work
+        assert timing.span("a") is timing.span("b")
+        timing.begin_run()
+        with timing.span("ignored"):
+            pass
+        assert timing.end_run() == []
+        print("✓ Disabled timing records nothing")
+        
+        # On: nested spans are collected for the run with their depth
+        os.environ["CORDELIA_TIMING"] = "panel"
+        importlib.reload(timing)
+        assert timing.ENABLED and timing.PANEL
+        traced = timing.timed("work")(work)
+        timing.begin_run()
+        with timing.span("outer"):
+            assert traced(21) == 42
+            assert traced(1) == 2
+        spans = timing.end_run()
+        assert [(s.name, s.depth) for s in spans] == [("work", 1), ("work", 1), ("outer", 0)]
+        assert spans[2].seconds >= spans[0].seconds + spans[1].seconds
+        rows = timing.summarize(spans)
+        assert [(row["span"], row["calls"]) for row in rows] == [("work", 2), ("outer", 1)]
+        assert timing.end_run() == []
+        print("✓ Enabled timing collects nested spans")
+    finally:
+        if original is None:
+            os.environ.pop("CORDELIA_TIMING", None)
+        else:
+            os.environ["CORDELIA_TIMING"] = original
+        importlib.reload(timing)
+
+if __name__ == "__main__":
+    test_timing_spans()
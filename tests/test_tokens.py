@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""Test the columnar token store built at parse time."""
+
+import pickle
+import xml.etree.ElementTree as ET
+from pathlib import Path
+
+import numpy as np
+from parser import TEIParser, TEI_NS
+
+def test_token_store():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    play = TEIParser(xml_path).parse()
+    tokens = play.tokens
+    
+    print("=== Token Store Test ===")
+    print(f"Tokens: {len(tokens):,} | Strings: {len(tokens.strings):,} | Columns: {tokens.nbytes:,} bytes")
+    
+    # Every <w> of the parsed scenes except scene heads and speaker labels
+    body = ET.parse(xml_path).getroot().find('.//tei:body', TEI_NS)
+    scene_divs = body.findall('./tei:div[@type="act"]/tei:div[@type="scene"]', TEI_NS)
+    words = sum(len(div.findall('.//tei:w', TEI_NS)) for div in scene_divs)
+    labels = sum(len(div.findall('./tei:head/tei:w', TEI_NS)) + len(div.findall('.//tei:speaker/tei:w', TEI_NS))
+                 for div in scene_divs)
+    assert len(tokens) == words - labels
+    
+    # Annotations survive: "I thought the King..." opens Kent's first speech
+    start, end = tokens.speech_ranges("1", "1")[0]
+    first = tokens.token(start)
+    print(f"First spoken token: {first}")
+    assert first.form == "I" and first.lemma == "i" and first.pos == "pns"
+    assert first.xml_id == "fs-lr-0000200" and first.line == "1.1.1" and first.ftln == 1
+    assert first.speaker == "#Kent_Lr"
+    assert " ".join(tokens.forms(start, end)).startswith("I thought the King had more affected")
+    king = tokens.token(start + 3)
+    assert (king.form, king.lemma, king.pos) == ("King", "king", "n1")
+    
+    # Stage direction words belong to no speaker
+    assert tokens.token(0).form == "Enter" and tokens.token(0).speaker is None
+    
+    # Scene ranges cover the whole store in order
+    assert tokens.scene_start[0] == 0 and tokens.scene_end[-1] == len(tokens)
+    assert np.array_equal(tokens.scene_start[1:], tokens.scene_end[:-1])
+    assert len(tokens.scene_keys) == play.get_total_scenes()
+    assert len(tokens.speech_start) == sum(
+        1 for act in play.acts for scene in act.scenes for item in scene.content if item["type"] == "speaker"
+    )
+    print(f"✓ {len(tokens.scene_keys)} scenes, {len(tokens.speech_start):,} speeches")
+    
+    # Streaming parse builds the same store; pickling keeps it intact
+    streamed = TEIParser(xml_path).parse_streaming().tokens
+    restored = pickle.loads(pickle.dumps(tokens))
+    for other in (streamed, restored):
+        assert other.strings.strings == tokens.strings.strings
+        for name in tokens.COLUMNS:
+            assert np.array_equal(getattr(other, name), getattr(tokens, name)), name
+    assert restored.strings.code("king") == tokens.strings.code("king")
+    print("✓ Streaming parse and pickle round trip preserve the store")
+
+if __name__ == "__main__":
+    test_token_store()
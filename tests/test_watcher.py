@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Test incremental re-parsing and background reloads of an edited TEI file."""
+
+import shutil
+import tempfile
+from pathlib import Path
+
+from contentstore import ContentView
+from parser import TEIParser
+from watcher import PlayWatcher
+
+XML_PATH = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+
+def edit_act(path: Path, act_number: str, old: bytes, new: bytes):
+    """Replace the first occurrence of old inside an act div."""
+    data = path.read_bytes()
+    start = data.index(f'<div type="act" n="{act_number}"'.encode())
+    at = data.index(old, start)
+    path.write_bytes(data[:at] + new + data[at + len(old):])
+
+def test_parse_incremental_reuses_unchanged_acts():
+    print("=== Incremental Parse Test ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / XML_PATH.name
+        shutil.copy2(XML_PATH, source)
+        
+        play, acts = TEIParser(source).parse_incremental()
+        assert play == TEIParser(source).parse()
+        assert len(acts) == play.get_act_count()
+        
+        edit_act(source, "3", b">Thou<", b">THOU<")
+        edited, edited_acts = TEIParser(source).parse_incremental(acts)
+        changed = [entry.act.number for digest, entry in edited_acts.items() if digest not in acts]
+        assert changed == ["3"]
+        print("✓ Only act 3 re-parsed")
+        
+        # Reused acts are copies sharing their content; the indexes match a full parse
+        assert edited.get_act("1") is not play.get_act("1")
+        assert edited.get_act("1").get_scene("1").content is play.get_act("1").get_scene("1").content
+        full = TEIParser(source).parse()
+        assert edited == full and edited != play
+        assert edited.tokens.forms() == full.tokens.forms()
+        assert edited.lines.ftln_for("4.6.100") == full.lines.ftln_for("4.6.100")
+        assert edited.on_stage("3.7.40") == full.on_stage("3.7.40")
+        print("✓ Incremental parse matches a full parse")
+
+def test_watcher_swaps_in_reloaded_play():
+    print("=== Play Watcher Test ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        source = Path(tmp) / XML_PATH.name
+        shutil.copy2(XML_PATH, source)
+        watcher = PlayWatcher(source, interval=0, use_snapshots=False)
+        original = watcher.play
+        assert not watcher.check()
+        # The first parse is packed like every reload
+        assert isinstance(original.get_act("1").get_scene("1").content, ContentView)
+        kept = original.get_act("1").get_scene("1").content
+        
+        edit_act(source, "2", b">Thou<", b">Thou thou<")
+        assert watcher.check()
+        assert watcher.wait(timeout=60)
+        assert watcher.generation == 1 and watcher.error is None
+        assert watcher.play != original
+        assert watcher.play == TEIParser(source).parse()
+        assert watcher.changed_acts == ["2"]
+        # Packing the new play leaves the one readers may still hold untouched
+        assert original.get_act("1").get_scene("1").content is kept
+        assert watcher.play.get_act("1").get_scene("1").content is not kept
+        print("✓ Edited act reloaded in the background")
+        
+        # A file that no longer parses leaves the last good play in place
+        good = watcher.play
+        source.write_bytes(source.read_bytes()[:-200])
+        assert watcher.check()
+        watcher.wait(timeout=60)
+        assert watcher.error is not None and watcher.play is good
+        print("✓ Broken edit keeps serving the previous play")
+
+if __name__ == "__main__":
+    test_parse_incremental_reuses_unchanged_acts()
+    test_watcher_swaps_in_reloaded_play()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""Test that the lxml and stdlib XML backends produce identical plays."""
+
+import pickle
+import tempfile
+from pathlib import Path
+
+from parser import TEIParser
+from xmlbackend import available_backends, get_backend
+
+def test_backends_produce_identical_plays():
+    xml_path = Path("data/king-lear_TEIsimple_FolgerShakespeare.xml")
+    
+    print("=== XML Backend Test ===")
+    assert available_backends() == ["etree", "lxml"]
+    assert TEIParser(xml_path).backend is get_backend("etree")
+    
+    play = TEIParser(xml_path, backend="etree").parse()
+    fast = TEIParser(xml_path, backend="lxml").parse()
+    
+    # Equal as models, and byte for byte once pickled (tokens and line index included)
+    assert fast == play
+    assert pickle.dumps(fast.tokens) == pickle.dumps(play.tokens)
+    assert pickle.dumps(fast.lines) == pickle.dumps(play.lines)
+    assert pickle.dumps(fast) == pickle.dumps(play)
+    assert [c.group for c in fast.characters] == [c.group for c in play.characters]
+    print(f"✓ parse(): {play.get_total_scenes()} scenes, {len(play.characters)} characters match")
+    
+    # The streaming and lazy modes agree across backends too
+    assert TEIParser(xml_path, backend="lxml").parse_streaming() == play
+    lazy = TEIParser(xml_path, backend="lxml").parse_lazy()
+    assert lazy.characters == play.characters
+    assert lazy.get_act("3").get_scene("7").content == play.get_act("3").get_scene("7").content
+    print("✓ parse_streaming() and parse_lazy() match")
+    
+    # A repeated xml:id is accepted by both, parsed whole or streamed
+    document = b'<TEI xmlns="http://www.tei-c.org/ns/1.0"><w xml:id="w1"/><w xml:id="w1"/></TEI>'
+    for name in available_backends():
+        backend = get_backend(name)
+        assert len(backend.fromstring(document)) == 2
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "repeated.xml"
+            path.write_bytes(document)
+            assert len(backend.parse(path).getroot()) == 2
+            assert sum(event == 'end' for event, _ in backend.iterparse(path, ('start', 'end'))) == 3
+    print("✓ Repeated xml:ids are accepted")
+    
+    try:
+        get_backend("sax")
+    except ValueError:
+        print("✓ Unknown backends are rejected")
+    else:
+        raise AssertionError("expected ValueError for an unknown backend")
+
+if __name__ == "__main__":
+    test_backends_produce_identical_plays()
@@ -0,0 +1,133 @@
+"""Lightweight timing spans for the parser and the app's reruns.
+
+Set CORDELIA_TIMING to turn them on before the app (or parser) is imported:
+
+    CORDELIA_TIMING=1      log every span as a JSON line on stderr
+    CORDELIA_TIMING=panel  also show the spans of each rerun in a debug panel
+
+A span is timed with `with span("name"):`, or a whole function with the
+@timed decorator. Each finished span is logged through the "cordelia.timing"
+logger as {"span": name, "ms": ..., "depth": ...}, and collected for the
+current rerun between begin_run() and end_run(). When timing is off, span()
+returns a shared no-op context manager and @timed returns the function
+unchanged, so instrumented code pays one function call per span at most.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Callable, List, Optional
+
+MODE = os.environ.get("CORDELIA_TIMING", "").strip().lower()
+ENABLED = MODE not in ("", "0", "off", "false")
+# Show the collected spans in the app's debug panel
+PANEL = ENABLED and MODE == "panel"
+
+logger = logging.getLogger("cordelia.timing")
+if ENABLED and not logger.handlers:
+    # Streamlit's root logger filters INFO, so give the spans their own handler
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+@dataclass(frozen=True)
+class Span:
+    """A finished timing span."""
+    name: str
+    seconds: float
+    depth: int  # number of spans open around this one
+
+
+# Open-span depth and the spans of the current rerun, per thread
+_local = threading.local()
+
+
+class _NullSpan:
+    """Context manager used for every span while timing is off."""
+    __slots__ = ()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+
+class _TimedSpan:
+    """Context manager that times, logs and collects one span."""
+    __slots__ = ("name", "depth", "start")
+    
+    def __init__(self, name: str):
+        self.name = name
+    
+    def __enter__(self):
+        self.depth = getattr(_local, "depth", 0)
+        _local.depth = self.depth + 1
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        _local.depth = self.depth
+        finished = Span(self.name, seconds, self.depth)
+        spans = getattr(_local, "spans", None)
+        if spans is not None:
+            spans.append(finished)
+        logger.info(json.dumps({"span": self.name, "ms": round(seconds * 1000, 3), "depth": self.depth}))
+        return False
+
+
+def span(name: str):
+    """Return a context manager timing the block it wraps as a named span."""
+    if not ENABLED:
+        return _NULL_SPAN
+    return _TimedSpan(name)
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorate a function so each call is a span (named after the function by default)."""
+    def decorate(function):
+        if not ENABLED:
+            return function
+        span_name = name or function.__qualname__
+        
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with _TimedSpan(span_name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def begin_run():
+    """Start collecting the spans finished on this thread."""
+    if ENABLED:
+        _local.spans = []
+
+
+def end_run() -> List[Span]:
+    """Stop collecting and return the spans finished since begin_run(), in finish order."""
+    spans = getattr(_local, "spans", None) or []
+    _local.spans = None
+    return spans
+
+
+def summarize(spans: List[Span]) -> List[dict]:
+    """Total the spans by name, in order of first appearance, for display."""
+    rows = {}
+    for finished in spans:
+        row = rows.setdefault(finished.name, {"span": finished.name, "calls": 0, "ms": 0.0})
+        row["calls"] += 1
+        row["ms"] += finished.seconds * 1000
+    for row in rows.values():
+        row["ms"] = round(row["ms"], 2)
+    return list(rows.values())
@@ -0,0 +1,277 @@
+"""Columnar store of the annotated <w> tokens of a play.
+
+The Folger TEI Simple files carry MorphAdorner annotations on every word:
+
+    <w xml:id="fs-lr-0000260" n="1.1.1" lemma="king" ana="#n1">King</w>
+
+TokenStore keeps these as parallel NumPy columns of integer codes into one
+shared StringTable instead of per-token objects. Scenes and speeches refer to
+tokens by [start, end) offset ranges into the columns.
+"""
+
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import re
+
+import numpy as np
+
+# Code used for a missing string (no lemma, no speaker, ...)
+NO_CODE = -1
+
+_WORD_ID_RE = re.compile(r'^(.*?)(\d+)$')
+
+
+class StringTable:
+    """Interned strings addressed by integer code."""
+    
+    def __init__(self, strings: Optional[List[str]] = None):
+        self.strings = list(strings or [])
+        self._codes = {s: i for i, s in enumerate(self.strings)}
+        self._array = None
+    
+    def __len__(self) -> int:
+        return len(self.strings)
+    
+    def __getitem__(self, code: int) -> Optional[str]:
+        return self.strings[code] if code != NO_CODE else None
+    
+    def intern(self, text: Optional[str]) -> int:
+        """Return the code for text, adding it to the table if needed."""
+        if text is None:
+            return NO_CODE
+        code = self._codes.get(text)
+        if code is None:
+            code = self._codes[text] = len(self.strings)
+            self.strings.append(text)
+            self._array = None
+        return code
+    
+    def intern_all(self, values) -> np.ndarray:
+        """Intern a sequence of strings and return their codes as an array."""
+        # dict.fromkeys keeps first-seen order, so codes are deterministic
+        for text in dict.fromkeys(values):
+            if text is not None:
+                self.intern(text)
+        codes = self._codes
+        return np.array([codes.get(text, NO_CODE) for text in values], dtype=np.int32)
+    
+    def code(self, text: str) -> int:
+        """Return the code for text, or NO_CODE if it is not in the table."""
+        return self._codes.get(text, NO_CODE)
+    
+    def as_array(self) -> np.ndarray:
+        """Return the strings as an object array, for decoding code columns."""
+        if self._array is None:
+            self._array = np.array(self.strings + [None], dtype=object)
+        return self._array
+    
+    def decode(self, codes: np.ndarray) -> List[Optional[str]]:
+        """Decode an array of codes; NO_CODE decodes to None."""
+        # NO_CODE (-1) indexes the trailing None
+        return self.as_array()[codes].tolist()
+    
+    def __getstate__(self):
+        return {'strings': self.strings}
+    
+    def __setstate__(self, state):
+        self.__init__(state['strings'])
+
+
+class Token(NamedTuple):
+    """A single decoded token."""
+    index: int
+    xml_id: Optional[str]
+    form: str
+    lemma: Optional[str]
+    pos: Optional[str]
+    speaker: Optional[str]  # sp/@who, e.g. "#Kent_Lr"; None for stage directions
+    line: Optional[str]     # w/@n, e.g. "1.1.1" or "SD 1.1.0"
+    ftln: int               # Folger line number, 0 before the first line
+    act: str
+    scene: str
+
+
+class TokenStore:
+    """Struct-of-arrays store of every word token in a play.
+    
+    Columns (one entry per token, in document order):
+        form, lemma, pos, speaker, line -- codes into `strings`
+        scene -- index into `scene_keys`
+        ftln  -- Folger line number in effect at the token
+        word_id -- numeric part of the token's xml:id
+    
+    Speeches are described by the parallel arrays speech_start, speech_end,
+    speech_speaker and speech_scene; scenes by scene_start and scene_end.
+    """
+    
+    COLUMNS = ('form', 'lemma', 'pos', 'speaker', 'line', 'scene', 'ftln', 'word_id')
+    
+    def __init__(self, strings: StringTable, columns: Dict[str, np.ndarray],
+                 scene_keys: List[Tuple[str, str]], scene_bounds: np.ndarray,
+                 speeches: Dict[str, np.ndarray], id_prefix: str = '', id_width: int = 0):
+        self.strings = strings
+        for name in self.COLUMNS:
+            setattr(self, name, columns[name])
+        self.scene_keys = scene_keys
+        self.scene_start = scene_bounds[:-1]
+        self.scene_end = scene_bounds[1:]
+        self.speech_start = speeches['start']
+        self.speech_end = speeches['end']
+        self.speech_speaker = speeches['speaker']
+        self.speech_scene = speeches['scene']
+        self.id_prefix = id_prefix
+        self.id_width = id_width
+        self._scene_index = {key: i for i, key in enumerate(scene_keys)}
+        # Token indexes sorted by word_id, built on the first index_of call
+        self._id_order: Optional[np.ndarray] = None
+    
+    def __len__(self) -> int:
+        return len(self.form)
+    
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the numeric columns in bytes."""
+        arrays = [getattr(self, name) for name in self.COLUMNS]
+        arrays += [self.scene_start, self.speech_start, self.speech_end,
+                   self.speech_speaker, self.speech_scene]
+        return sum(a.nbytes for a in arrays)
+    
+    def scene_index(self, act_number: str, scene_number: str) -> int:
+        """Return the position of a scene in scene_keys, or -1."""
+        return self._scene_index.get((act_number, scene_number), -1)
+    
+    def scene_range(self, act_number: str, scene_number: str) -> Tuple[int, int]:
+        """Return the [start, end) token range of a scene."""
+        index = self.scene_index(act_number, scene_number)
+        if index < 0:
+            return (0, 0)
+        return (int(self.scene_start[index]), int(self.scene_end[index]))
+    
+    def speech_ranges(self, act_number: str, scene_number: str) -> List[Tuple[int, int]]:
+        """Return the [start, end) token ranges of the speeches in a scene."""
+        mask = self.speech_scene == self.scene_index(act_number, scene_number)
+        return list(zip(self.speech_start[mask].tolist(), self.speech_end[mask].tolist()))
+    
+    def forms(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Return the surface forms of tokens[start:end]."""
+        return self.strings.decode(self.form[start:end])
+    
+    def lemmas(self, start: int = 0, end: Optional[int] = None) -> List[Optional[str]]:
+        """Return the lemmas of tokens[start:end]."""
+        return self.strings.decode(self.lemma[start:end])
+    
+    def token_id(self, index: int) -> Optional[str]:
+        """Return the xml:id of a token."""
+        number = int(self.word_id[index])
+        if number < 0:
+            return None
+        return f"{self.id_prefix}{number:0{self.id_width}d}"
+    
+    def index_of(self, xml_id: str) -> int:
+        """Return the index of the token with an xml:id like "fs-lr-0000260", or -1."""
+        match = _WORD_ID_RE.match(xml_id.lstrip('#'))
+        if match is None or match.group(1) != self.id_prefix or len(match.group(2)) != self.id_width:
+            return -1
+        if self._id_order is None:
+            self._id_order = np.argsort(self.word_id, kind='stable')
+        number = int(match.group(2))
+        position = int(np.searchsorted(self.word_id, number, sorter=self._id_order))
+        if position < len(self._id_order) and self.word_id[self._id_order[position]] == number:
+            return int(self._id_order[position])
+        return -1
+    
+    def token(self, index: int) -> Token:
+        """Decode a single token."""
+        act_number, scene_number = self.scene_keys[self.scene[index]]
+        return Token(
+            index=index,
+            xml_id=self.token_id(index),
+            form=self.strings[self.form[index]],
+            lemma=self.strings[self.lemma[index]],
+            pos=self.strings[self.pos[index]],
+            speaker=self.strings[self.speaker[index]],
+            line=self.strings[self.line[index]],
+            ftln=int(self.ftln[index]),
+            act=act_number,
+            scene=scene_number,
+        )
+
+
+class TokenStoreBuilder:
+    """Accumulates tokens during parsing and builds a TokenStore.
+    
+    Tokens are buffered as plain tuples and interned column by column in
+    build(), which is much cheaper than interning each field as it arrives.
+    """
+    
+    def __init__(self):
+        self.strings = StringTable()
+        self.rows = []
+        self.scene_keys = []
+        self.scene_bounds = [0]
+        self.speeches = {name: [] for name in ('start', 'end', 'speaker', 'scene')}
+        self._speaker = None
+    
+    def begin_scene(self, act_number: str, scene_number: str):
+        self.scene_keys.append((act_number, scene_number))
+    
+    def end_scene(self):
+        self.scene_bounds.append(len(self.rows))
+    
+    def begin_speech(self, who: Optional[str]):
+        self._speaker = who
+        self.speeches['start'].append(len(self.rows))
+    
+    def end_speech(self):
+        self.speeches['end'].append(len(self.rows))
+        self.speeches['speaker'].append(self._speaker)
+        self.speeches['scene'].append(len(self.scene_keys) - 1)
+        self._speaker = None
+    
+    def add(self, form: str, lemma: Optional[str], ana: Optional[str], line: Optional[str],
+            ftln: int, xml_id: Optional[str], spoken: bool = True):
+        """Append one token; spoken=False marks words of stage directions."""
+        self.rows.append((form, lemma, ana, self._speaker if spoken else None, line,
+                          len(self.scene_keys) - 1, ftln, xml_id))
+    
+    def _word_numbers(self, xml_ids) -> Tuple[np.ndarray, str, int]:
+        """Split ids like fs-lr-0000260 into a shared prefix and numbers."""
+        first = next((i for i in xml_ids if i), None)
+        match = _WORD_ID_RE.match(first) if first else None
+        if match is None:
+            return np.full(len(xml_ids), -1, dtype=np.int32), '', 0
+        prefix, digits = match.groups()
+        width = len(prefix) + len(digits)
+        numbers = [int(i[len(prefix):]) if i and len(i) == width and i.startswith(prefix) else -1
+                   for i in xml_ids]
+        return np.array(numbers, dtype=np.int32), prefix, len(digits)
+    
+    def build(self) -> TokenStore:
+        columns = dict.fromkeys(TokenStore.COLUMNS)
+        if self.rows:
+            forms, lemmas, anas, speakers, lines, scenes, ftlns, xml_ids = zip(*self.rows)
+        else:
+            forms = lemmas = anas = speakers = lines = scenes = ftlns = xml_ids = ()
+        
+        columns['form'] = self.strings.intern_all(forms)
+        columns['lemma'] = self.strings.intern_all(lemmas)
+        # MorphAdorner POS tags are references like "#n1"
+        columns['pos'] = self.strings.intern_all([ana.lstrip('#') if ana else None for ana in anas])
+        columns['speaker'] = self.strings.intern_all(speakers)
+        columns['line'] = self.strings.intern_all(lines)
+        columns['scene'] = np.array(scenes, dtype=np.int32)
+        columns['ftln'] = np.array(ftlns, dtype=np.int32)
+        columns['word_id'], id_prefix, id_width = self._word_numbers(xml_ids)
+        
+        speeches = {name: np.array(values, dtype=np.int32)
+                    for name, values in self.speeches.items() if name != 'speaker'}
+        speeches['speaker'] = self.strings.intern_all(self.speeches['speaker'])
+        
+        return TokenStore(
+            strings=self.strings,
+            columns=columns,
+            scene_keys=list(self.scene_keys),
+            scene_bounds=np.array(self.scene_bounds, dtype=np.int32),
+            speeches=speeches,
+            id_prefix=id_prefix,
+            id_width=id_width,
+        )
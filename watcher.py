@@ -0,0 +1,119 @@
+"""Pick up edits to a TEI file without restarting the app.
+
+A PlayWatcher holds the current Play of one file. Reading watcher.play stats
+the file at most once per interval; when its mtime or size has changed, a
+background thread re-parses it with TEIParser.parse_incremental, which
+hashes every act div and re-runs _get_scenes only for the acts whose bytes
+changed. The new Play replaces the old one in a single assignment, so readers
+get either the old or the new play and never wait for the parse:
+
+    watcher = PlayWatcher(Path("data/king-lear_TEIsimple_FolgerShakespeare.xml"), play)
+    play = watcher.play   # the latest complete parse
+
+The first reload after startup parses every act, since a play loaded from a
+snapshot carries no act hashes; later reloads reuse the unchanged acts.
+"""
+
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from contentstore import pack_play
+from parser import ParsedAct, Play, TEIParser
+import snapshot
+
+# Seconds between checks of the source file
+RELOAD_INTERVAL = 2.0
+
+
+class PlayWatcher:
+    """The latest parse of a TEI file, reloaded in the background when it changes."""
+
+    def __init__(self, path: Path, play: Optional[Play] = None, interval: float = RELOAD_INTERVAL,
+                 use_snapshots: bool = True):
+        self.path = Path(path)
+        self.interval = interval
+        self.use_snapshots = use_snapshots
+        # Number of reloads so far, and the acts re-parsed by the last one
+        self.generation = 0
+        self.changed_acts: List[str] = []
+        # Traceback of the last failed reload; the previous play stays current
+        self.error: Optional[str] = None
+        self._acts: Dict[str, ParsedAct] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stamp = self._source_stamp()
+        self._checked = time.monotonic()
+        self._play = play if play is not None else self._parse()
+
+    @property
+    def play(self) -> Play:
+        """Return the current Play, starting a background reload if the file changed."""
+        self.check()
+        return self._play
+
+    def _source_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self, force: bool = False) -> bool:
+        """Start a reload if the file changed since the last one; return whether one started."""
+        now = time.monotonic()
+        if not force and now - self._checked < self.interval:
+            return False
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                # Changes made meanwhile are noticed once this reload finishes
+                return False
+            self._checked = now
+            stamp = self._source_stamp()
+            if stamp is None or stamp == self._stamp:
+                return False
+            self._stamp = stamp
+            self._thread = threading.Thread(target=self._reload_in_background,
+                                            name=f"reload-{self.path.stem}", daemon=True)
+            self._thread.start()
+        return True
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait for a running reload to finish; return False if it is still running."""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def _parse(self) -> Play:
+        """Parse the file, reusing unchanged acts, pack it and remember its act hashes."""
+        play, acts = TEIParser(self.path).parse_incremental(self._acts)
+        pack_play(play)
+        self.changed_acts = [entry.act.number for digest, entry in acts.items() if digest not in self._acts]
+        self._acts = acts
+        return play
+
+    def reload(self) -> Play:
+        """Re-parse the file now and make the result the current play."""
+        play = self._parse()
+        # Readers see the old play or the new one, never a mix
+        self._play = play
+        self.generation += 1
+        self.error = None
+        if self.use_snapshots:
+            try:
+                snapshot.write_snapshot(play, self.path)
+            except OSError:
+                # A read-only snapshot directory should not stop the reload
+                pass
+        return play
+
+    def _reload_in_background(self):
+        try:
+            self.reload()
+        except Exception:
+            # A half-saved file fails to parse; keep serving the last good play
+            self.error = traceback.format_exc(limit=3)
@@ -0,0 +1,150 @@
+"""XML backends for TEIParser.
+
+A backend turns a TEI file (or a byte fragment of one) into an element tree and
+answers the parser's structural queries, each addressed by name:
+
+    backend.find(root, "title")          # first match or None
+    backend.findall(act_div, "scenes")   # all matches, in document order
+
+EtreeBackend uses the standard library with path strings evaluated on every
+call. LxmlBackend evaluates the same paths as XPath expressions compiled once
+per process, and its elements support C-level iter(tag) traversal.
+Both build trees with comments and processing instructions removed, and both
+accept a repeated xml:id, so they yield the same Play from the same documents.
+get_backend() picks etree, which benchmarks/bench_suite.py measures as the
+faster of the two on the parser's workload; set CORDELIA_XML_BACKEND to
+"etree" or "lxml" to choose explicitly.
+"""
+
+import os
+import xml.etree.ElementTree as ET
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    from lxml import etree
+except ImportError:  # pragma: no cover - depends on the environment
+    etree = None
+
+# Backend used when none is named; switch once lxml measures faster
+DEFAULT_BACKEND = "etree"
+
+# Bytes fed to lxml's pull parser at a time
+READ_SIZE = 64 * 1024
+
+# TEI namespace
+TEI_NS = {'tei': 'http://www.tei-c.org/ns/1.0'}
+
+# The structural queries the parser makes, as paths relative to the element asked
+QUERIES: Dict[str, str] = {
+    "title": ".//tei:teiHeader/tei:fileDesc/tei:titleStmt/tei:title",
+    "body": ".//tei:body",
+    "acts": './tei:div[@type="act"]',
+    "scenes": './tei:div[@type="scene"]',
+    "speaker": "./tei:speaker",
+    "prose": "./tei:p",
+    "verse": "./tei:l",
+    "cast_list": ".//tei:front/tei:castList",
+    "group_head": "./tei:head",
+    "name": ".//tei:name",
+    "role_desc": ".//tei:roleDesc",
+}
+
+
+class EtreeBackend:
+    """Backend built on xml.etree.ElementTree."""
+    
+    name = "etree"
+    
+    def parse(self, file_path):
+        """Parse a file and return its element tree."""
+        return ET.parse(str(file_path))
+    
+    def fromstring(self, data: bytes):
+        """Parse a document held in memory and return its root element."""
+        return ET.fromstring(data)
+    
+    def iterparse(self, file_path, events):
+        """Yield (event, element) pairs while the file is parsed."""
+        return ET.iterparse(str(file_path), events=events)
+    
+    def find(self, elem, query: str):
+        """Return the first element matching a named query, or None."""
+        return elem.find(QUERIES[query], TEI_NS)
+    
+    def findall(self, elem, query: str) -> List:
+        """Return every element matching a named query."""
+        return elem.findall(QUERIES[query], TEI_NS)
+
+
+class LxmlBackend:
+    """Backend built on lxml, with every query compiled to an XPath object."""
+    
+    name = "lxml"
+    
+    # ElementTree does not check xml:id uniqueness; without collect_ids=False
+    # libxml2 rejects a document that repeats one
+    OPTIONS = dict(remove_comments=True, remove_pis=True, collect_ids=False, huge_tree=True)
+    
+    def __init__(self):
+        self._parser = etree.XMLParser(**self.OPTIONS)
+        self._xpaths = {
+            query: etree.XPath(path, namespaces=TEI_NS) for query, path in QUERIES.items()
+        }
+    
+    def parse(self, file_path):
+        """Parse a file and return its element tree."""
+        return etree.parse(str(file_path), self._parser)
+    
+    def fromstring(self, data: bytes):
+        """Parse a document held in memory and return its root element."""
+        return etree.fromstring(data, self._parser)
+    
+    def iterparse(self, file_path, events) -> Iterator[Tuple[str, object]]:
+        """Yield (event, element) pairs while the file is parsed."""
+        # etree.iterparse ignores collect_ids, so feed a pull parser instead
+        parser = etree.XMLPullParser(events=events, **self.OPTIONS)
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(READ_SIZE), b''):
+                parser.feed(chunk)
+                yield from parser.read_events()
+        parser.close()
+        yield from parser.read_events()
+    
+    def find(self, elem, query: str):
+        """Return the first element matching a named query, or None."""
+        matches = self._xpaths[query](elem)
+        return matches[0] if matches else None
+    
+    def findall(self, elem, query: str) -> List:
+        """Return every element matching a named query."""
+        return self._xpaths[query](elem)
+
+
+BACKENDS = {"etree": EtreeBackend, "lxml": LxmlBackend}
+
+# One instance per backend; they hold no per-document state
+_instances: Dict[str, object] = {}
+
+
+def available_backends() -> List[str]:
+    """Return the names of the backends that can run here, the default first."""
+    names = [DEFAULT_BACKEND]
+    if etree is not None:
+        names.append("lxml")
+    return names
+
+
+def get_backend(name: Optional[str] = None):
+    """Return the named backend, or the default one.
+    
+    With no name, CORDELIA_XML_BACKEND is consulted before falling back to
+    DEFAULT_BACKEND.
+    """
+    name = name or os.environ.get("CORDELIA_XML_BACKEND") or DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"unknown XML backend {name!r}; expected one of {sorted(BACKENDS)}")
+    if name not in available_backends():
+        raise ValueError(f"XML backend {name!r} is not installed")
+    if name not in _instances:
+        _instances[name] = BACKENDS[name]()
+    return _instances[name]